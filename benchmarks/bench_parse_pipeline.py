@@ -0,0 +1,224 @@
+"""
+Parse Pipeline Benchmark
+Runs the post parsing pipeline offline over the fixture corpus, reports per-stage
+timings and throughput, and checks the output against the golden JSON files
+
+Usage:
+    python benchmarks/bench_parse_pipeline.py [--repeat 3] [--parser lxml] [--update-golden]
+
+Each feed snapshot in fixtures/feeds/ goes through extract_posts_with_beautifulsoup
+and add_scraped_posts, like one scroll of scrape_posts. Kuensel
+article links are served from fixtures/articles/. The kept posts, plus a digest
+of every extracted post, must match fixtures/golden/<feed>.json byte for byte;
+the script exits with status 1 if not.
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, "fixtures")
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, "..", "src"))
+
+import facebook_scrapper  # noqa: E402
+from facebook_scrapper import FacebookScraper  # noqa: E402
+from html_parsing import resolve_parser_backend  # noqa: E402
+from near_duplicates import NearDuplicateIndex  # noqa: E402
+
+# Stage name -> scraper methods timed under it (exclusive of nested stages)
+STAGES = {
+    "unit selection": ["extract_posts_with_beautifulsoup"],
+    "content selection": ["collect_post_fields"],
+    "post building": ["build_post_from_fields"],
+    "media": ["media_from_raw"],
+    "links": ["links_from_hrefs"],
+    "article pages": ["parse_article_page"],
+    "text cleanup": ["clean_text", "filter_comments_from_content"],
+    "validation": ["is_valid_post"],
+    "dedup": ["add_scraped_posts", "create_post_hash"],
+}
+
+
+class StageTimer:
+    """Accumulates exclusive wall time per stage across nested calls"""
+
+    def __init__(self):
+        self.totals = {}
+        self.stack = []
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            self.stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self.stack.pop()
+                self.totals[stage] = self.totals.get(stage, 0.0) + elapsed - nested
+                if self.stack:
+                    self.stack[-1] += elapsed
+        return timed
+
+
+class FixtureScraper(FacebookScraper):
+    """Scraper that reads Kuensel article pages from the fixture corpus"""
+
+    def fetch_article_page(self, article_url):
+        slug = urlparse(article_url).path.strip("/").split("/")[-1]
+        path = os.path.join(FIXTURES_DIR, "articles", f"{slug}.html")
+        if not os.path.exists(path):
+            print("Failed to fetch article: HTTP 404")
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+
+def make_scraper(html_parser):
+    """Create an offline scraper with no browser, photo fetching or archived posts"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        scraper = FixtureScraper(config_file=os.path.join(FIXTURES_DIR, "config.json"), start_driver=False)
+    scraper.config["process_facebook_photos"] = False
+    scraper.html_parser = html_parser
+    scraper.near_duplicate_index = NearDuplicateIndex()
+    return scraper
+
+
+def reset(scraper):
+    scraper.reset_session_state()
+
+
+def run_pipeline(scraper, html_content):
+    """One scroll's worth of parsing, returning formatted posts"""
+    reset(scraper)
+    new_posts = scraper.extract_posts_with_beautifulsoup(html_content)
+    scraper.add_scraped_posts(new_posts)
+    return new_posts, scraper.format_for_output()
+
+
+def stable_post(post, run_started):
+    """Drop the fields that depend on when the run happened"""
+    post = dict(post)
+    post.pop("createdAt", None)
+    # Posts without a timestamp fall back to datetime.now()
+    if post.get("publishAt", "") >= run_started:
+        post["publishAt"] = "<scrape time>"
+    return post
+
+
+def golden_json(raw_posts, posts, run_started):
+    """Serialize kept posts in full and every extracted post as a digest"""
+    extracted = []
+    for post in raw_posts:
+        canonical = json.dumps(stable_post(post, run_started), ensure_ascii=False, sort_keys=True)
+        extracted.append({"id": post.get("id"), "sha1": hashlib.sha1(canonical.encode("utf-8")).hexdigest()})
+    golden = {
+        "extracted": extracted,
+        "kept": [stable_post(post, run_started) for post in posts],
+    }
+    return json.dumps(golden, indent=2, ensure_ascii=False, sort_keys=True) + "\n"
+
+
+def instrument(scraper, timer):
+    """Wrap the stage methods on this scraper instance and the feed parser"""
+    for stage, method_names in STAGES.items():
+        for name in method_names:
+            setattr(scraper, name, timer.wrap(stage, getattr(scraper, name)))
+    original_make_soup = facebook_scrapper.make_soup
+    facebook_scrapper.make_soup = timer.wrap("parse", original_make_soup)
+    return original_make_soup
+
+
+def benchmark_feed(scraper, name, html_content, repeat):
+    timer = StageTimer()
+    original_make_soup = instrument(scraper, timer)
+    run_started = datetime.now().isoformat()
+    totals = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                raw_posts, posts = run_pipeline(scraper, html_content)
+                totals.append(time.perf_counter() - start)
+    finally:
+        facebook_scrapper.make_soup = original_make_soup
+        for method_names in STAGES.values():
+            for method_name in method_names:
+                scraper.__dict__.pop(method_name, None)
+
+    return {
+        "name": name,
+        "raw_posts": len(raw_posts),
+        "posts": posts,
+        "best": min(totals),
+        "mean": sum(totals) / len(totals),
+        "stages": {stage: elapsed / repeat for stage, elapsed in timer.totals.items()},
+        "output": golden_json(raw_posts, posts, run_started),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the post parsing pipeline on the fixture corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per feed (default: 3)")
+    parser.add_argument("--parser", default="html.parser", help="HTML parser backend")
+    parser.add_argument("--feed", action="append", help="Only run the named feed (repeatable)")
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite the golden JSON files")
+    args = parser.parse_args()
+
+    html_parser = resolve_parser_backend(args.parser)
+    scraper = make_scraper(html_parser)
+    golden_dir = os.path.join(FIXTURES_DIR, "golden")
+    os.makedirs(golden_dir, exist_ok=True)
+
+    feed_paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "feeds", "*.html")))
+    if args.feed:
+        feed_paths = [path for path in feed_paths if os.path.basename(path)[:-5] in args.feed]
+
+    print(f"📊 Parse pipeline benchmark: parser={html_parser}, repeat={args.repeat}")
+    mismatches = []
+    for path in feed_paths:
+        name = os.path.basename(path)[:-5]
+        with open(path, "r", encoding="utf-8") as f:
+            html_content = f.read()
+
+        result = benchmark_feed(scraper, name, html_content, args.repeat)
+        posts_per_sec = result["raw_posts"] / result["best"] if result["best"] else 0
+
+        print(f"\n{name}: {result['raw_posts']} raw posts, {len(result['posts'])} kept")
+        print(f"  total      best {result['best']:.3f}s  mean {result['mean']:.3f}s  ({posts_per_sec:.1f} posts/s)")
+        stage_total = sum(result["stages"].values())
+        for stage in ["parse"] + list(STAGES):
+            elapsed = result["stages"].get(stage, 0.0)
+            print(f"  {stage:<18} {elapsed:8.4f}s")
+        print(f"  {'other':<18} {max(0.0, result['mean'] - stage_total):8.4f}s")
+
+        golden_path = os.path.join(golden_dir, f"{name}.json")
+        if args.update_golden:
+            with open(golden_path, "w", encoding="utf-8") as f:
+                f.write(result["output"])
+            print(f"  📝 Golden output updated: {golden_path}")
+        elif not os.path.exists(golden_path):
+            print(f"  ⚠️  No golden output for {name} (run with --update-golden)")
+        else:
+            with open(golden_path, "r", encoding="utf-8") as f:
+                matches = f.read() == result["output"]
+            print(f"  {'✅ Output matches golden JSON' if matches else '❌ Output differs from golden JSON'}")
+            if not matches:
+                mismatches.append(name)
+
+    if mismatches:
+        print(f"\n❌ Golden mismatch: {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Parse Worker Benchmark
+Times extract_posts_with_beautifulsoup on a feed snapshot with 1, 2 and 4 parse workers
+
+Usage:
+    python benchmarks/bench_parse_workers.py [snapshot.html] [--posts 200] [--workers 1,2,4]
+
+Without a snapshot a deterministic synthetic feed is generated. Runs offline:
+no browser is started and photo/article enrichment is disabled.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from facebook_scrapper import FacebookScraper  # noqa: E402
+from html_parsing import resolve_parser_backend  # noqa: E402
+
+WORDS = ("the ministry of education announced new policy for schools across bhutan "
+         "farmers in punakha harvest rice season tourism industry archery tournament "
+         "his majesty visited dzong festival celebration heritage tradition").split()
+
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+
+
+def synthetic_feed(post_count, seed=7):
+    """Build a feed snapshot with post_count articles shaped like Facebook feed units"""
+    rng = random.Random(seed)
+    units = []
+    for i in range(post_count):
+        units.append(
+            f'<div class="x1yztbdb"><div role="article" aria-posinset="{i}">'
+            f'<h3><a href="/Kuensel">Kuensel</a></h3>'
+            f'<span><a href="/Kuensel/posts/{9000 + i}"><time datetime="2025-09-0{1 + i % 8}T0{i % 9}:00:00+0000">{i}h</time></a></span>'
+            f'<div data-ad-preview="message"><div dir="auto">{sentence(rng, 25)}</div>'
+            f'<div dir="auto">{sentence(rng, 12)}</div></div>'
+            f'<img src="https://scontent.xx.fbcdn.net/v/t39/{i}_a.jpg" alt="May be an image of people">'
+            f'<div style="background-image: url(\'https://scontent.xx.fbcdn.net/v/t39/{i}_b.jpg\')"></div>'
+            f'<a href="https://example.org/news/{i}">read</a>'
+            f'<div>{i + 3} likes 2 comments {i} shares</div></div></div>'
+        )
+    return '<html><body><div data-pagelet="Feed">' + "".join(units) + '</div></body></html>'
+
+
+def make_scraper(workers, html_parser):
+    """Create a scraper without a browser or photo fetching"""
+    config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "config.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        scraper = FacebookScraper(config_file=config_file, start_driver=False)
+    scraper.config["process_facebook_photos"] = False
+    scraper.html_parser = html_parser
+    scraper.parse_workers = workers
+    return scraper
+
+
+def run_once(scraper, html_content):
+    scraper.parse_cache.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        posts = scraper.extract_posts_with_beautifulsoup(html_content)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(posts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel post parsing")
+    parser.add_argument("snapshot", nargs="?", help="Saved feed HTML (default: synthetic feed)")
+    parser.add_argument("--posts", type=int, default=200, help="Posts in the synthetic feed")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per worker count")
+    parser.add_argument("--parser", default="html.parser", help="HTML parser backend")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        with open(args.snapshot, "r", encoding="utf-8") as f:
+            html_content = f.read()
+        source = args.snapshot
+    else:
+        html_content = synthetic_feed(args.posts)
+        source = f"synthetic feed ({args.posts} posts)"
+
+    html_parser = resolve_parser_backend(args.parser)
+    print(f"📊 Parse worker benchmark: {source}, parser={html_parser}, cpus={os.cpu_count()}")
+    print(f"{'workers':>8} {'best (s)':>10} {'posts/s':>10} {'speedup':>8}")
+
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        scraper = make_scraper(workers, html_parser)
+        run_once(scraper, html_content)  # Warm-up, also starts the worker pool
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, post_count = run_once(scraper, html_content)
+            timings.append(elapsed)
+        if scraper.parse_pool is not None:
+            scraper.parse_pool.shutdown()
+
+        best = min(timings)
+        baseline = baseline or best
+        print(f"{workers:>8} {best:>10.3f} {post_count / best:>10.1f} {baseline / best:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Browser Backend Check
+Loads the fixture feeds in each browser backend and checks that the page snapshots
+parse to the golden JSON, that background tabs load the fixture article pages, and
+that async scripts (page waits, "See more" expansion), URL blocking and cookies work
+
+Usage:
+    python benchmarks/check_browser_backends.py [--backend selenium] [--backend playwright] [--headed] [--allow-skip]
+
+Exits with status 1 if any backend that ran gives different output from the golden
+files or fails one of the other checks. A backend whose browser cannot start (no
+Chrome, Playwright not installed) is reported as NOT VERIFIED and the check exits
+with status 2, unless --allow-skip is given.
+"""
+
+import argparse
+import base64
+import contextlib
+import glob
+import http.server
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_parse_pipeline import FIXTURES_DIR, golden_json, make_scraper, run_pipeline
+from browser_backends import BACKENDS  # noqa: E402
+from browser_session import COOKIE_FIELDS, SAME_SITE_VALUES  # noqa: E402
+from html_parsing import resolve_parser_backend  # noqa: E402
+from page_waits import PageWaiter  # noqa: E402
+
+ARTICLE_TABS = 6
+LATE_UNIT_DELAY_MS = 1000
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg==")
+
+# Two feed units with a "See more" control: the first is there on load, the second
+# renders LATE_UNIT_DELAY_MS later. appendUnit() adds a third unit for the wait check
+PROBE_PAGE = """<html><body><div data-pagelet="Feed">
+<div role="article" id="unit-1"><div dir="auto">First probe story, shown cut short.
+<span onclick="this.parentNode.textContent = 'First probe story, expanded in full.'">See more</span></div></div>
+<div role="article" id="unit-2"></div>
+</div>
+<img id="blocked" src="blocked.png"><img id="allowed" src="allowed.png">
+<script>
+setTimeout(function () {
+    document.getElementById('unit-2').innerHTML = '<div dir="auto">Second probe story, shown cut short. ' +
+        '<span onclick="this.parentNode.textContent = \\'Second probe story, expanded in full.\\'">See more</span></div>';
+}, %d);
+function appendUnit() {
+    var unit = document.createElement('div');
+    unit.setAttribute('role', 'article');
+    unit.textContent = 'Third probe story';
+    document.querySelector('[data-pagelet="Feed"]').appendChild(unit);
+}
+</script>
+</body></html>
+""" % LATE_UNIT_DELAY_MS
+
+
+def start_backend(name, headless):
+    """Offline scraper driving the named backend, or (None, reason) if it can't start"""
+    scraper = make_scraper(resolve_parser_backend("html.parser"))
+    scraper.config["scraping"].update({
+        "browser_backend": name,
+        "headless": headless,
+        "resource_policy": {"block": [], "report": False},
+    })
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            scraper.setup_driver()
+    except Exception as e:
+        scraper.close()
+        reason = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+        return None, reason
+    return scraper, None
+
+
+def check_feeds(scraper):
+    """(feed name, matches golden) for each fixture feed loaded in the browser"""
+    results = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "feeds", "*.html"))):
+        name = os.path.basename(path)[:-5]
+        started = time.time()
+        scraper.driver.get(Path(path).as_uri())
+        if scraper.page_waiter:
+            scraper.page_waiter.wait_for_feed(3)
+        scraper.driver.scroll_to_bottom()
+        html_content = scraper.driver.page_source
+
+        run_started = datetime.now().isoformat()
+        with contextlib.redirect_stdout(io.StringIO()):
+            raw_posts, posts = run_pipeline(scraper, html_content)
+        output = golden_json(raw_posts, posts, run_started)
+
+        golden_path = os.path.join(FIXTURES_DIR, "golden", f"{name}.json")
+        with open(golden_path, "r", encoding="utf-8") as f:
+            matches = f.read() == output
+        print(f"  {name:<16} {len(raw_posts):4d} raw, {len(posts):4d} kept  {time.time() - started:5.2f}s  "
+              f"{'✅ matches golden' if matches else '❌ differs from golden'}")
+        results.append((name, matches))
+    return results
+
+
+def check_tabs(scraper):
+    """Load a few fixture articles through open_tabs; returns True if every one came back"""
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "articles", "*.html")))[:ARTICLE_TABS]
+    links = [Path(path).as_uri() for path in paths]
+    started = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pages = scraper.driver.open_tabs(links, 3, timeout=5).result()
+    loaded = sum(1 for link in links if pages.get(link))
+    print(f"  open_tabs        {loaded}/{len(links)} article tabs loaded  {time.time() - started:5.2f}s")
+    return loaded == len(links)
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def probe_server():
+    """Serve the probe page and its two images over HTTP (cookies need a real origin)"""
+    directory = tempfile.mkdtemp(prefix="backend_probe_")
+    with open(os.path.join(directory, "probe.html"), "w", encoding="utf-8") as f:
+        f.write(PROBE_PAGE)
+    for name in ("blocked.png", "allowed.png"):
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(PIXEL_PNG)
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), lambda *args: QuietHandler(*args, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/probe.html"
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def wait_until(driver, script, timeout=5):
+    """Poll a boolean script until it is true; returns False at the deadline"""
+    deadline = time.time() + timeout
+    while not driver.execute_script(script):
+        if time.time() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def unit_texts(driver):
+    return driver.execute_script(
+        "return Array.prototype.map.call(document.querySelectorAll('[role=article]'), "
+        "function (unit) { return unit.textContent.trim(); });")
+
+
+def check_page_features(scraper):
+    """(check name, passed, detail) for async scripts, URL blocking and cookies on the probe page"""
+    driver = scraper.driver
+    waiter = scraper.page_waiter or PageWaiter(driver)
+    results = []
+    with probe_server() as url, contextlib.redirect_stdout(io.StringIO()):
+        blocking = driver.block_urls(["*/blocked.png*"])
+        driver.get(url)
+
+        # "See more": the unit present on load now, the late one once it has rendered
+        first_pass = scraper.expand_see_more_links(3)
+        wait_until(driver, "return document.getElementById('unit-2').textContent.length > 0;")
+        second_pass = scraper.expand_see_more_links(3)
+        texts = unit_texts(driver)
+        expanded = sum(1 for text in texts if text.endswith("expanded in full."))
+        results.append(("see more", first_pass == 1 and second_pass == 1 and expanded == 2,
+                        f"{first_pass} + {second_pass} expanded, {expanded}/2 units in full"))
+
+        # Page waits: the observer sees a unit appended after the wait has started
+        baseline = waiter.install()
+        driver.execute_script("setTimeout(appendUnit, 200);")
+        wait = waiter.wait_for_new_units(baseline, 5)
+        results.append(("page waits", wait["reason"] == "content" and wait["units"] == (baseline or 0) + 1,
+                        f"{wait['reason']} after {wait['waited']:.2f}s, {baseline} -> {wait['units']} units"))
+
+        # URL blocking: the blocked image never loads, the other one does
+        wait_until(driver, "return document.readyState === 'complete';")
+        images = driver.execute_script(
+            "return [document.getElementById('blocked').naturalWidth, document.getElementById('allowed').naturalWidth];")
+        results.append(("block_urls", bool(blocking) and images == [0, 1],
+                        f"blocked image {images[0]}px, allowed image {images[1]}px"))
+
+        # Cookies: add one, read it back, then restore it the way restore_session does
+        driver.add_cookie({"name": "probe", "value": "1", "path": "/"})
+        saved = [cookie for cookie in driver.get_cookies() if cookie.get("name") == "probe"]
+        expiry = int(time.time()) + 3600
+        for cookie in saved:
+            cookie = {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+            cookie.update(value="2", expiry=expiry)
+            if cookie.get("sameSite") not in SAME_SITE_VALUES:
+                cookie.pop("sameSite", None)
+            driver.add_cookie(cookie)
+        restored = [cookie for cookie in driver.get_cookies() if cookie.get("name") == "probe"]
+        in_page = "probe=2" in driver.execute_script("return document.cookie;")
+        results.append(("cookies", len(saved) == 1 and len(restored) == 1 and restored[0].get("value") == "2"
+                        and restored[0].get("expiry") == expiry and in_page,
+                        f"{len(saved)} saved, {len(restored)} restored, visible to the page: {in_page}"))
+
+    for name, passed, detail in results:
+        print(f"  {name:<16} {detail}  {'✅' if passed else '❌'}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every browser backend against the fixture corpus")
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="Only check this backend (repeatable)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--allow-skip", action="store_true",
+                        help="Exit 0 when a backend's browser cannot start")
+    args = parser.parse_args()
+
+    failures = []
+    skipped = []
+    for name in args.backend or BACKENDS:
+        print(f"\n🌐 {name}")
+        scraper, reason = start_backend(name, headless=not args.headed)
+        if scraper is None:
+            print(f"  ⏭️  skipped: {reason}")
+            skipped.append(name)
+            continue
+        try:
+            for feed, matches in check_feeds(scraper):
+                if not matches:
+                    failures.append(f"{name}/{feed}")
+            if not check_tabs(scraper):
+                failures.append(f"{name}/open_tabs")
+            for check, passed, _ in check_page_features(scraper):
+                if not passed:
+                    failures.append(f"{name}/{check}")
+        finally:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper.close()
+
+    if failures:
+        print(f"\n❌ Failed: {', '.join(failures)}")
+        sys.exit(1)
+    if skipped:
+        print(f"\n⚠️  NOT VERIFIED: {', '.join(skipped)} could not start a browser, so nothing was checked on "
+              f"{'it' if len(skipped) == 1 else 'them'}")
+        if not args.allow_skip:
+            sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
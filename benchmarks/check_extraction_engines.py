@@ -0,0 +1,122 @@
+"""
+Extraction Engine Check
+Loads each fixture feed in a browser and runs both extraction engines on it: the
+JavaScript engine in the page and the BeautifulSoup engine on its page source.
+Their raw field records and the posts built from them must be identical
+
+Usage:
+    python benchmarks/check_extraction_engines.py [--backend selenium] [--feed feed_clean] [--show 5] [--allow-skip]
+
+Exits with status 1 if the engines disagree on any feed. If the browser cannot
+start the check is reported as NOT VERIFIED and exits with status 2, unless
+--allow-skip is given.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from bench_parse_pipeline import FIXTURES_DIR, golden_json, reset, run_pipeline
+from browser_backends import BACKENDS  # noqa: E402
+from check_browser_backends import start_backend
+from html_parsing import make_soup  # noqa: E402
+
+
+def beautifulsoup_records(scraper, html_content):
+    """Raw field records the BeautifulSoup engine collects from html_content"""
+    soup = make_soup(html_content, scraper.html_parser)
+    elements = scraper.select_post_elements(soup)
+    return [scraper.collect_post_fields(element, i) for i, element in enumerate(elements)]
+
+
+def javascript_pipeline(scraper, records):
+    """Same as run_pipeline, but building posts from JavaScript engine records"""
+    reset(scraper)
+    new_posts = scraper.extract_posts_from_records(records)
+    scraper.add_scraped_posts(new_posts)
+    return new_posts, scraper.format_for_output()
+
+
+def record_differences(js_records, bs_records):
+    """(record index, field, javascript value, beautifulsoup value) for every field that differs"""
+    differences = []
+    if len(js_records) != len(bs_records):
+        differences.append((None, "records", len(js_records), len(bs_records)))
+    for i, (js_record, bs_record) in enumerate(zip(js_records, bs_records)):
+        for field in sorted(set(js_record) | set(bs_record)):
+            # Compare through JSON so tuples and lists are treated alike
+            js_value = json.loads(json.dumps(js_record.get(field)))
+            bs_value = json.loads(json.dumps(bs_record.get(field)))
+            if js_value != bs_value:
+                differences.append((i, field, js_value, bs_value))
+    return differences
+
+
+def check_feed(scraper, path, show):
+    name = os.path.basename(path)[:-5]
+    scraper.driver.get(Path(path).as_uri())
+    html_content = scraper.driver.page_source
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        js_records = scraper.collect_post_records_with_javascript()
+        bs_records = beautifulsoup_records(scraper, html_content)
+    differences = record_differences(js_records, bs_records)
+
+    run_started = datetime.now().isoformat()
+    with contextlib.redirect_stdout(io.StringIO()):
+        bs_output = golden_json(*run_pipeline(scraper, html_content), run_started)
+        js_output = golden_json(*javascript_pipeline(scraper, js_records), run_started)
+    posts_match = js_output == bs_output
+
+    print(f"  {name:<16} {len(js_records):4d} js / {len(bs_records):4d} bs records  "
+          f"{len(differences)} field differences  "
+          f"{'✅ same posts' if posts_match else '❌ posts differ'}")
+    for index, field, js_value, bs_value in differences[:show]:
+        where = "record count" if index is None else f"record {index} {field}"
+        print(f"    {where}:\n      js {json.dumps(js_value, ensure_ascii=False)[:200]}"
+              f"\n      bs {json.dumps(bs_value, ensure_ascii=False)[:200]}")
+    return not differences and posts_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the JavaScript and BeautifulSoup extraction engines")
+    parser.add_argument("--backend", default="selenium", choices=BACKENDS, help="Browser backend (default: selenium)")
+    parser.add_argument("--feed", action="append", help="Only check the named feed (repeatable)")
+    parser.add_argument("--show", type=int, default=5, help="Field differences to print per feed (default: 5)")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--allow-skip", action="store_true", help="Exit 0 when the browser cannot start")
+    args = parser.parse_args()
+
+    print(f"🔍 Extraction engines on {args.backend}")
+    scraper, reason = start_backend(args.backend, headless=not args.headed)
+    if scraper is None:
+        print(f"  ⏭️  skipped: {reason}")
+        print("\n⚠️  NOT VERIFIED: no browser started, so the engines were not compared")
+        sys.exit(0 if args.allow_skip else 2)
+
+    feed_paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "feeds", "*.html")))
+    if args.feed:
+        feed_paths = [path for path in feed_paths if os.path.basename(path)[:-5] in args.feed]
+
+    failures = []
+    try:
+        for path in feed_paths:
+            if not check_feed(scraper, path, args.show):
+                failures.append(os.path.basename(path)[:-5])
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scraper.close()
+
+    if failures:
+        print(f"\n❌ Engines disagree on: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Session Replay Check
+Records each fixture feed as a session archive and replays it end to end, including
+save_posts_consolidated, into a scratch master file, then replays it a second time
+into the same master, which must not add any posts
+
+Usage:
+    python benchmarks/check_session_replay.py [--feed feed_clean] [--keep DIR]
+
+A session is recorded the way scrape_posts records one: the feed HTML as a
+snapshot and the fixture article pages as fetched responses. Exits with
+status 1 if a replay fails, the saved master file is inconsistent or the
+second replay changes it.
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+
+from bench_parse_pipeline import FIXTURES_DIR, make_scraper, run_pipeline
+from session_archive import SessionRecorder  # noqa: E402
+from session_replay import replay_session  # noqa: E402
+
+
+def record_fixture_session(html_content, archive_path):
+    """Record one scroll over html_content, with the article pages it fetches"""
+    scraper = make_scraper("html.parser")
+    with contextlib.redirect_stdout(io.StringIO()):
+        scraper.session_recorder = SessionRecorder(archive_path, metadata={"fixture": True})
+        scraper.session_recorder.add_snapshot(html_content)
+        run_pipeline(scraper, html_content)
+        scraper.close()
+
+
+def replay_into(archive_path, master_file):
+    """Replay the archive into master_file; returns (replayed post count, saved master data)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        posts = replay_session(archive_path, config_file=os.path.join(FIXTURES_DIR, "config.json"),
+                               master_file=master_file)
+    with open(master_file, "r", encoding="utf-8") as f:
+        return len(posts), json.load(f)
+
+
+def master_problems(data):
+    """Inconsistencies in a saved master file"""
+    problems = []
+    posts = data.get("posts", [])
+    ids = [post.get("id") for post in posts]
+    if not posts:
+        problems.append("no posts saved")
+    if len(set(ids)) != len(ids):
+        problems.append(f"{len(ids) - len(set(ids))} repeated post ids")
+    if data.get("scraping_session", {}).get("total_posts") != len(posts):
+        problems.append("total_posts does not match the posts array")
+    return problems
+
+
+def check_feed(path, work_dir):
+    name = os.path.basename(path)[:-5]
+    with open(path, "r", encoding="utf-8") as f:
+        html_content = f.read()
+    archive_path = os.path.join(work_dir, f"{name}.zip")
+    master_file = os.path.join(work_dir, name, "posts_master.json")
+    record_fixture_session(html_content, archive_path)
+
+    try:
+        replayed, data = replay_into(archive_path, master_file)
+        # Everything in the session is now archived, so a second replay must add nothing
+        _, replayed_again = replay_into(archive_path, master_file)
+    except Exception:
+        print(f"  {name:<16} ❌ replay failed")
+        traceback.print_exc()
+        return False
+
+    problems = master_problems(data)
+    saved_ids = [post.get("id") for post in data.get("posts", [])]
+    added = [post.get("id") for post in replayed_again.get("posts", []) if post.get("id") not in saved_ids]
+    if added:
+        problems.append(f"second replay added {len(added)} posts ({', '.join(added[:3])})")
+    elif len(replayed_again.get("posts", [])) != len(saved_ids):
+        problems.append("second replay changed the master file")
+    print(f"  {name:<16} {replayed:4d} replayed, {len(saved_ids):4d} saved, {len(added):3d} added on replay  "
+          f"{'✅' if not problems else '❌ ' + '; '.join(problems)}")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded fixture sessions through the save path")
+    parser.add_argument("--feed", action="append", help="Only check the named feed (repeatable)")
+    parser.add_argument("--keep", help="Write archives and master files here instead of a temporary directory")
+    args = parser.parse_args()
+
+    feed_paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "feeds", "*.html")))
+    if args.feed:
+        feed_paths = [path for path in feed_paths if os.path.basename(path)[:-5] in args.feed]
+
+    work_dir = args.keep or tempfile.mkdtemp(prefix="replay_check_")
+    os.makedirs(work_dir, exist_ok=True)
+    print(f"📼 Session replay check ({work_dir})")
+    try:
+        failures = [os.path.basename(path)[:-5] for path in feed_paths if not check_feed(path, work_dir)]
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if failures:
+        print(f"\n❌ Failed: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Story ID Check
+Runs extract_story_id over feed units whose links mix the unit's own permalink with
+links to other pages' stories, and over feed unit HTML with shared stories nested in
+it, and checks each unit keeps its own story ID
+
+Usage:
+    python benchmarks/check_story_ids.py
+
+Exits with status 1 if any case picks the wrong ID.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from html_parsing import make_soup  # noqa: E402
+from post_visitor import PostFieldVisitor  # noqa: E402
+from story_ids import extract_story_id  # noqa: E402
+
+PAGE_URL = "https://www.facebook.com/Kuensel"
+SHARED_POST = "https://www.facebook.com/BBS/posts/123456789"
+
+# (description, hrefs, data-ft values, page URL, expected story ID)
+CASES = [
+    ("shared post does not replace the unit's pfbid",
+     ["https://www.facebook.com/Kuensel/posts/pfbid02abc", SHARED_POST], [], PAGE_URL, "pfbid02abc"),
+    ("second unit sharing the same post keeps its own ID",
+     ["https://www.facebook.com/Kuensel/posts/pfbid02xyz", SHARED_POST], [], PAGE_URL, "pfbid02xyz"),
+    ("without a page URL the first story link's page is the unit's",
+     ["https://www.facebook.com/Kuensel/posts/pfbid02abc", SHARED_POST], [], None, "pfbid02abc"),
+    ("own numeric ID beats an own pfbid",
+     ["/Kuensel/posts/pfbid02abc", "/Kuensel/posts/9000"], [], PAGE_URL, "9000"),
+    ("page names compare case-insensitively",
+     ["https://m.facebook.com/kuensel/posts/9001/"], [], PAGE_URL, "9001"),
+    ("permalink.php is used when no own-page link has an ID",
+     [SHARED_POST, "/permalink.php?story_fbid=9002&id=1"], [], PAGE_URL, "9002"),
+    ("own-page link beats permalink.php",
+     ["/permalink.php?story_fbid=1&id=1", "/Kuensel/posts/9003"], [], PAGE_URL, "9003"),
+    ("permalink.php of another numeric page is foreign",
+     ["/permalink.php?story_fbid=555&id=2", "/permalink.php?story_fbid=9004&id=1"], [],
+     "https://www.facebook.com/profile.php?id=1", "9004"),
+    ("only foreign links gives no ID",
+     [SHARED_POST, "https://example.org/news/1"], [], PAGE_URL, None),
+    ("data-ft top_level_post_id wins",
+     [SHARED_POST, "/Kuensel/posts/9005"], ['{"top_level_post_id":"9006"}'], PAGE_URL, "9006"),
+]
+
+SHARED_STORY = ('<div role="article"><a href="/BBS/posts/555" data-ft=\'{"top_level_post_id":"555"}\'>BBS</a>'
+                '<div data-ft=\'{"top_level_post_id":"556"}\'>Shared story text</div></div>')
+
+# (description, feed unit HTML, page URL, expected story ID); data-ft is read the way
+# both extraction engines collect it
+HTML_CASES = [
+    ("nested shared story's data-ft does not become the key",
+     '<div role="article"><a href="/Kuensel/posts/9100"><time>1h</time></a>' + SHARED_STORY + '</div>',
+     PAGE_URL, "9100"),
+    ("data-ft on the unit's own permalink anchor wins",
+     '<div role="article"><a href="/Kuensel/posts/pfbid02abc" data-ft=\'{"top_level_post_id":"9200"}\'>'
+     '<time>1h</time></a>' + SHARED_STORY + '</div>', PAGE_URL, "9200"),
+    ("data-ft on the unit element itself wins",
+     '<div role="article" data-ft=\'{"top_level_post_id":"9300"}\'>' + SHARED_STORY + '</div>', PAGE_URL, "9300"),
+    ("data-ft on non-anchor descendants is ignored",
+     '<div role="article"><a href="/Kuensel/posts/9400">1h</a>'
+     '<div data-ft=\'{"top_level_post_id":"557"}\'>Attachment</div></div>', PAGE_URL, "9400"),
+]
+
+
+def html_story_id(html, page_url):
+    unit = make_soup(html, "html.parser").select_one("[role='article']")
+    fields = PostFieldVisitor([], [], [], []).visit(unit, collect_content=False)
+    return extract_story_id(fields["hrefs"], fields["data_ft"], page_url)
+
+
+def main():
+    failures = 0
+    print("🔑 Story ID check")
+    results = [(description, extract_story_id(hrefs, data_ft, page_url), expected)
+               for description, hrefs, data_ft, page_url, expected in CASES]
+    results += [(description, html_story_id(html, page_url), expected)
+                for description, html, page_url, expected in HTML_CASES]
+    for description, story_id, expected in results:
+        ok = story_id == expected
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {description}" + ("" if ok else f": got {story_id}, expected {expected}"))
+
+    if failures:
+        print(f"\n❌ {failures} of {len(results)} cases failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
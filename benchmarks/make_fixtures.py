@@ -0,0 +1,120 @@
+"""
+Fixture Generator
+Writes the deterministic feed snapshots and Kuensel article pages used by the benchmarks
+
+Usage:
+    python benchmarks/make_fixtures.py
+
+Snapshots mimic the markup of the Kuensel Facebook feed: feed units with
+comments, photo links, background images, srcsets, videos and Kuensel
+article links. Saved snapshots of the real feed can be dropped into
+fixtures/feeds/ next to them.
+"""
+
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WORDS = ("the ministry of education announced new policy for schools across bhutan "
+         "farmers in punakha harvest rice season tourism industry green hotel standard "
+         "archery tournament team player championship football his majesty visited dzong "
+         "festival celebration heritage tradition vacancy job recruitment offer discount").split()
+
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+
+
+def article_slug(i):
+    return f"kuensel-story-{i}"
+
+
+def feed_unit(rng, i, comments=True):
+    """One feed unit, shaped like the Kuensel page feed"""
+    images = (
+        f'<img src="https://scontent.xx.fbcdn.net/v/t39/{i}_a.jpg" alt="May be an image of people">'
+        f'<img src="https://static.xx.fbcdn.net/rsrc.php/emoji.png" alt="emoji">'
+        f'<img class="x1 scaledImageFitWidth" src="https://scontent.xx.fbcdn.net/v/t39/{i}_b.jpg" alt="profile picture">'
+        f'<div data-src="https://scontent.xx.fbcdn.net/v/t39/{i}_c.jpg"></div>'
+        f'<div style="background-image: url(\'https://scontent.xx.fbcdn.net/v/t39/{i}_d.jpg\')"></div>'
+        f'<img srcset="https://scontent.xx.fbcdn.net/v/t39/{i}_e.jpg 1x, https://scontent.xx.fbcdn.net/v/t39/{i}_f.jpg 2x" src="">'
+        f'<a href="/Kuensel/photos/a.1/{i}/?type=3"><img src="https://scontent.xx.fbcdn.net/v/t39/{i}_g.jpg" alt="icon"></a>'
+        f'<a href="https://www.facebook.com/photo/?fbid={1000 + i}&set=a.1">photo</a>'
+    )
+    links = (
+        f'<a href="https://example.org/news/{i}">read</a>'
+        f'<a href="/permalink.php?story_fbid={5000 + i}&id=1">p</a>'
+        f'<a href="https://www.facebook.com/Kuensel/posts/pfbid0abc{i}">t</a>'
+        f'<a href="#">x</a>'
+    )
+    if i % 4 == 1:
+        links += f'<a href="https://kuenselonline.com/{article_slug(i)}/">kuenselonline.com</a>'
+    body = (
+        f'<div data-ad-preview="message"><div dir="auto">{sentence(rng, 25)}</div>'
+        f'<div dir="auto">{sentence(rng, 12)} See more</div></div>'
+    )
+    comment = ''
+    if comments:
+        comment = (
+            '<div role="article" aria-label="Comment by Someone"><span dir="auto">How about this?</span></div>'
+            '<div aria-label="Leave a comment">Comment</div>'
+        )
+    video = f'<video src="https://video.xx.fbcdn.net/{i}.mp4"></video>' if i % 3 == 0 else ''
+    # A few units carry no timestamp, like reshared posts in the live feed
+    timestamp = '' if i % 11 == 7 else f'<time datetime="2025-09-0{1 + i % 8}T0{i % 9}:00:00+0000">{i}h</time>'
+    return (
+        f'<div class="x1yztbdb"><div role="article" aria-posinset="{i}"><h3><a href="/Kuensel">Kuensel</a></h3>'
+        f'<span><a href="/Kuensel/posts/{9000 + i}">{timestamp}</a></span>'
+        f'{body}{images}{links}{video}<div>{i + 3} likes 2 comments {i} shares</div>{comment}</div></div>'
+    )
+
+
+def feed_page(post_count, comments, seed):
+    rng = random.Random(seed)
+    units = "".join(feed_unit(rng, i, comments) for i in range(post_count))
+    return f'<html><body><div data-pagelet="Feed">{units}</div></body></html>'
+
+
+def article_page(rng, i):
+    """A Kuensel article page in the layout of kuenselonline.com"""
+    paragraphs = "".join(f"<p>{sentence(rng, 30)} {sentence(rng, 20)}</p>" for _ in range(6))
+    return (
+        f'<html><head><title>{sentence(rng, 8)} - Kuensel Online</title></head><body>'
+        f'<header><nav><a href="/">Home</a></nav></header>'
+        f'<article><h1 class="entry-title">{sentence(rng, 10)}</h1>'
+        f'<div class="entry-content">{paragraphs}</div></article>'
+        f'<aside><p>Related: {sentence(rng, 6)}</p></aside></body></html>'
+    )
+
+
+def main():
+    feeds_dir = os.path.join(FIXTURES_DIR, "feeds")
+    articles_dir = os.path.join(FIXTURES_DIR, "articles")
+    os.makedirs(feeds_dir, exist_ok=True)
+    os.makedirs(articles_dir, exist_ok=True)
+
+    feeds = {
+        "feed_comments": (8, True),
+        "feed_clean": (8, False),
+        "feed_200": (200, True),
+    }
+    for name, (post_count, comments) in feeds.items():
+        with open(os.path.join(feeds_dir, f"{name}.html"), "w", encoding="utf-8") as f:
+            f.write(feed_page(post_count, comments, seed=post_count))
+        print(f"📝 Wrote feeds/{name}.html ({post_count} posts)")
+
+    # One linked article is left out so the missing-page path is covered
+    rng = random.Random(42)
+    article_count = 0
+    for i in range(1, 200, 4):
+        if i == 9:
+            continue
+        with open(os.path.join(articles_dir, f"{article_slug(i)}.html"), "w", encoding="utf-8") as f:
+            f.write(article_page(rng, i))
+        article_count += 1
+    print(f"📝 Wrote {article_count} article pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""
+Browser Backends
+The browser operations the scraper needs (navigate, scroll, run script, snapshot, open tabs,
+cookies, request blocking) behind one interface, with a Selenium and a Playwright engine
+
+Backends keep WebDriver's method names (get, execute_script, page_source, find_elements,
+quit, ...) so code written against a Selenium driver runs on either engine.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from fnmatch import translate
+
+try:
+    from photo_cache import DEFAULT_MAX_TABS, PHOTO_READY_CONDITION, load_in_tabs
+except ImportError:
+    from src.photo_cache import DEFAULT_MAX_TABS, PHOTO_READY_CONDITION, load_in_tabs
+
+try:
+    from playwright.async_api import Error as PlaywrightError, async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+BACKENDS = ("selenium", "playwright")
+SCROLL_TO_BOTTOM_SCRIPT = "window.scrollTo(0, document.body.scrollHeight);"
+
+# loadingFailed.blockedReason that ResourcePolicy counts as blocked
+BLOCKED_REASON = "inspector"
+
+
+def completed_future(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class BrowserBackend(ABC):
+    """Operations FacebookScraper performs on a browser.
+
+    open_tabs returns a Future so an engine that can load pages
+    concurrently does so while the scraper keeps scrolling; a synchronous
+    engine simply returns a completed one. Engines must implement every
+    abstract method; the rest have working defaults.
+    """
+
+    name = None
+
+    @abstractmethod
+    def get(self, url):
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def current_url(self):
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def page_source(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def execute_script(self, script, *args):
+        raise NotImplementedError
+
+    @abstractmethod
+    def execute_async_script(self, script, *args):
+        """Run a script whose last argument is a callback that receives the result"""
+        raise NotImplementedError
+
+    def scroll_to_bottom(self):
+        self.execute_script(SCROLL_TO_BOTTOM_SCRIPT)
+
+    @abstractmethod
+    def open_tabs(self, links, max_tabs=DEFAULT_MAX_TABS, timeout=5):
+        """Load links in at most max_tabs extra tabs; Future of {link: html or None}"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_cookies(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_cookie(self, cookie):
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_elements(self, by, value):
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_element(self, by, value):
+        raise NotImplementedError
+
+    @abstractmethod
+    def implicitly_wait(self, seconds):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_page_load_timeout(self, seconds):
+        raise NotImplementedError
+
+    def block_urls(self, patterns):
+        """Drop requests matching Chrome blocklist patterns ('*' wildcards); False if unsupported"""
+        return False
+
+    def network_events(self):
+        """Network events since the last call, as {"method": ..., "params": ...} in CDP form"""
+        return []
+
+    def browser_pids(self):
+        """PIDs of the processes this backend launched (the browser runs under them); [] if unknown"""
+        return []
+
+    @abstractmethod
+    def quit(self):
+        raise NotImplementedError
+
+
+class SeleniumBackend(BrowserBackend):
+    """A Selenium Chrome WebDriver; anything not defined here goes straight to the driver"""
+
+    name = "selenium"
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __getattr__(self, attribute):
+        # Only called for attributes not found on the backend (switch_to, service, ...)
+        return getattr(self.driver, attribute)
+
+    def get(self, url):
+        self.driver.get(url)
+
+    @property
+    def current_url(self):
+        return self.driver.current_url
+
+    @property
+    def page_source(self):
+        return self.driver.page_source
+
+    def execute_script(self, script, *args):
+        return self.driver.execute_script(script, *args)
+
+    def execute_async_script(self, script, *args):
+        return self.driver.execute_async_script(script, *args)
+
+    def open_tabs(self, links, max_tabs=DEFAULT_MAX_TABS, timeout=5):
+        # One WebDriver session can't be driven from two threads, so this loads before returning
+        return completed_future(load_in_tabs(self.driver, links, max_tabs, timeout))
+
+    def get_cookies(self):
+        return self.driver.get_cookies()
+
+    def add_cookie(self, cookie):
+        self.driver.add_cookie(cookie)
+
+    def find_elements(self, by, value):
+        return self.driver.find_elements(by, value)
+
+    def find_element(self, by, value):
+        return self.driver.find_element(by, value)
+
+    def implicitly_wait(self, seconds):
+        self.driver.implicitly_wait(seconds)
+
+    def set_page_load_timeout(self, seconds):
+        self.driver.set_page_load_timeout(seconds)
+
+    def block_urls(self, patterns):
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+        return True
+
+    def network_events(self):
+        # Needs the goog:loggingPrefs performance log (see ResourcePolicy.configure_options)
+        events = []
+        for entry in self.driver.get_log("performance"):
+            try:
+                events.append(json.loads(entry["message"])["message"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return events
+
+    def browser_pids(self):
+        # Chrome runs under chromedriver
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        return [process.pid] if process is not None else []
+
+    def quit(self):
+        self.driver.quit()
+
+
+class PlaywrightElement:
+    """ElementHandle with the WebElement methods the scraper uses"""
+
+    def __init__(self, backend, handle):
+        self.backend = backend
+        self.handle = handle
+
+    def click(self):
+        self.backend.call(self.handle.click())
+
+    def send_keys(self, text):
+        self.backend.call(self.handle.type(text))
+
+    def get_attribute(self, name):
+        return self.backend.call(self.handle.get_attribute(name))
+
+    @property
+    def text(self):
+        return self.backend.call(self.handle.inner_text())
+
+
+def playwright_selector(by, value):
+    """Selenium locator -> Playwright selector"""
+    if by == "id":
+        return f"#{value}"
+    if by == "name":
+        return f"[name='{value}']"
+    if by == "xpath":
+        return f"xpath={value}"
+    if by == "css selector":
+        return value
+    raise ValueError(f"Unsupported locator: {by}")
+
+
+def wrap_script(script, asynchronous=False):
+    """Selenium-style script body (arguments[...], callback last when async) as a Playwright function"""
+    if asynchronous:
+        return ("(args) => new Promise((resolve) => { (function () {\n" + script +
+                "\n}).apply(null, args.concat([resolve])); })")
+    return "(args) => (function () {\n" + script + "\n}).apply(null, args)"
+
+
+class PlaywrightBackend(BrowserBackend):
+    """Chromium driven through Playwright's asyncio API.
+
+    The event loop runs in a background thread. Synchronous calls from the
+    scraper are scheduled on it and wait for their result, while open_tabs
+    returns at once: its tabs keep loading concurrently with whatever the
+    scraper does next on the main page.
+    """
+
+    name = "playwright"
+
+    def __init__(self, headless=True, user_agent=None, user_data_dir=None, viewport=(1920, 1080)):
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("Playwright is not installed (pip install playwright && playwright install chromium)")
+        self.implicit_wait = 0
+        self.events = []
+        self.events_lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="playwright", daemon=True)
+        self.thread.start()
+        self.call(self.start(headless, user_agent, user_data_dir, viewport))
+
+    def call(self, coroutine, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    async def start(self, headless, user_agent, user_data_dir, viewport):
+        manager = async_playwright()
+        self.playwright = await manager.start()
+        # Chromium runs under Playwright's driver process, which has no public PID accessor
+        transport = getattr(getattr(manager, "_connection", None), "_transport", None)
+        self.driver_process = getattr(transport, "_proc", None)
+        options = {"viewport": {"width": viewport[0], "height": viewport[1]}}
+        if user_agent:
+            options["user_agent"] = user_agent
+        if user_data_dir:
+            # Persistent profile, like Chrome's --user-data-dir
+            self.browser = None
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                user_data_dir, headless=headless, **options)
+            self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=headless)
+            self.context = await self.browser.new_context(**options)
+            self.page = await self.context.new_page()
+        self.context.on("request", self.on_request)
+        self.context.on("requestfinished", self.on_request_finished)
+        self.context.on("requestfailed", self.on_request_failed)
+
+    def record(self, method, params):
+        with self.events_lock:
+            self.events.append({"method": method, "params": params})
+
+    def on_request(self, request):
+        self.record("Network.requestWillBeSent", {"requestId": id(request), "request": {"url": request.url},
+                                                  "type": request.resource_type.capitalize()})
+
+    async def on_request_finished(self, request):
+        try:
+            sizes = await request.sizes()
+            transferred = sizes["responseHeadersSize"] + sizes["responseBodySize"]
+        except PlaywrightError:
+            transferred = 0
+        self.record("Network.loadingFinished", {"requestId": id(request), "encodedDataLength": transferred})
+
+    def on_request_failed(self, request):
+        params = {"requestId": id(request)}
+        if "ERR_BLOCKED_BY_CLIENT" in (request.failure or ""):
+            params["blockedReason"] = BLOCKED_REASON
+        self.record("Network.loadingFailed", params)
+
+    def get(self, url):
+        self.call(self.page.goto(url, wait_until="domcontentloaded"))
+
+    @property
+    def current_url(self):
+        return self.page.url
+
+    @property
+    def page_source(self):
+        return self.call(self.page.content())
+
+    @staticmethod
+    def unwrap(args):
+        return [arg.handle if isinstance(arg, PlaywrightElement) else arg for arg in args]
+
+    def execute_script(self, script, *args):
+        return self.call(self.page.evaluate(wrap_script(script), self.unwrap(args)))
+
+    def execute_async_script(self, script, *args):
+        return self.call(self.page.evaluate(wrap_script(script, asynchronous=True), self.unwrap(args)))
+
+    async def load_tab(self, link, semaphore, deadline):
+        async with semaphore:
+            page = await self.context.new_page()
+            try:
+                remaining = max(0.1, deadline - time.time()) * 1000
+                await page.goto(link, wait_until="domcontentloaded", timeout=remaining)
+                try:
+                    await page.wait_for_function(PHOTO_READY_CONDITION,
+                                                 timeout=max(100, (deadline - time.time()) * 1000))
+                except PlaywrightError:
+                    print(f"Timeout reached for photo link, reading what has loaded: {link[:80]}")
+                return await page.content()
+            except PlaywrightError as e:
+                print(f"⚠️ Error processing photo link: {e}")
+                return None
+            finally:
+                await page.close()
+
+    async def load_tabs(self, links, max_tabs, timeout):
+        semaphore = asyncio.Semaphore(max_tabs)
+        # Same budget as the Selenium pool: timeout per batch of max_tabs pages
+        deadline = time.time() + timeout * max(1, -(-len(links) // max_tabs))
+        pages = await asyncio.gather(*(self.load_tab(link, semaphore, deadline) for link in links))
+        return dict(zip(links, pages))
+
+    def open_tabs(self, links, max_tabs=DEFAULT_MAX_TABS, timeout=5):
+        return asyncio.run_coroutine_threadsafe(self.load_tabs(list(links), max_tabs, timeout), self.loop)
+
+    def get_cookies(self):
+        cookies = []
+        for cookie in self.call(self.context.cookies()):
+            cookie = dict(cookie)
+            expires = cookie.pop("expires", -1)
+            if expires and expires > 0:
+                cookie["expiry"] = int(expires)
+            cookies.append(cookie)
+        return cookies
+
+    def add_cookie(self, cookie):
+        cookie = dict(cookie)
+        if "expiry" in cookie:
+            cookie["expires"] = cookie.pop("expiry")
+        if "domain" in cookie:
+            cookie.setdefault("path", "/")
+        else:
+            # Playwright takes either a url or a domain/path pair
+            cookie.pop("path", None)
+            cookie["url"] = self.page.url
+        self.call(self.context.add_cookies([cookie]))
+
+    async def query_all(self, selector):
+        if self.implicit_wait:
+            try:
+                await self.page.wait_for_selector(selector, state="attached", timeout=self.implicit_wait * 1000)
+            except PlaywrightError:
+                return []
+        return await self.page.query_selector_all(selector)
+
+    def find_elements(self, by, value):
+        handles = self.call(self.query_all(playwright_selector(by, value)))
+        return [PlaywrightElement(self, handle) for handle in handles]
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise LookupError(f"No element matches {by}={value}")
+        return elements[0]
+
+    def implicitly_wait(self, seconds):
+        self.implicit_wait = seconds
+
+    def set_page_load_timeout(self, seconds):
+        self.page.set_default_navigation_timeout(seconds * 1000)
+
+    def block_urls(self, patterns):
+        blocked = re.compile("|".join(translate(pattern) for pattern in patterns))
+
+        async def abort(route):
+            await route.abort("blockedbyclient")
+
+        self.call(self.context.route(blocked, abort))
+        return True
+
+    def network_events(self):
+        with self.events_lock:
+            events, self.events = self.events, []
+        return events
+
+    def browser_pids(self):
+        return [self.driver_process.pid] if self.driver_process is not None else []
+
+    async def stop(self):
+        await self.context.close()
+        if self.browser:
+            await self.browser.close()
+        await self.playwright.stop()
+
+    def quit(self):
+        try:
+            self.call(self.stop(), timeout=30)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=5)
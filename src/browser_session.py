@@ -0,0 +1,111 @@
+"""
+Browser Session
+Saves Facebook cookies and local storage after a login and restores them on later runs,
+so the scraper only types credentials when the saved session has expired
+"""
+
+import json
+import os
+import time
+
+from selenium.webdriver.common.by import By
+
+FACEBOOK_HOME = "https://www.facebook.com/"
+# Cheap same-origin page to attach cookies to before loading anything heavy
+FACEBOOK_ORIGIN_PAGE = "https://www.facebook.com/robots.txt"
+LOGIN_COOKIE = "c_user"
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "expiry", "sameSite")
+SAME_SITE_VALUES = ("Strict", "Lax", "None")
+
+READ_LOCAL_STORAGE_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+WRITE_LOCAL_STORAGE_SCRIPT = """
+var items = arguments[0];
+Object.keys(items).forEach(function (key) {
+    window.localStorage.setItem(key, items[key]);
+});
+"""
+
+
+def has_login_cookie(driver):
+    return any(cookie.get("name") == LOGIN_COOKIE for cookie in driver.get_cookies())
+
+
+def save_session(driver, path):
+    """Write the browser's Facebook cookies and local storage to path (owner-only permissions)"""
+    if not has_login_cookie(driver):
+        print("⚠️  No logged-in Facebook session to save")
+        return False
+    if not driver.current_url.startswith(FACEBOOK_HOME):
+        driver.get(FACEBOOK_ORIGIN_PAGE)
+    data = {
+        "saved_at": time.time(),
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(READ_LOCAL_STORAGE_SCRIPT) or {},
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_file = path + '.tmp'
+    fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(temp_file, path)
+    print(f"💾 Saved browser session to {path}")
+    return True
+
+
+def restore_session(driver, path, max_age_days=30):
+    """Load saved cookies and local storage into the browser; False if there is nothing usable"""
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not read saved session {path}: {e}")
+        return False
+
+    age_days = (time.time() - data.get("saved_at", 0)) / 86400
+    if max_age_days and age_days > max_age_days:
+        print(f"Saved session is {age_days:.0f} days old, logging in again")
+        return False
+
+    now = time.time()
+    driver.get(FACEBOOK_ORIGIN_PAGE)
+    restored = 0
+    for cookie in data.get("cookies", []):
+        if cookie.get("expiry") and cookie["expiry"] < now:
+            continue
+        cookie = {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+        if "expiry" in cookie:
+            cookie["expiry"] = int(cookie["expiry"])
+        if cookie.get("sameSite") not in SAME_SITE_VALUES:
+            cookie.pop("sameSite", None)
+        try:
+            driver.add_cookie(cookie)
+            restored += 1
+        except Exception as e:
+            print(f"[DEBUG] Skipping cookie {cookie.get('name')}: {e}")
+    if data.get("local_storage"):
+        driver.execute_script(WRITE_LOCAL_STORAGE_SCRIPT, data["local_storage"])
+    print(f"Restored {restored} cookies from {path}")
+    return restored > 0
+
+
+def session_is_valid(driver, implicit_wait=15):
+    """Load the home page once and check Facebook still treats the browser as logged in"""
+    driver.get(FACEBOOK_HOME)
+    driver.implicitly_wait(0)  # Don't wait for a login form that should not be there
+    try:
+        login_form = driver.find_elements(By.CSS_SELECTOR, "form[action*='login'] input[name='pass']")
+        return has_login_cookie(driver) and not login_form
+    finally:
+        driver.implicitly_wait(implicit_wait)
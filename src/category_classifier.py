@@ -0,0 +1,296 @@
+"""
+Category Classifier
+Keyword automaton that assigns post categories in a single pass over the text
+"""
+
+import argparse
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from datetime import datetime
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+DEFAULT_CATEGORY = "general"
+
+# Checked in order; the first category with any keyword in the text wins
+CATEGORY_KEYWORDS = {
+    "news": ["breaking", "news", "update", "latest", "report", "tourism", "hotel", "green hotel", "industry", "policy", "standard"],
+    "event": ["event", "festival", "celebration", "observe", "foundation day", "ceremony", "state visit", "majesty", "king", "president"],
+    "culture": ["tradition", "culture", "heritage", "festival", "dzong", "sacred", "temple", "pagoda"],
+    "politics": ["minister", "government", "policy", "election", "parliament", "supreme court", "conviction", "sentence"],
+    "sports": ["match", "game", "tournament", "score", "team", "player", "championship", "football", "cricket", "archery"],
+    "advertisement": ["available", "shop", "buy", "offer", "discount", "for sale", "vacancy", "job", "recruitment"],
+}
+
+# Specific phrases that override the category table, checked before it
+PRIORITY_RULES = [
+    (["green hotel", "tourism industry", "hospitality sector"], "news"),
+    (["state visit", "his majesty", "her majesty"], "event"),
+    (["supreme court", "conviction", "sentence"], "politics"),
+]
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed keyword set.
+
+    Matches plain substrings, like `keyword in text`, but finds every
+    keyword in one scan of the text instead of one scan per keyword.
+    """
+
+    def __init__(self, keywords):
+        self.automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            self.automaton.add_word(keyword, keyword)
+        self.automaton.make_automaton()
+
+    def find_all(self, text):
+        """Return the set of keywords occurring anywhere in text"""
+        return {keyword for _, keyword in self.automaton.iter(text)}
+
+
+class CategoryClassifier:
+    """Applies the priority rules and the category table to keyword hits"""
+
+    def __init__(self, category_keywords=CATEGORY_KEYWORDS, priority_rules=PRIORITY_RULES):
+        self.rules = [(set(phrases), category) for phrases, category in priority_rules]
+        self.rules += [(set(keywords), category) for category, keywords in category_keywords.items()]
+        self.automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self.automaton = KeywordAutomaton({keyword for keywords, _ in self.rules for keyword in keywords})
+
+    def classify(self, content):
+        """Determine category based on content"""
+        if not content:
+            return DEFAULT_CATEGORY
+
+        content_lower = content.lower()
+        if self.automaton is None:
+            # Without pyahocorasick, scan rule by rule and stop at the first hit
+            for keywords, category in self.rules:
+                if any(keyword in content_lower for keyword in keywords):
+                    return category
+            return DEFAULT_CATEGORY
+
+        hits = self.automaton.find_all(content_lower)
+        if hits:
+            for keywords, category in self.rules:
+                if not hits.isdisjoint(keywords):
+                    return category
+
+        return DEFAULT_CATEGORY
+
+
+CLASSIFIER = CategoryClassifier()
+
+
+def classify(content):
+    """Categorize content with the default category table"""
+    return CLASSIFIER.classify(content)
+
+
+READ_CHUNK = 1 << 20  # Characters read from the master file at a time
+
+
+class JSONStream:
+    """Reads a JSON file one value at a time instead of loading it whole"""
+
+    def __init__(self, f, chunk_size=READ_CHUNK):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def read_more(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at the end of the file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next value, reading more of the file until all of it is buffered"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read_more()
+
+    def array(self):
+        """Yield the items of the array at the current position one by one"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() != ",":
+                break
+            self.pos += 1
+        self.expect("]")
+
+
+def iter_master_fields(f):
+    """Yield (key, value) for each top-level field of a master file.
+
+    The posts array is yielded as a generator of posts, which has to be
+    consumed before the next field is read.
+    """
+    stream = JSONStream(f)
+    stream.expect("{")
+    first = True
+    while stream.peek() != "}":
+        if not first:
+            stream.expect(",")
+        first = False
+        key = stream.value()
+        stream.expect(":")
+        if key == "posts" and stream.peek() == "[":
+            yield key, stream.array()
+        else:
+            yield key, stream.value()
+    stream.expect("}")
+
+
+def write_master_fields(f, fields):
+    """Write (key, value) pairs as json.dump(indent=2, ensure_ascii=False) would.
+
+    Iterator values (the posts) are written one item at a time.
+    """
+    f.write("{")
+    empty = True
+    for key, value in fields:
+        f.write("\n  " if empty else ",\n  ")
+        empty = False
+        f.write(json.dumps(key, ensure_ascii=False) + ": ")
+        if not isinstance(value, Iterator):
+            f.write(json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            continue
+        f.write("[")
+        no_items = True
+        for item in value:
+            f.write("\n    " if no_items else ",\n    ")
+            no_items = False
+            f.write(json.dumps(item, indent=2, ensure_ascii=False).replace("\n", "\n    "))
+        f.write("]" if no_items else "\n  ]")
+    f.write("}" if empty else "\n}")
+
+
+def reclassify_master_file(master_file="data/kuensel_posts_master.json", dry_run=False):
+    """Re-run categorization over every post in the master file in one streaming pass.
+
+    Posts are read, reclassified and written to a temporary file one at a
+    time, so the whole archive is never held in memory. The temporary file
+    replaces the master only after it is complete.
+    """
+    if not os.path.exists(master_file):
+        print(f"Master file not found: {master_file}")
+        return False
+
+    changes = {}
+    counts = {"posts": 0, "updated": 0}
+
+    def reclassified(posts):
+        for post in posts:
+            counts["posts"] += 1
+            # Older posts store the category under "category"
+            key = "categoryID" if "categoryID" in post or "category" not in post else "category"
+            old_category = post.get(key, DEFAULT_CATEGORY)
+            new_category = classify(post.get('content', ''))
+            if new_category != old_category:
+                post[key] = new_category
+                counts["updated"] += 1
+                transition = f"{old_category} → {new_category}"
+                changes[transition] = changes.get(transition, 0) + 1
+            yield post
+
+    temp_file = master_file + '.tmp'
+    try:
+        with open(master_file, 'r', encoding='utf-8') as f:
+            fields = ((key, reclassified(value) if isinstance(value, Iterator) else value)
+                      for key, value in iter_master_fields(f))
+            if dry_run:
+                for _, value in fields:
+                    if isinstance(value, Iterator):
+                        for _ in value:
+                            pass
+            else:
+                with open(temp_file, 'w', encoding='utf-8') as out:
+                    write_master_fields(out, fields)
+
+        print(f"🏷️  Reclassified {counts['updated']} of {counts['posts']} posts")
+        for transition, count in sorted(changes.items(), key=lambda item: -item[1]):
+            print(f"   {transition}: {count}")
+
+        if dry_run or counts["updated"] == 0:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            return True
+
+        backup_file = f"{master_file}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        shutil.copy2(master_file, backup_file)
+        os.replace(temp_file, master_file)
+
+        print(f"✅ Saved reclassified posts to {master_file}")
+        print(f"📁 Backup saved: {backup_file}")
+        return True
+
+    except Exception as e:
+        print(f"Error reclassifying posts: {e}")
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kuensel post category classifier')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    reclassify_parser = subparsers.add_parser('reclassify', help='Re-run categorization over the master file')
+    reclassify_parser.add_argument('--master-file',
+                                   default='data/kuensel_posts_master.json',
+                                   help='Path to the master file (default: data/kuensel_posts_master.json)')
+    reclassify_parser.add_argument('--dry-run',
+                                   action='store_true',
+                                   help='Report category changes without saving')
+
+    args = parser.parse_args()
+    if args.command == 'reclassify':
+        success = reclassify_master_file(args.master_file, dry_run=args.dry_run)
+        raise SystemExit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Driver Cache
+Remembers which ChromeDriver matches the installed Chrome so startup doesn't ask
+webdriver-manager (and the network) every time
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+
+DEFAULT_CACHE_FILE = "data/driver_cache.json"
+
+CHROME_BINARIES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+CHROMEDRIVER_PATHS = [
+    "/usr/local/bin/chromedriver",
+    "/usr/bin/chromedriver",
+    "chromedriver",
+]
+
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+(?:\.\d+)?')
+
+
+def binary_version(path):
+    """Version string printed by `path --version`, or None"""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+
+def major_version(version):
+    return version.split(".")[0] if version else None
+
+
+def find_chrome_binary():
+    candidates = [os.environ.get("CHROME_BIN")] + CHROME_BINARIES
+    for candidate in candidates:
+        if not candidate:
+            continue
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def find_local_chromedriver(chrome_version):
+    """An installed chromedriver whose major version matches Chrome, without launching anything"""
+    for candidate in CHROMEDRIVER_PATHS:
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if not path or not os.path.exists(path):
+            continue
+        version = binary_version(path)
+        if version and (chrome_version is None or major_version(version) == major_version(chrome_version)):
+            return path, version
+    return None, None
+
+
+class DriverCache:
+    """Chrome binary and matching ChromeDriver, cached in a JSON file.
+
+    A cache hit costs one `chrome --version` call. The entry is dropped
+    when Chrome's version changes or the cached driver fails to start, and
+    replaced by whichever fallback driver starts instead.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE):
+        self.path = path
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, entry):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = self.path + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(temp_file, self.path)
+
+    def invalidate(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def cached(self):
+        """The cached entry if it still matches the installed Chrome, else None.
+
+        An entry without a Chrome version can't be checked against the browser,
+        so it counts as a miss.
+        """
+        entry = self.load()
+        driver_path = entry.get("driver_path")
+        chrome_binary = entry.get("chrome_binary")
+        if not driver_path or not os.path.exists(driver_path) or not entry.get("chrome_version"):
+            return None
+        if not chrome_binary or not os.path.exists(chrome_binary):
+            return None
+        if binary_version(chrome_binary) != entry["chrome_version"]:
+            return None
+        return entry
+
+    def remember(self, chrome_binary, chrome_version, driver_path):
+        """Cache the driver that started; skipped when Chrome's version is unknown"""
+        driver_version = binary_version(driver_path)
+        if not chrome_version:
+            print(f"ChromeDriver {driver_version} not cached: Chrome version unknown")
+            return
+        self.save({
+            "chrome_binary": chrome_binary,
+            "chrome_version": chrome_version,
+            "driver_path": driver_path,
+            "driver_version": driver_version,
+        })
+
+    @staticmethod
+    def driver_candidates(chrome_version, install_driver):
+        """(source, driver path) to try in order; install_driver() runs at most once, and
+        None last lets Selenium find a driver itself"""
+        tried = set()
+        driver_path, driver_version = find_local_chromedriver(chrome_version)
+        if driver_path:
+            tried.add(driver_path)
+            yield f"local ChromeDriver {driver_version}", driver_path
+        try:
+            driver_path = install_driver()
+        except Exception as e:
+            print(f"⚠️  webdriver-manager failed: {e}")
+        else:
+            if driver_path not in tried:
+                tried.add(driver_path)
+                yield "webdriver-manager", driver_path
+        for candidate in CHROMEDRIVER_PATHS:
+            path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+            if path and os.path.exists(path) and path not in tried:
+                tried.add(path)
+                yield "system ChromeDriver", path
+        yield "Selenium's default lookup", None
+
+    def start(self, launch, install_driver):
+        """Driver from launch(chrome_binary, driver_path), trying the cached driver, then each
+        candidate in turn. Whichever driver starts is written back to the cache. launch
+        returns the driver or raises; returns None if nothing starts
+        """
+        entry = self.cached()
+        if entry:
+            try:
+                driver = launch(entry["chrome_binary"], entry["driver_path"])
+                print(f"Using cached ChromeDriver {entry.get('driver_version')} for Chrome {entry['chrome_version']}")
+                return driver
+            except Exception as e:
+                print(f"⚠️  Cached ChromeDriver failed, resolving again: {e}")
+                self.invalidate()
+
+        chrome_binary = find_chrome_binary()
+        chrome_version = binary_version(chrome_binary) if chrome_binary else None
+        for source, driver_path in self.driver_candidates(chrome_version, install_driver):
+            try:
+                driver = launch(chrome_binary, driver_path)
+            except Exception as e:
+                print(f"⚠️  Failed to start Chrome with {source}: {e}")
+                continue
+            # Selenium's own lookup records the driver it found on the service
+            driver_path = driver_path or getattr(getattr(driver, "service", None), "path", None)
+            print(f"WebDriver initialized with {source}" + (f" at {driver_path}" if driver_path else ""))
+            if driver_path and os.path.exists(driver_path):
+                self.remember(chrome_binary, chrome_version, driver_path)
+            return driver
+        return None
@@ -7,7 +7,7 @@ from bs4 import BeautifulSoup, Tag
 import time
 import json
 import hashlib
-from datetime import datetime
+from datetime import datetime, timezone
 import html
 import re
 import os
@@ -15,11 +15,423 @@ import requests
 import subprocess
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urljoin, urlparse
 try:
     from notification_system import NotificationSystem
 except ImportError:
     from src.notification_system import NotificationSystem
+try:
+    from html_parsing import make_soup, parse_document, resolve_parser_backend
+except ImportError:
+    from src.html_parsing import make_soup, parse_document, resolve_parser_backend
+try:
+    from near_duplicates import ContentSketch, NearDuplicateIndex, index_path_for, is_near_duplicate, new_session_index
+except ImportError:
+    from src.near_duplicates import ContentSketch, NearDuplicateIndex, index_path_for, is_near_duplicate, new_session_index
+try:
+    from post_index import PostIndex, content_fingerprint, load_session_info, post_index_path_for
+except ImportError:
+    from src.post_index import PostIndex, content_fingerprint, load_session_info, post_index_path_for
+try:
+    from page_targets import read_config
+except ImportError:
+    from src.page_targets import read_config
+try:
+    from story_ids import extract_story_id
+except ImportError:
+    from src.story_ids import extract_story_id
+try:
+    from browser_session import restore_session, save_session, session_is_valid
+except ImportError:
+    from src.browser_session import restore_session, save_session, session_is_valid
+try:
+    from browser_backends import PlaywrightBackend, SeleniumBackend
+except ImportError:
+    from src.browser_backends import PlaywrightBackend, SeleniumBackend
+try:
+    from driver_cache import DEFAULT_CACHE_FILE as DEFAULT_DRIVER_CACHE_FILE, DriverCache
+except ImportError:
+    from src.driver_cache import DEFAULT_CACHE_FILE as DEFAULT_DRIVER_CACHE_FILE, DriverCache
+try:
+    from page_waits import FEED_UNIT_SELECTOR, PageWaiter
+except ImportError:
+    from src.page_waits import FEED_UNIT_SELECTOR, PageWaiter
+try:
+    from photo_cache import DEFAULT_CACHE_FILE as DEFAULT_PHOTO_CACHE_FILE, DEFAULT_MAX_TABS, DEFAULT_TTL_DAYS, PhotoCache, load_in_tabs, photo_fbid
+except ImportError:
+    from src.photo_cache import DEFAULT_CACHE_FILE as DEFAULT_PHOTO_CACHE_FILE, DEFAULT_MAX_TABS, DEFAULT_TTL_DAYS, PhotoCache, load_in_tabs, photo_fbid
+try:
+    from resource_policy import ResourcePolicy
+except ImportError:
+    from src.resource_policy import ResourcePolicy
+try:
+    from session_archive import SessionRecorder
+except ImportError:
+    from src.session_archive import SessionRecorder
+try:
+    from category_classifier import CLASSIFIER
+except ImportError:
+    from src.category_classifier import CLASSIFIER
+try:
+    import text_rules
+except ImportError:
+    from src import text_rules
+try:
+    from post_visitor import PostFieldVisitor, init_parse_worker, serialize_with_ancestors, visit_fragment
+except ImportError:
+    from src.post_visitor import PostFieldVisitor, init_parse_worker, serialize_with_ancestors, visit_fragment
+
+# Serializes only top-level feed units that were not yet handed to the parser.
+# Each unit is tagged with its text length so units that grow later (e.g. after
+# "See more" expansion) are serialized again, while unchanged ones are skipped.
+NEW_FEED_UNITS_SCRIPT = """
+var unitSelector = "[role='article'], [data-pagelet*='FeedUnit']";
+var units = Array.prototype.filter.call(document.querySelectorAll(unitSelector), function (el) {
+    return !el.parentElement || !el.parentElement.closest(unitSelector);
+});
+if (units.length === 0) {
+    return null;
+}
+var fresh = [];
+units.forEach(function (el) {
+    var signature = String(el.textContent.length);
+    if (el.getAttribute('data-scraper-seen') !== signature) {
+        fresh.push(el.outerHTML);
+        el.setAttribute('data-scraper-seen', signature);
+    }
+});
+return {total: units.length, html: fresh};
+"""
+
+# Clicks every "See more" control in feed units that still have one, in one round
+# trip, then resolves once the clicked units have re-rendered (text grew or the
+# control went away), the DOM has been quiet for quietMs, or timeoutMs has passed.
+# Units with nothing left to expand are marked with their text length and skipped
+# on later calls until that changes, since units render progressively and the
+# control may not exist yet on the first pass.
+EXPAND_SEE_MORE_SCRIPT = """
+var timeoutMs = arguments[0], quietMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var unitSelector = "[role='article'], [data-pagelet*='FeedUnit']";
+var controlXPath = ".//div[contains(text(), 'See more')] | .//span[contains(text(), 'See more')] | " +
+    ".//*[@aria-label[contains(., 'See more')]]";
+var start = Date.now();
+var units = Array.prototype.filter.call(document.querySelectorAll(unitSelector), function (el) {
+    return el.getAttribute('data-scraper-expanded') !== String(el.textContent.length) &&
+        (!el.parentElement || !el.parentElement.closest(unitSelector));
+});
+
+var pending = [], clicked = 0, failed = 0;
+units.forEach(function (unit) {
+    var controls = document.evaluate(controlXPath, unit, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var unitClicks = [];
+    for (var i = 0; i < controls.snapshotLength; i++) {
+        var control = controls.snapshotItem(i);
+        var link = control.closest('a[href]');
+        // Skip controls already clicked and links that would navigate away from the feed
+        if (control.hasAttribute('data-scraper-clicked') || (link && link.getAttribute('href') !== '#')) {
+            continue;
+        }
+        control.setAttribute('data-scraper-clicked', '1');
+        try {
+            control.click();
+            unitClicks.push(control);
+        } catch (e) {
+            failed += 1;
+        }
+    }
+    if (unitClicks.length) {
+        clicked += unitClicks.length;
+        pending.push({unit: unit, length: unit.textContent.length, controls: unitClicks});
+    } else {
+        unit.setAttribute('data-scraper-expanded', String(unit.textContent.length));
+    }
+});
+
+if (!pending.length) {
+    done({clicked: 0, expanded: 0, failed: failed, waited: 0});
+    return;
+}
+
+var lastMutation = Date.now();
+var observer = new MutationObserver(function () { lastMutation = Date.now(); });
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+
+function rendered(entry) {
+    return entry.unit.textContent.length !== entry.length ||
+        entry.controls.every(function (control) { return !control.isConnected; });
+}
+
+(function poll() {
+    var now = Date.now();
+    var expanded = pending.filter(rendered).length;
+    if (expanded === pending.length || now - lastMutation >= quietMs || now - start >= timeoutMs) {
+        observer.disconnect();
+        done({clicked: clicked, expanded: expanded, failed: failed, waited: now - start});
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+PHOTO_PAGE_TIMEOUT = 5  # Seconds per batch of background photo tabs
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+DEFAULT_PAGE_URL = "https://www.facebook.com/Kuensel"
+
+# More comprehensive selectors for Facebook posts
+POST_SELECTORS = [
+    "[role='article']",
+    "[data-pagelet*='FeedUnit']",
+    ".userContentWrapper",
+    "[data-testid='fb-ufi-mention-bling-bar']",
+    "div[data-ft*='top_level_post_id']",
+    "div[data-ad-preview='message']",
+    ".x1yztbdb",
+    "[data-pagelet='Feed'] div:not([class]) > div"
+]
+
+# Improved content selectors (Facebook 2024/2025 structure)
+CONTENT_SELECTORS = [
+    # Main post content
+    "[data-ad-preview='message']",
+    ".userContent",
+    "[data-testid='post_message']",
+
+    # Facebook's new structure selectors
+    "div[data-ad-comet-preview='message']",
+    "div[data-testid='story-subtitle'] + div",
+    "div[data-testid='story-subtitle'] ~ div",
+    "[data-testid='story-subtitle'] ~ [dir='auto']",
+
+    # Generic text content selectors
+    "div[dir='auto']",
+    "span[dir='auto']",
+    "div[direction='auto']",
+    "div > span:not([class])",
+    "div > div > span",
+
+    # Fallback - any div with substantial text
+    "div:not([class*='comment']):not([class*='reaction'])",
+    "p",
+
+    # Even broader fallback
+    "[role='article'] div",
+    "[role='article'] span",
+    "[role='article'] p"
+]
+
+# Selectors to exclude (comments and reactions)
+EXCLUDE_SELECTORS = [
+    "[data-testid='comment']",
+    "[role='article'] [role='article']",  # Nested articles (comments)
+    ".comment",
+    "[data-testid='UFI2Comment/root']",
+    "[aria-label*='comment']",
+    "[aria-label*='Comment']",
+    "div[aria-label*='reaction']",
+    "div[aria-label*='like']",
+    "[data-testid='reactions-section']",
+    "[data-testid='social-context']",
+    "[data-testid='story-header']",
+    "[data-testid='story-subtitle']"
+]
+
+# Extract actual author if it's not a page post
+AUTHOR_SELECTORS = [
+    "[data-testid='story-subtitle']",
+    "[data-testid='story-footer']",
+    "h3 a",
+    ".fcg a"
+]
+
+# Lazy-loaded image URLs live in several data attributes
+IMAGE_DATA_ATTRS = [
+    'data-imgurl', 'data-src', 'data-original', 'data-lazy-src',
+    'data-img-src', 'data-background-image', 'data-image-url'
+]
+
+# Specific Facebook image classes/patterns
+FB_IMAGE_SELECTORS = [
+    'img[class*="scaledImageFitWidth"]',
+    'img[class*="scaledImageFitHeight"]',
+    'img[class*="_46-i"]',
+    'img[class*="fb_feed_image"]',
+    'div[style*="background-image"]',
+    'a[href*="/photo/"]',
+    '[data-testid="photo"]'
+]
+
+# Image URL patterns inside style and srcset attributes
+BACKGROUND_IMAGE_PATTERN = re.compile(r'background-image:\s*url\(["\']?(.*?)["\']?\)')
+SRCSET_URL_PATTERN = re.compile(r'(https?://[^\s,]+)')
+
+# Collects all raw post fields in a single walk over the post subtree
+POST_VISITOR = PostFieldVisitor(CONTENT_SELECTORS, AUTHOR_SELECTORS, IMAGE_DATA_ATTRS, FB_IMAGE_SELECTORS)
+
+# Collects the raw fields parse_single_post needs for every post element
+# inside the browser, so only compact JSON crosses the WebDriver wire.
+# Text is gathered the same way BeautifulSoup's get_text() does it, and the
+# Python side runs the usual cleanup and validation on the returned records.
+EXTRACT_POST_FIELDS_SCRIPT = """
+var cfg = arguments[0];
+
+// Python's str.strip() set: unlike trim() it keeps U+FEFF and strips U+001C-U+001F and U+0085
+var PY_STRIP = /^[\\t\\n\\x0b\\x0c\\r\\x1c-\\x1f \\x85\\xa0\\u1680\\u2000-\\u200a\\u2028\\u2029\\u202f\\u205f\\u3000]+|[\\t\\n\\x0b\\x0c\\r\\x1c-\\x1f \\x85\\xa0\\u1680\\u2000-\\u200a\\u2028\\u2029\\u202f\\u205f\\u3000]+$/g;
+// get_text() leaves out every string inside these elements, not only direct children
+var SKIPPED_TEXT = 'script, style, template, rt, rp';
+
+function textOf(el, strip, separator) {
+    var parts = [];
+    var walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        var node = walker.currentNode;
+        if (node.parentElement && node.parentElement.closest(SKIPPED_TEXT)) {
+            continue;
+        }
+        var value = strip ? node.data.replace(PY_STRIP, '') : node.data;
+        if (strip && !value) {
+            continue;
+        }
+        parts.push(value);
+    }
+    return parts.join(separator);
+}
+
+function attr(el, name) {
+    var value = el.getAttribute(name);
+    return value === null ? '' : value;
+}
+
+function all(root, selector) {
+    return Array.prototype.slice.call(root.querySelectorAll(selector));
+}
+
+// Mirror the incremental mode of get_new_feed_html(): only look inside feed
+// units that were added or changed since the previous call.
+var unitSelector = "[role='article'], [data-pagelet*='FeedUnit']";
+var scopes = [document];
+var freshUnits = [];
+if (cfg.incremental) {
+    var units = all(document, unitSelector).filter(function (el) {
+        return !el.parentElement || !el.parentElement.closest(unitSelector);
+    });
+    if (units.length > 0) {
+        freshUnits = units.filter(function (el) {
+            return el.getAttribute('data-scraper-seen') !== String(el.textContent.length);
+        });
+        scopes = freshUnits;
+    }
+}
+
+function selectInScopes(selector) {
+    var found = [];
+    scopes.forEach(function (scope) {
+        if (scope !== document && scope.matches(selector)) {
+            found.push(scope);
+        }
+        Array.prototype.push.apply(found, all(scope, selector));
+    });
+    return found;
+}
+
+var candidates = [];
+cfg.postSelectors.forEach(function (selector) {
+    Array.prototype.push.apply(candidates, selectInScopes(selector));
+});
+
+var seenKeys = {};
+var elements = [];
+candidates.forEach(function (el) {
+    var key = el.outerHTML.slice(0, 300);
+    if (!seenKeys[key]) {
+        seenKeys[key] = true;
+        elements.push(el);
+    }
+});
+
+// Parse each feed unit once, as select_post_elements() does: drop matches inside a
+// unit and wrappers around one, unless the page has no feed units at all
+if (selectInScopes(unitSelector).length > 0) {
+    elements = elements.filter(function (el) {
+        var isUnit = el.matches(unitSelector);
+        var insideUnit = el.parentElement && el.parentElement.closest(unitSelector);
+        return !insideUnit && (isUnit || !el.querySelector(unitSelector));
+    });
+}
+
+// Any excluded region in the parsed document rejects all content candidates
+var excluded = cfg.excludeSelectors.some(function (selector) {
+    return selectInScopes(selector).length > 0;
+});
+
+var records = elements.map(function (el) {
+    var contentCandidates = [];
+    if (!excluded) {
+        cfg.contentSelectors.forEach(function (selector) {
+            all(el, selector).forEach(function (match) {
+                contentCandidates.push(textOf(match, true, ' '));
+            });
+        });
+    }
+
+    var timeEl = el.querySelector('time');
+    var fbMatches = [];
+    cfg.fbImageSelectors.forEach(function (selector) {
+        all(el, selector).forEach(function (match) {
+            var tag = match.tagName.toLowerCase();
+            if (tag === 'img') {
+                fbMatches.push(['img', attr(match, 'src')]);
+            } else if (tag === 'div') {
+                fbMatches.push(['div', attr(match, 'style')]);
+            } else if (tag === 'a') {
+                var inner = match.querySelector('img');
+                fbMatches.push(['a', attr(match, 'href'), inner ? attr(inner, 'src') : null]);
+            }
+        });
+    });
+
+    var dataAttrs = [];
+    cfg.dataAttrs.forEach(function (name) {
+        all(el, '[' + name + ']').forEach(function (match) {
+            dataAttrs.push([name, attr(match, name)]);
+        });
+    });
+
+    return {
+        content_candidates: contentCandidates,
+        raw_text: textOf(el, true, ' '),
+        timestamp: timeEl ? (attr(timeEl, 'datetime') || textOf(timeEl, true, '')) : '',
+        author_texts: cfg.authorSelectors.map(function (selector) {
+            var match = el.querySelector(selector);
+            return match ? textOf(match, true, '') : null;
+        }),
+        all_text: textOf(el, false, ''),
+        hrefs: all(el, 'a[href]').map(function (a) { return attr(a, 'href'); }),
+        // The unit's own data-ft and its anchors'; a nested (shared) story carries its own
+        data_ft: (el.hasAttribute('data-ft') ? [attr(el, 'data-ft')] : []).concat(
+            all(el, 'a[data-ft]').filter(function (a) {
+                var article = a.parentElement.closest("[role='article']");
+                return !article || article === el || !el.contains(article);
+            }).map(function (a) { return attr(a, 'data-ft'); })),
+        media: {
+            img: all(el, 'img').map(function (img) { return [attr(img, 'src'), attr(img, 'alt')]; }),
+            data_attrs: dataAttrs,
+            styles: all(el, '[style]').map(function (match) { return attr(match, 'style'); }),
+            srcsets: all(el, '[srcset]').map(function (match) { return attr(match, 'srcset'); }),
+            fb_matches: fbMatches,
+            videos: all(el, 'video').map(function (video) { return attr(video, 'src'); }),
+            video_urls: all(el, '[data-video-url]').map(function (match) { return attr(match, 'data-video-url'); })
+        }
+    };
+});
+
+freshUnits.forEach(function (el) {
+    el.setAttribute('data-scraper-seen', String(el.textContent.length));
+});
+
+return {total: candidates.length, records: records};
+"""
 
 def get_adaptive_wait_time(current_time, last_run_time=None):
     """
@@ -53,31 +465,57 @@ def get_adaptive_wait_time(current_time, last_run_time=None):
     
     # Check recent activity to adjust timing
     try:
-        with open('data/kuensel_posts_master.json', 'r') as f:
-            data = json.load(f)
-            session_info = data.get('scraping_session', {})
-            
-            # If new posts were found in the last session, reduce wait time
-            if session_info.get('new_posts_this_session', 0) > 0:
-                base_wait = int(base_wait * 0.7)
-                print(f"Recent activity detected, reducing wait time to {base_wait} seconds")
+        session_info = load_session_info('data/kuensel_posts_master.json')
+        
+        # If new posts were found in the last session, reduce wait time
+        if session_info.get('new_posts_this_session', 0) > 0:
+            base_wait = int(base_wait * 0.7)
+            print(f"Recent activity detected, reducing wait time to {base_wait} seconds")
     except:
         pass  
     
     return base_wait
 
 class FacebookScraper:
-    def __init__(self, config_file="config/config.json"):
+    def __init__(self, config_file="config/config.json", start_driver=True):
         self.config = self.load_config(config_file)
         print("[DEBUG] Loaded config:", self.config)
         creds = self.config.get("credentials", {})
         print(f"[DEBUG] Credentials found: email='{creds.get('email', None)}', password={'***' if creds.get('password', None) else None}")
         self.driver = None
+        self.page_waiter = None  # Set by setup_driver
+        self.resource_policy = ResourcePolicy({"block": []})  # Replaced by setup_driver
         self.posts_data = []
         self.seen_post_hashes = set()
-        self.existing_post_ids = set()  # Store existing post IDs
+        self.session_post_ids = set()  # Story IDs and content-hash IDs accepted this session
+        self.exclusion_cache = (None, False)  # (document root, has excluded regions)
+        self.parse_cache = {}  # Feed-unit fingerprint -> parsed post (or None)
+        self.parse_cache_hits = 0
+        self.parse_cache_misses = 0
+        self.html_parser = resolve_parser_backend(self.config.get("scraping", {}).get("html_parser"))
+        print(f"Using HTML parser backend: {self.html_parser}")
+        self.parse_workers = max(1, int(self.config.get("scraping", {}).get("parse_workers", 1)))
+        self.parse_pool = None  # Started on first use when parse_workers > 1
+        self.master_file = self.config.get("output", {}).get("master_file", "data/kuensel_posts_master.json")
+        self.page_url = DEFAULT_PAGE_URL  # Page being scraped; story IDs are only taken from its links
+        self.author_id = "kuensel"  # Author of the page's own posts
+        self.author_name = "Kuensel"
+        self.session_recorder = None  # Set while a session is being recorded
+        self.post_index = PostIndex(post_index_path_for(self.master_file))  # Archived post IDs and fingerprints
+        self.near_duplicate_index = NearDuplicateIndex(index_path_for(self.master_file))  # Archived posts
+        self.near_duplicates_ready = False  # The archive index is read on the first near-duplicate lookup
+        self.session_index = new_session_index()  # Posts accepted this session
+        photo_cfg = self.config.get("photo_cache", {})
+        self.photo_cache = PhotoCache(photo_cfg.get("file", DEFAULT_PHOTO_CACHE_FILE),
+                                      photo_cfg.get("ttl_days", DEFAULT_TTL_DAYS))  # fbid -> image URLs
+        self.photo_tabs = photo_cfg.get("max_tabs", DEFAULT_MAX_TABS)
+        self.max_photo_links = photo_cfg.get("max_links_per_post", 4)
+        self.pending_photos = []  # (post, fbid, link) waiting for resolve_pending_photos
+        self.photo_fetches = []   # (future, {fbid: link}, start time) of photo pages still loading
+        self.photo_posts = []     # (post, fbid, link) waiting for their photo page to load
         self.load_existing_posts()  # Load existing posts at initialization
-        self.setup_driver()
+        if start_driver:
+            self.setup_driver()
 
     def load_config(self, config_file):
         """Load configuration from Json file, fallback to environment variables if missing."""
@@ -110,20 +548,48 @@ class FacebookScraper:
             }
 
     def setup_driver(self):
-        """Setup Chrome driver with appropriate options"""
-        chrome_options = Options()
+        """Start the configured browser backend with appropriate options"""
         scraping_cfg = self.config.get("scraping")
         if not scraping_cfg:
             print("⚠️  'scraping' section missing in config. Using default scraping config.")
             scraping_cfg = {"headless": True, "max_scrolls": 15, "scroll_pause": 3, "target_count": 25}
             self.config["scraping"] = scraping_cfg
+
+        # Don't download images, video, fonts or trackers; their URLs stay in the DOM
+        self.resource_policy = ResourcePolicy(scraping_cfg.get("resource_policy"))
+
+        backend = scraping_cfg.get("browser_backend", "selenium")
+        if backend == "playwright":
+            user_data_dir = scraping_cfg.get("user_data_dir")
+            self.driver = PlaywrightBackend(headless=scraping_cfg.get("headless", False), user_agent=USER_AGENT,
+                                            user_data_dir=os.path.abspath(user_data_dir) if user_data_dir else None)
+            print("Browser started with Playwright")
+        else:
+            if backend != "selenium":
+                print(f"⚠️  Unknown browser_backend '{backend}', using selenium")
+            self.driver = SeleniumBackend(self.start_chrome(scraping_cfg))
+
+        # Set page load and script timeouts
+        self.driver.set_page_load_timeout(45)  # 45 seconds max for page load
+        self.driver.implicitly_wait(15)  # 15 seconds for element finding
+
+        self.resource_policy.apply(self.driver)
+
+        # Wait for feed mutations / network idle instead of fixed sleeps
+        self.page_waiter = PageWaiter(self.driver) if scraping_cfg.get("event_waits", True) else None
+        
+        print("WebDriver initialized successfully with timeouts")
+
+    def start_chrome(self, scraping_cfg):
+        """Start Chrome under Selenium, trying the cached, managed and system ChromeDriver in turn"""
+        chrome_options = Options()
         if scraping_cfg.get("headless", False):
             chrome_options.add_argument("--headless")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
         
         # Add timeout and stability options
         chrome_options.add_argument("--page-load-strategy=eager")  # Don't wait for all resources
@@ -133,59 +599,64 @@ class FacebookScraper:
         chrome_options.add_argument("--disable-renderer-backgrounding")
         chrome_options.add_argument("--disable-backgrounding-occluded-windows")
 
-        # Set timeouts
-        self.driver = None
-        driver_initialized = False
+        # Dedicated Chrome profile keeps the Facebook login between runs
+        user_data_dir = scraping_cfg.get("user_data_dir")
+        if user_data_dir:
+            chrome_options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+            print(f"Using Chrome profile: {user_data_dir}")
+
+        # Performance log for the resource policy report
+        self.resource_policy.configure_options(chrome_options)
+
+        def launch(chrome_binary, driver_path):
+            chrome_options.binary_location = chrome_binary or ""
+            if driver_path:
+                return webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            return webdriver.Chrome(options=chrome_options)
+
+        # Reuse the driver resolved on an earlier run while Chrome's version is unchanged;
+        # otherwise try a matching local driver, webdriver-manager, system paths, then Selenium
+        driver_cache = DriverCache(scraping_cfg.get("driver_cache", DEFAULT_DRIVER_CACHE_FILE))
+        driver = driver_cache.start(launch, lambda: ChromeDriverManager().install())
+        if driver is None:
+            raise Exception("❌ All ChromeDriver initialization methods failed. Please install Chrome and ChromeDriver.")
         
-        # Try using webdriver-manager for automatic ChromeDriver management
+        return driver
+
+    def restore_login_session(self):
+        """Reuse the saved session or browser profile if Facebook still accepts it"""
+        scraping_cfg = self.config.get("scraping", {})
+        session_file = scraping_cfg.get("session_file", "data/session/facebook_session.json")
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            print("WebDriver initialized with webdriver-manager")
-            driver_initialized = True
+            restored = restore_session(self.driver, session_file, scraping_cfg.get("session_max_age_days", 30))
+            if not restored and not scraping_cfg.get("user_data_dir"):
+                return False
+            if not session_is_valid(self.driver):
+                print("Saved session has expired, logging in with credentials")
+                return False
+            if session_file:
+                save_session(self.driver, session_file)  # Keep rotated cookies
+            return True
         except Exception as e:
-            print(f"⚠️  webdriver-manager failed: {e}")
-        
-        # Fallback to system ChromeDriver if webdriver-manager failed
-        if not driver_initialized:
-            chromedriver_paths = [
-                "/usr/local/bin/chromedriver",
-                "/usr/bin/chromedriver",
-                "chromedriver"
-            ]
-            
-            for path in chromedriver_paths:
-                try:
-                    service = Service(path)
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    print(f"WebDriver initialized with ChromeDriver at: {path}")
-                    driver_initialized = True
-                    break
-                except Exception as path_error:
-                    print(f"⚠️  Failed to use ChromeDriver at {path}: {path_error}")
-                    continue
-        
-        # Final fallback - try without specifying service
-        if not driver_initialized:
-            try:
-                self.driver = webdriver.Chrome(options=chrome_options)
-                print("WebDriver initialized with system default ChromeDriver")
-                driver_initialized = True
-            except Exception as fallback_error:
-                print(f"❌ Final fallback failed: {fallback_error}")
-        
-        # Check if any method succeeded
-        if not driver_initialized or self.driver is None:
-            raise Exception("❌ All ChromeDriver initialization methods failed. Please install Chrome and ChromeDriver.")
-        
-        # Set page load and script timeouts
-        self.driver.set_page_load_timeout(45)  # 45 seconds max for page load
-        self.driver.implicitly_wait(15)  # 15 seconds for element finding
-        
-        print("WebDriver initialized successfully with timeouts")
+            print(f"⚠️  Could not restore saved session: {e}")
+            return False
+
+    def save_login_session(self):
+        """Save cookies and local storage after a credential login"""
+        session_file = self.config.get("scraping", {}).get("session_file", "data/session/facebook_session.json")
+        if not session_file:
+            return
+        try:
+            save_session(self.driver, session_file)
+        except Exception as e:
+            print(f"⚠️  Could not save browser session: {e}")
 
     def login(self):
-        """Login to Facebook"""
+        """Login to Facebook, reusing a saved session when it is still valid"""
+        if self.restore_login_session():
+            print("Login successful (restored saved session)")
+            return True
+
         try:
             # Read credentials from config file 
             email = self.config["credentials"]["email"]
@@ -212,6 +683,7 @@ class FacebookScraper:
             time.sleep(5)
 
             print("Login successful")
+            self.save_login_session()
             return True
 
         except Exception as e:
@@ -222,7 +694,11 @@ class FacebookScraper:
         """Navigate to the target Facebook page"""
         try:
             self.driver.get(page_url)
-            time.sleep(3)
+            if self.page_waiter:
+                result = self.page_waiter.wait_for_feed(timeout=3)
+                print(f"[DEBUG] Feed ready after {result['waited']:.2f}s ({result['reason']})")
+            else:
+                time.sleep(3)
             print(f"Navigated to: {page_url}")
             
             # Try to access different feed views to catch more posts
@@ -231,7 +707,10 @@ class FacebookScraper:
                 posts_tab = self.driver.find_elements(By.XPATH, "//a[@role='tab' and contains(text(), 'Posts')]")
                 if posts_tab:
                     self.driver.execute_script("arguments[0].click();", posts_tab[0])
-                    time.sleep(2)
+                    if self.page_waiter:
+                        self.page_waiter.wait_for_feed(timeout=2)
+                    else:
+                        time.sleep(2)
                     print("Clicked Posts tab for better coverage")
             except Exception as e:
                 pass  # Continue if not found
@@ -246,104 +725,106 @@ class FacebookScraper:
         if scroll_pause_time is None:
             scroll_pause_time = self.config["scraping"]["scroll_pause"]
 
+        baseline = self.page_waiter.install() if self.page_waiter else None
+
         # Scrolling down
-        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        self.driver.scroll_to_bottom()
 
-        # Wait for new content to load
-        time.sleep(scroll_pause_time)
+        # Wait for new content to load, at most scroll_pause_time
+        if baseline is None:
+            time.sleep(scroll_pause_time)
+        else:
+            result = self.page_waiter.wait_for_new_units(baseline, scroll_pause_time)
+            print(f"[DEBUG] Scroll wait {result['waited']:.2f}s ({result['reason']}, {result['units']} feed units)")
 
         return True
 
-    def expand_see_more_links(self):
-        """Expand all 'See more' links to get full content"""
+    def expand_see_more_links(self, timeout=5):
+        """Expand all 'See more' links in new feed units with one in-page script call"""
+        started = time.time()
         try:
-            # Add timeout to prevent infinite expansion loops
-            EXPANSION_TIMEOUT = 30  # Max 30 seconds for expanding all links
-            MAX_EXPANSIONS = 10     # Max 10 expansions per call
-            
-            start_time = time.time()
-            expanded_count = 0
-            
-            # Find and click all "See more" elements using Selenium
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-            
-            # Look for elements containing "See more" text
-            try:
-                see_more_elements = self.driver.find_elements(By.XPATH, 
-                    "//div[contains(text(), 'See more')] | //span[contains(text(), 'See more')] | //*[@aria-label[contains(., 'See more')]]")
-                
-                print(f"Found {len(see_more_elements)} 'See more' elements")
-                
-                for element in see_more_elements:
-                    # Check timeout
-                    if time.time() - start_time > EXPANSION_TIMEOUT:
-                        print(f"⏰ Expansion timeout ({EXPANSION_TIMEOUT}s) reached, stopping...")
-                        break
-                        
-                    # Check max expansions
-                    if expanded_count >= MAX_EXPANSIONS:
-                        print(f"Max expansions ({MAX_EXPANSIONS}) reached, stopping...")
-                        break
-                        
-                    try:
-                        # Scroll element into view
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                        time.sleep(0.3)  # Reduced from 0.5 to 0.3
-                        
-                        # Try to click the element
-                        if element.is_displayed() and element.is_enabled():
-                            element.click()
-                            expanded_count += 1
-                            time.sleep(0.8)  # Reduced from 1 to 0.8 seconds
-                            print(f"Expanded content #{expanded_count}")
-                    except (ElementClickInterceptedException, Exception) as e:
-                        # Try JavaScript click as fallback
-                        try:
-                            self.driver.execute_script("arguments[0].click();", element)
-                            expanded_count += 1
-                            time.sleep(0.8)
-                            print(f"Expanded content #{expanded_count} (JS click)")
-                        except Exception as js_e:
-                            print(f"Could not click 'See more' element: {js_e}")
-                            continue
-                            
-            except Exception as e:
-                print(f"Error finding 'See more' elements: {e}")
-            
-            total_time = time.time() - start_time
-            print(f"Successfully expanded {expanded_count} 'See more' links in {total_time:.2f}s")
-            return expanded_count
-            
+            result = self.driver.execute_async_script(EXPAND_SEE_MORE_SCRIPT, int(timeout * 1000), 300)
         except Exception as e:
             print(f"Error in expand_see_more_links: {e}")
             return 0
 
+        if result.get("clicked"):
+            print(f"Expanded {result['expanded']} of {result['clicked']} 'See more' links "
+                  f"in {time.time() - started:.2f}s (rendered after {result['waited'] / 1000:.2f}s)")
+        if result.get("failed"):
+            print(f"Could not click {result['failed']} 'See more' elements")
+        return result.get("expanded", 0)
+
     def get_page_html(self):
         """Get current page HTML"""
         return self.driver.page_source
 
+    def get_new_feed_html(self):
+        """Get HTML of feed units added or changed since the previous call.
+
+        Returns None when no feed units can be located, so the caller can fall
+        back to the full page source.
+        """
+        try:
+            result = self.driver.execute_script(NEW_FEED_UNITS_SCRIPT)
+        except Exception as e:
+            print(f"⚠️  Incremental extraction failed, using full page source: {e}")
+            return None
+
+        if not result:
+            print("No feed units found for incremental extraction, using full page source")
+            return None
+
+        fragments = result.get("html", [])
+        print(f"Incremental extraction: {len(fragments)} new/changed of {result.get('total', 0)} feed units")
+
+        # Keep the feed container so feed-scoped selectors still apply
+        return "<div data-pagelet=\"Feed\">" + "".join(fragments) + "</div>"
+
     def extract_posts_with_beautifulsoup(self, html_content):
         """Extract posts using BeautifulSoup"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = make_soup(html_content, self.html_parser)
         posts = []
-
-        # More comprehensive selectors for Facebook posts
-        selectors = [
-            "[role='article']",
-            "[data-pagelet*='FeedUnit']",
-            ".userContentWrapper",
-            "[data-testid='fb-ufi-mention-bling-bar']",
-            "div[data-ft*='top_level_post_id']",
-            "div[data-ad-preview='message']",
-            ".x1yztbdb",
-            "[data-pagelet='Feed'] div:not([class]) > div"
+        unique_elements = self.select_post_elements(soup)
+
+        # The exclusion check is document-wide, so it is part of the cache key
+        has_excluded = bool(unique_elements) and self.document_has_excluded_regions(unique_elements[0])
+        markups = [str(element) for element in unique_elements]
+        fingerprints = [
+            self.feed_unit_fingerprint(markup + ("|excluded" if has_excluded else ""))
+            for markup in markups
         ]
 
+        # Collect fields of uncached elements in the worker pool; enrichment stays here
+        collected_fields = {}
+        if self.parse_workers > 1:
+            pending = [i for i, fingerprint in enumerate(fingerprints) if fingerprint not in self.parse_cache]
+            if len(pending) > 1:
+                records = self.collect_post_fields_parallel(
+                    [(unique_elements[i], markups[i]) for i in pending], not has_excluded)
+                collected_fields = dict(zip(pending, records))
+
+        for i, post_element in enumerate(unique_elements):
+            try:
+                if i in collected_fields:
+                    post_data = self.cached_parse(fingerprints[i], self.parse_post_record, collected_fields[i], i)
+                else:
+                    post_data = self.cached_parse(fingerprints[i], self.parse_single_post, post_element, i)
+                if post_data:
+                    posts.append(post_data)
+                else:
+                    print(f"Failed to parse post element {i}")
+            except Exception as e:
+                print(f"Error parsing post element {i}: {e}")
+                continue
+
+        print(f"Successfully parsed {len(posts)} posts")
+        return posts
+
+    def select_post_elements(self, soup):
+        """Post elements matched by POST_SELECTORS, without repeats, in selector order"""
         post_elements = []
-        for selector in selectors:
+        for selector in POST_SELECTORS:
             elements = soup.select(selector)
             post_elements.extend(elements)
 
@@ -360,9 +841,94 @@ class FacebookScraper:
 
         print(f"Found {len(unique_elements)} unique elements after deduplication")
 
-        for i, post_element in enumerate(unique_elements):
+        # Parse each feed unit once: matches inside a unit (its message, media or
+        # comments) and wrappers around one would become fragment posts of it.
+        # Layouts without feed units keep every match.
+        units = soup.select(FEED_UNIT_SELECTOR)
+        if units:
+            unit_ids = {id(unit) for unit in units}
+            wrapper_ids = {id(parent) for unit in units for parent in unit.parents}
+            unique_elements = [
+                element for element in unique_elements
+                if not (id(element) in wrapper_ids and id(element) not in unit_ids)
+                and not any(id(parent) in unit_ids for parent in element.parents)
+            ]
+            print(f"Kept {len(unique_elements)} feed units and elements outside them")
+        return unique_elements
+
+    def collect_post_fields_parallel(self, elements, collect_content):
+        """Collect raw fields for (element, markup) pairs in the parse worker pool.
+
+        Results keep the input order. Returns an empty list if the pool fails,
+        so those elements are parsed serially instead.
+        """
+        try:
+            if self.parse_pool is None:
+                self.parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers,
+                    initializer=init_parse_worker,
+                    initargs=(CONTENT_SELECTORS, AUTHOR_SELECTORS, IMAGE_DATA_ATTRS, FB_IMAGE_SELECTORS)
+                )
+                print(f"Started parse worker pool with {self.parse_workers} workers")
+
+            jobs = [serialize_with_ancestors(element, markup) for element, markup in elements]
+            chunksize = max(1, len(jobs) // (self.parse_workers * 4))
+            return list(self.parse_pool.map(
+                visit_fragment,
+                [markup for markup, _ in jobs],
+                [path for _, path in jobs],
+                [collect_content] * len(jobs),
+                [self.html_parser] * len(jobs),
+                chunksize=chunksize
+            ))
+        except Exception as e:
+            print(f"⚠️  Parallel parsing failed, parsing serially: {e}")
+            if self.parse_pool is not None:
+                self.parse_pool.shutdown(cancel_futures=True)
+                self.parse_pool = None
+            return []
+
+    def extract_posts_with_javascript(self, incremental=False):
+        """Extract posts by collecting raw post fields inside the browser.
+
+        Returns None if the script fails, so the caller can fall back to the
+        BeautifulSoup path.
+        """
+        try:
+            records = self.collect_post_records_with_javascript(incremental)
+        except Exception as e:
+            print(f"⚠️  JavaScript extraction failed, falling back to BeautifulSoup: {e}")
+            return None
+
+        if self.session_recorder:
+            self.session_recorder.add_snapshot(json.dumps(records), kind="records")
+
+        return self.extract_posts_from_records(records)
+
+    def collect_post_records_with_javascript(self, incremental=False):
+        """Raw field records of the current page, collected by EXTRACT_POST_FIELDS_SCRIPT"""
+        result = self.driver.execute_script(EXTRACT_POST_FIELDS_SCRIPT, {
+            "postSelectors": POST_SELECTORS,
+            "contentSelectors": CONTENT_SELECTORS,
+            "excludeSelectors": EXCLUDE_SELECTORS,
+            "authorSelectors": AUTHOR_SELECTORS,
+            "dataAttrs": IMAGE_DATA_ATTRS,
+            "fbImageSelectors": FB_IMAGE_SELECTORS,
+            "incremental": incremental
+        })
+        records = result.get("records", [])
+        print(f"Found {result.get('total', 0)} potential post elements")
+        print(f"Found {len(records)} unique elements after deduplication")
+        return records
+
+    def extract_posts_from_records(self, records):
+        """Build posts from raw field records collected by the JavaScript engine"""
+        posts = []
+
+        for i, record in enumerate(records):
             try:
-                post_data = self.parse_single_post(post_element, i)
+                fingerprint = self.feed_unit_fingerprint(json.dumps(record, sort_keys=True))
+                post_data = self.cached_parse(fingerprint, self.parse_post_record, record, i)
                 if post_data:
                     posts.append(post_data)
                 else:
@@ -374,235 +940,224 @@ class FacebookScraper:
         print(f"Successfully parsed {len(posts)} posts")
         return posts
 
+    def feed_unit_fingerprint(self, markup):
+        """Cheap fingerprint of raw feed-unit markup, used as the parse cache key"""
+        return hashlib.md5(markup.encode()).hexdigest()
+
+    def cached_parse(self, fingerprint, parse, item, index):
+        """Parse a feed unit once per session and reuse the result (or rejection) afterwards"""
+        if fingerprint in self.parse_cache:
+            self.parse_cache_hits += 1
+            print(f"[DEBUG] Reusing cached parse for post element {index}")
+            return self.parse_cache[fingerprint]
+
+        self.parse_cache_misses += 1
+        post_data = parse(item, index)
+        self.parse_cache[fingerprint] = post_data
+        return post_data
+
     def parse_single_post(self, post_element, index=0):
         """Parse individual post data with proper field extraction"""
         try:
-            # Extract content 
-            content = ""
-            
+            fields = self.collect_post_fields(post_element, index)
+            return self.build_post_from_fields(fields, index)
+        except Exception as e:
+            print(f"Error in parse_single_post for index {index}: {e}")
+            return None
+
+    def parse_post_record(self, record, index=0):
+        """Parse a raw field record from the JavaScript engine or a parse worker"""
+        try:
             print(f"[DEBUG] Processing post element {index}")
+            return self.build_post_from_fields(record, index)
+        except Exception as e:
+            print(f"Error in parse_post_record for index {index}: {e}")
+            return None
 
-            # Improved content selectors (Facebook 2024/2025 structure)
-            content_selectors = [
-                # Main post content
-                "[data-ad-preview='message']",
-                ".userContent", 
-                "[data-testid='post_message']",
-                
-                # Facebook's new structure selectors
-                "div[data-ad-comet-preview='message']",
-                "div[data-testid='story-subtitle'] + div",
-                "div[data-testid='story-subtitle'] ~ div",
-                "[data-testid='story-subtitle'] ~ [dir='auto']",
-                
-                # Generic text content selectors
-                "div[dir='auto']",
-                "span[dir='auto']",
-                "div[direction='auto']",
-                "div > span:not([class])",
-                "div > div > span",
-                
-                # Fallback - any div with substantial text
-                "div:not([class*='comment']):not([class*='reaction'])",
-                "p",
-                
-                # Even broader fallback
-                "[role='article'] div",
-                "[role='article'] span",
-                "[role='article'] p"
-            ]
+    def collect_post_fields(self, post_element, index=0):
+        """Collect the raw fields of a post element without any cleanup.
+
+        The returned record has the same shape as the ones produced by
+        EXTRACT_POST_FIELDS_SCRIPT, so both engines share build_post_from_fields.
+        """
+        print(f"[DEBUG] Processing post element {index}")
+
+        # Excluded regions anywhere in the parsed document reject every candidate
+        collect_content = not self.document_has_excluded_regions(post_element)
+        if not collect_content:
+            print(f"[DEBUG] Document contains comment/reaction regions, skipping content selectors")
+
+        fields = POST_VISITOR.visit(post_element, collect_content=collect_content)
+        print(f"[DEBUG] Collected {len(fields['content_candidates'])} content candidates")
+        return fields
+
+    def document_has_excluded_regions(self, element):
+        """Check whether the document of an element has comment, reaction or header regions.
+
+        A content candidate used to be excluded when any of its parents, up to
+        and including the document root, contained a match for one of the
+        exclude selectors. The root contains every other match, so that is the
+        same as asking whether the parsed document has any match at all. The
+        answer is computed once per document and cached.
+        """
+        root = element
+        while root.parent is not None:
+            root = root.parent
+
+        cached_root, has_excluded = self.exclusion_cache
+        if cached_root is not root:
+            has_excluded = any(root.select_one(selector) is not None for selector in EXCLUDE_SELECTORS)
+            self.exclusion_cache = (root, has_excluded)
+
+        return has_excluded
+
+    def build_post_from_fields(self, fields, index=0):
+        """Clean, enrich and validate raw post fields into a post record"""
+        # Extract content 
+        content = ""
+
+        potential_contents = []
+        for temp_content in fields["content_candidates"]:
+            if temp_content and len(temp_content) > 10:
+                # Additional filtering for comment-like patterns
+                temp_content = self.filter_comments_from_content(temp_content)
+                if temp_content and len(temp_content) > 10:
+                    potential_contents.append(temp_content)
+                    print(f"[DEBUG] Found potential content: '{temp_content[:100]}...'")
+
+        # Choose the best content (longest meaningful text)
+        if potential_contents:
+            # Remove duplicates (keeping first-seen order for equal lengths) and sort by length
+            unique_contents = list(dict.fromkeys(potential_contents))
+            unique_contents.sort(key=len, reverse=True)
+            content = unique_contents[0]
+            print(f"[DEBUG] Selected content ({len(content)} chars): '{content[:100]}...'")
+        else:
+            print(f"[DEBUG] No content found for post {index}")
+            # Fallback: get all text from the post element
+            raw_text = fields["raw_text"]
+            if raw_text and len(raw_text) > 20:
+                content = self.filter_comments_from_content(raw_text)
+                print(f"[DEBUG] Using fallback content: '{content[:100]}...'")
+            else:
+                print(f"[DEBUG] Even fallback content is too short: '{raw_text[:50]}...'")
+                content = ""
 
-            # Selectors to exclude (comments and reactions)
-            exclude_selectors = [
-                "[data-testid='comment']",
-                "[role='article'] [role='article']",  # Nested articles (comments)
-                ".comment",
-                "[data-testid='UFI2Comment/root']",
-                "[aria-label*='comment']",
-                "[aria-label*='Comment']",
-                "div[aria-label*='reaction']",
-                "div[aria-label*='like']",
-                "[data-testid='reactions-section']",
-                "[data-testid='social-context']",
-                "[data-testid='story-header']",
-                "[data-testid='story-subtitle']"
-            ]
+        timestamp = fields["timestamp"]
 
-            # Try each selector and collect all potential content
-            potential_contents = []
-            
-            for selector in content_selectors:
-                elements = post_element.select(selector)
-                print(f"[DEBUG] Selector '{selector}' found {len(elements)} elements")
-                
-                for elem in elements:
-                    # Check if this element should be excluded
-                    is_excluded = False
-                    
-                    # Skip if element is inside excluded areas
-                    for exclude_selector in exclude_selectors:
-                        # Check if any parent matches the exclude selector
-                        for parent in elem.find_parents():
-                            if parent.name and parent.select(exclude_selector):
-                                is_excluded = True
-                                break
-                        if is_excluded:
-                            break
-                        # Check if element itself contains excluded elements
-                        if elem.select(exclude_selector):
-                            is_excluded = True
-                            break
-                    
-                    if not is_excluded:
-                        temp_content = elem.get_text(strip=True, separator=' ')
-                        if temp_content and len(temp_content) > 10:
-                            # Additional filtering for comment-like patterns
-                            temp_content = self.filter_comments_from_content(temp_content)
-                            if temp_content and len(temp_content) > 10:
-                                potential_contents.append(temp_content)
-                                print(f"[DEBUG] Found potential content: '{temp_content[:100]}...'")
-            
-            # Choose the best content (longest meaningful text)
-            if potential_contents:
-                # Remove duplicates and sort by length
-                unique_contents = list(set(potential_contents))
-                unique_contents.sort(key=len, reverse=True)
-                content = unique_contents[0]
-                print(f"[DEBUG] Selected content ({len(content)} chars): '{content[:100]}...'")
-            else:
-                print(f"[DEBUG] No content found for post {index}")
-                # Fallback: get all text from the post element
-                raw_text = post_element.get_text(strip=True, separator=' ')
-                if raw_text and len(raw_text) > 20:
-                    content = self.filter_comments_from_content(raw_text)
-                    print(f"[DEBUG] Using fallback content: '{content[:100]}...'")
-                else:
-                    print(f"[DEBUG] Even fallback content is too short: '{raw_text[:50]}...'")
-                    content = ""
-
-            # Extract timestamp
-            timestamp = ""
-            time_elem = post_element.find('time')
-            if time_elem:
-                timestamp = time_elem.get('datetime', '') or time_elem.get_text(strip=True)
-
-            # Author information
-            author = "Kuensel"  # Default for page posts
-            author_id = "kuensel"  # Default page ID
-
-            # Extract actual author if it's not a page post
-            author_selectors = [
-                "[data-testid='story-subtitle']",
-                "[data-testid='story-footer']",
-                "h3 a",
-                ".fcg a"
-            ]
+        # Author information
+        author = self.author_name  # Default for page posts
+        author_id = self.author_id  # Default page ID
 
-            for selector in author_selectors:
-                author_elem = post_element.select_one(selector)
-                if author_elem:
-                    author_text = author_elem.get_text(strip=True)
-                    if author_text and author_text not in ["Kuensel", ""]:
-                        author = author_text
-                        break
-
-            # Extract engagement
-            reactions = 0
-            comments = 0
-            shares = 0
-
-            # Look for engagement numbers in text
-            all_text = post_element.get_text()
-            reaction_match = re.search(r'(\d+(?:\.\d+)?[KM]?)\s*(?:like|react)', all_text, re.IGNORECASE)
-            if reaction_match:
-                reactions = self.parse_count(reaction_match.group(1))
-
-            comment_match = re.search(r'(\d+(?:\.\d+)?[KM]?)\s*comment', all_text, re.IGNORECASE)
-            if comment_match:
-                comments = self.parse_count(comment_match.group(1))
-
-            share_match = re.search(r'(\d+(?:\.\d+)?[KM]?)\s*share', all_text, re.IGNORECASE)
-            if share_match:
-                shares = self.parse_count(share_match.group(1))
-
-            # Extract links from the post
-            links = self.extract_links_from_post(post_element)
-
-            # Extract media
-            media = self.extract_media_from_post(post_element)
-
-            # Extract additional images from Facebook photo links
-            photo_images = []
-            
-            # Check if photo processing is enabled (can be disabled for faster testing)
-            process_photos = self.config.get("process_facebook_photos", True)
-            
-            # Skip photo processing in GitHub Actions for better performance and reliability
-            if os.getenv('GITHUB_ACTIONS') == 'true':
-                print("🚀 GitHub Actions detected - skipping photo processing for better performance")
-                process_photos = False
-            
-            if process_photos and links:
-                photo_images = self.extract_images_from_facebook_photo_links(links)
-                if photo_images:
-                    print(f"Found {len(photo_images)} additional images from photo links")
-                    # Add to existing media images, avoiding duplicates
-                    for img_url in photo_images:
-                        if img_url not in media["images"]:
-                            media["images"].append(img_url)
-            elif not process_photos:
-                print("📷 Photo processing disabled, skipping Facebook photo links")
-
-            # Fetch full article content if Kuensel links are found
-            article_content, article_title = self.fetch_full_article_content(links)
-
-            # Create proper title, description, and content
-            clean_content = self.clean_text(content)
-
-            # Use article content if available, otherwise use Facebook post content
-            if article_content and len(article_content) > len(clean_content):
-                final_content = article_content
-                print(f"Using full article content ({len(article_content)} chars)")
-            else:
-                final_content = clean_content
-                print(f"Using Facebook post content ({len(clean_content)} chars)")
+        for author_text in fields["author_texts"]:
+            if author_text and author_text not in [self.author_name, ""]:
+                author = author_text
+                break
 
-            # For title, use article title if available, otherwise extract from content
-            if article_title and len(article_title) > 10:
-                title = article_title
-                print(f"Using article title: {title[:50]}...")
-            else:
-                title = self.extract_title_from_content(final_content)
-
-            # For description, use first paragraph or next 9000 characters
-            description = self.extract_description_from_content(final_content, title)
-
-            # Category based on content analysis
-            category_id = self.determine_category(final_content)
-
-            post_data = {
-                "id": hashlib.md5((final_content + str(timestamp)).encode()).hexdigest()[:16] if final_content else f"post_{index}",
-                "title": title,
-                "description": description,
-                "content": final_content,
-                "categoryID": category_id,
-                "authorId": author_id,
-                "authorName": author,
-                "attachment": {
-                    "images": media["images"],
-                    "videos": media["videos"],
-                    "links": links
-                },
-                "createdAt": datetime.now().isoformat(),
-                "publishAt": timestamp if timestamp else datetime.now().isoformat(),
-                "raw_content_length": len(final_content),
-                "article_source": "full_article" if article_content else "facebook_post"
-            }
+        # Extract engagement
+        reactions = 0
+        comments = 0
+        shares = 0
+
+        # Look for engagement numbers in text
+        all_text = fields["all_text"]
+        reaction_match = re.search(r'(\d+(?:\.\d+)?[KM]?)\s*(?:like|react)', all_text, re.IGNORECASE)
+        if reaction_match:
+            reactions = self.parse_count(reaction_match.group(1))
+
+        comment_match = re.search(r'(\d+(?:\.\d+)?[KM]?)\s*comment', all_text, re.IGNORECASE)
+        if comment_match:
+            comments = self.parse_count(comment_match.group(1))
+
+        share_match = re.search(r'(\d+(?:\.\d+)?[KM]?)\s*share', all_text, re.IGNORECASE)
+        if share_match:
+            shares = self.parse_count(share_match.group(1))
+
+        # Extract links from the post
+        links = self.links_from_hrefs(fields["hrefs"])
+
+        # Extract media
+        media = self.media_from_raw(fields["media"])
+
+        # Extract additional images from Facebook photo links
+        photo_images = []
+        pending_photos = []
+        
+        # Check if photo processing is enabled (can be disabled for faster testing)
+        process_photos = self.config.get("process_facebook_photos", True)
+        
+        if process_photos and links:
+            photo_images, pending_photos = self.images_from_photo_links(links)
+            if photo_images:
+                print(f"Found {len(photo_images)} additional images from photo links")
+                # Add to existing media images, avoiding duplicates
+                for img_url in photo_images:
+                    if img_url not in media["images"]:
+                        media["images"].append(img_url)
+        elif not process_photos:
+            print("📷 Photo processing disabled, skipping Facebook photo links")
 
-            return post_data
-        except Exception as e:
-            print(f"Error in parse_single_post for index {index}: {e}")
-            return None
+        # Fetch full article content if Kuensel links are found
+        article_content, article_title = self.fetch_full_article_content(links)
+
+        # Create proper title, description, and content
+        clean_content = self.clean_text(content)
+
+        # Use article content if available, otherwise use Facebook post content
+        if article_content and len(article_content) > len(clean_content):
+            final_content = article_content
+            print(f"Using full article content ({len(article_content)} chars)")
+        else:
+            final_content = clean_content
+            print(f"Using Facebook post content ({len(clean_content)} chars)")
+
+        # For title, use article title if available, otherwise extract from content
+        if article_title and len(article_title) > 10:
+            title = article_title
+            print(f"Using article title: {title[:50]}...")
+        else:
+            title = self.extract_title_from_content(final_content)
+
+        # For description, use first paragraph or next 9000 characters
+        description = self.extract_description_from_content(final_content, title)
+
+        # Category based on content analysis
+        category_id = self.determine_category(final_content)
+
+        # Facebook's story ID is the stable key; the content hash is only a fallback
+        story_id = extract_story_id(fields["hrefs"], fields.get("data_ft", []), self.page_url)
+        if story_id:
+            post_id = f"fb_{story_id}"
+        elif final_content:
+            post_id = hashlib.md5((final_content + str(timestamp)).encode()).hexdigest()[:16]
+        else:
+            post_id = f"post_{index}"
+
+        post_data = {
+            "id": post_id,
+            "title": title,
+            "description": description,
+            "content": final_content,
+            "categoryID": category_id,
+            "authorId": author_id,
+            "authorName": author,
+            "attachment": {
+                "images": media["images"],
+                "videos": media["videos"],
+                "links": links
+            },
+            "createdAt": datetime.now().isoformat(),
+            "publishAt": timestamp if timestamp else datetime.now().isoformat(),
+            "raw_content_length": len(final_content),
+            "article_source": "full_article" if article_content else "facebook_post",
+            "fingerprint": content_fingerprint(final_content)
+        }
+
+        # Photo pages not in the cache are opened in background tabs once the post is accepted
+        for fbid, link in pending_photos:
+            self.pending_photos.append((post_data, fbid, link))
+
+        return post_data
 
     def extract_title_from_content(self, content):
         """Extract title from content"""
@@ -668,45 +1223,22 @@ class FacebookScraper:
 
     def determine_category(self, content):
         """Determine category based on content"""
-        if not content:
-            return "general"
-
-        content_lower = content.lower()
-
-        categories = {
-            "news": ["breaking", "news", "update", "latest", "report", "tourism", "hotel", "green hotel", "industry", "policy", "standard"],
-            "event": ["event", "festival", "celebration", "observe", "foundation day", "ceremony", "state visit", "majesty", "king", "president"],
-            "culture": ["tradition", "culture", "heritage", "festival", "dzong", "sacred", "temple", "pagoda"],
-            "politics": ["minister", "government", "policy", "election", "parliament", "supreme court", "conviction", "sentence"],
-            "sports": ["match", "game", "tournament", "score", "team", "player", "championship", "football", "cricket", "archery"],
-            "advertisement": ["available", "shop", "buy", "offer", "discount", "for sale","vacancy", "job", "recruitment"],
-        }
-
-        # Prioritize specific matches first
-        if any(phrase in content_lower for phrase in ["green hotel", "tourism industry", "hospitality sector"]):
-            return "news"
-        if any(phrase in content_lower for phrase in ["state visit", "his majesty", "her majesty"]):
-            return "event"
-        if any(phrase in content_lower for phrase in ["supreme court", "conviction", "sentence"]):
-            return "politics"
-
-        for category, keywords in categories.items():
-            if any(keyword in content_lower for keyword in keywords):
-                return category
-
-        return "general"
+        return CLASSIFIER.classify(content)
 
     def extract_links_from_post(self, post_element):
         """Extract all links from a post"""
-        links = []
-        photo_links = []
+        return self.links_from_hrefs(POST_VISITOR.visit(post_element, collect_content=False)["hrefs"])
+
+    def links_from_hrefs(self, hrefs):
+        """Turn raw href values into external links followed by photo links"""
+        # Dicts keep insertion order, so they double as ordered sets here
+        links = {}
+        photo_links = {}
         
         try:
-            link_elements = post_element.find_all('a', href=True)
             base_url = "https://www.facebook.com"
 
-            for link in link_elements:
-                href = link.get('href', '')
+            for href in hrefs:
                 if href:
                     if href.startswith('/'):
                         href = urljoin(base_url, href)
@@ -714,19 +1246,18 @@ class FacebookScraper:
                     # Collect Facebook photo links separately 
                     if '/photo?' in href or '/photos/' in href or 'fbid=' in href:
                         if href not in photo_links:
-                            photo_links.append(href)
+                            photo_links[href] = None
                             print(f"Found Facebook photo link: {href}")
                     
                     # Filter out Facebook internal links for regular links
                     elif self.is_external_link(href) or '/permalink.php' in href:
-                        if href not in links:
-                            links.append(href)
+                        links[href] = None
                             
         except Exception as e:
             print(f"Error extracting links: {e}")
 
         # Store photo links in the links array with a special marker
-        all_links = links + photo_links
+        all_links = list(links) + list(photo_links)
         return all_links
 
     def is_external_link(self, url):
@@ -748,223 +1279,197 @@ class FacebookScraper:
 
     def extract_media_from_post(self, post_element):
         """Extract all media (images, videos) from a post element"""
-        media = {"images": [], "videos": []}
+        return self.media_from_raw(POST_VISITOR.visit(post_element, collect_content=False)["media"])
+
+    def media_from_raw(self, raw_media):
+        """Filter and deduplicate raw media values into image and video URLs"""
+        # Dicts keep insertion order, so they double as ordered sets here
+        images = {}
+        videos = {}
 
         try:
             # 1: Extract images from img tags
-            img_elements = post_element.find_all('img')
-            for img in img_elements:
-                src = img.get('src', '')
+            for src, alt in raw_media["img"]:
                 if src and self.is_valid_image_url(src):
                     # Avoid profile pictures and emojis
-                    alt = img.get('alt', '').lower()
+                    alt = alt.lower()
                     if not any(keyword in alt for keyword in ['profile', 'avatar', 'emoji', 'like', 'icon']):
-                        if src not in media["images"]:
-                            media["images"].append(src)
+                        images[src] = None
 
             # 2: Extract from data attributes (multiple variants)
-            data_attrs = [
-                'data-imgurl', 'data-src', 'data-original', 'data-lazy-src',
-                'data-img-src', 'data-background-image', 'data-image-url'
-            ]
-            
-            for attr in data_attrs:
-                elements_with_data = post_element.find_all(attrs={attr: True})
-                for elem in elements_with_data:
-                    img_url = elem.get(attr, '')
-                    if self.is_valid_image_url(img_url) and img_url not in media["images"]:
-                        media["images"].append(img_url)
+            for attr, img_url in raw_media["data_attrs"]:
+                if self.is_valid_image_url(img_url):
+                    images[img_url] = None
 
             # 3: Extract image URLs from style attributes
-            style_elements = post_element.find_all(attrs={'style': True})
-            for elem in style_elements:
-                style = elem.get('style', '')
+            for style in raw_media["styles"]:
                 # Look for background-image URLs
-                bg_image_matches = re.findall(r'background-image:\s*url\(["\']?(.*?)["\']?\)', style)
-                for url in bg_image_matches:
-                    if self.is_valid_image_url(url) and url not in media["images"]:
-                        media["images"].append(url)
+                for url in BACKGROUND_IMAGE_PATTERN.findall(style):
+                    if self.is_valid_image_url(url):
+                        images[url] = None
 
             # 4: Extract from srcset attributes (responsive images)
-            srcset_elements = post_element.find_all(attrs={'srcset': True})
-            for elem in srcset_elements:
-                srcset = elem.get('srcset', '')
+            for srcset in raw_media["srcsets"]:
                 # Parse srcset format: "url1 1x, url2 2x" or "url1 100w, url2 200w"
-                urls = re.findall(r'(https?://[^\s,]+)', srcset)
-                for url in urls:
-                    if self.is_valid_image_url(url) and url not in media["images"]:
-                        media["images"].append(url)
+                for url in SRCSET_URL_PATTERN.findall(srcset):
+                    if self.is_valid_image_url(url):
+                        images[url] = None
 
             # 5: Look for specific Facebook image classes/patterns
-            fb_image_selectors = [
-                'img[class*="scaledImageFitWidth"]',
-                'img[class*="scaledImageFitHeight"]', 
-                'img[class*="_46-i"]',
-                'img[class*="fb_feed_image"]',
-                'div[style*="background-image"]',
-                'a[href*="/photo/"]',
-                '[data-testid="photo"]'
-            ]
-            
-            for selector in fb_image_selectors:
-                try:
-                    elements = post_element.select(selector)
-                    for elem in elements:
-                        # For img tags
-                        if elem.name == 'img':
-                            src = elem.get('src', '')
-                            if src and self.is_valid_image_url(src) and src not in media["images"]:
-                                media["images"].append(src)
-                        # For div with background-image
-                        elif elem.name == 'div':
-                            style = elem.get('style', '')
-                            bg_matches = re.findall(r'background-image:\s*url\(["\']?(.*?)["\']?\)', style)
-                            for url in bg_matches:
-                                if self.is_valid_image_url(url) and url not in media["images"]:
-                                    media["images"].append(url)
-                        # For links to photos
-                        elif elem.name == 'a':
-                            href = elem.get('href', '')
-                            # Extract image URL from Facebook photo links
-                            if '/photo/' in href:
-                                # Look for image inside the link
-                                img_in_link = elem.find('img')
-                                if img_in_link:
-                                    src = img_in_link.get('src', '')
-                                    if src and self.is_valid_image_url(src) and src not in media["images"]:
-                                        media["images"].append(src)
-                except Exception as e:
-                    print(f"Error with selector {selector}: {e}")
+            for match in raw_media["fb_matches"]:
+                # For img tags
+                if match[0] == 'img':
+                    src = match[1]
+                    if src and self.is_valid_image_url(src):
+                        images[src] = None
+                # For div with background-image
+                elif match[0] == 'div':
+                    for url in BACKGROUND_IMAGE_PATTERN.findall(match[1]):
+                        if self.is_valid_image_url(url):
+                            images[url] = None
+                # For links to photos
+                elif match[0] == 'a':
+                    # Extract image URL from Facebook photo links
+                    if '/photo/' in match[1]:
+                        # Look for image inside the link
+                        src = match[2]
+                        if src and self.is_valid_image_url(src):
+                            images[src] = None
 
             # 6: Extract videos
-            video_elements = post_element.find_all('video')
-            for video in video_elements:
-                src = video.get('src', '')
-                if src and src not in media["videos"]:
-                    media["videos"].append(src)
+            for src in raw_media["videos"]:
+                if src:
+                    videos[src] = None
                     
             # Also check for video data attributes
-            video_data_elements = post_element.find_all(attrs={"data-video-url": True})
-            for elem in video_data_elements:
-                video_url = elem.get('data-video-url', '')
-                if video_url and video_url not in media["videos"]:
-                    media["videos"].append(video_url)
+            for video_url in raw_media["video_urls"]:
+                if video_url:
+                    videos[video_url] = None
 
-            print(f"Extracted {len(media['images'])} images, {len(media['videos'])} videos")
+            print(f"Extracted {len(images)} images, {len(videos)} videos")
 
         except Exception as e:
             print(f"Error extracting media: {e}")
 
-        return media
+        return {"images": list(images), "videos": list(videos)}
 
-    def extract_images_from_facebook_photo_links(self, links):
-        """Extract actual image URLs from Facebook photo links"""
+    def images_from_photo_links(self, links):
+        """Cached image URLs for a post's Facebook photo links, plus the (fbid, link) pairs not cached yet"""
         image_urls = []
-        
-        # Strict limits to prevent infinite loops and timeouts
-        MAX_PHOTO_LINKS = 2  # Reduced from 3 to 2 for faster processing
-        TIMEOUT_PER_LINK = 5  # Reduced from 8 to 5 seconds per photo link
-        TOTAL_TIMEOUT = 15   # Max 15 seconds total for all photo processing
-        
-        start_total_time = time.time()
-        
-        try:
-            processed_links = 0
-            for link in links:
-                # Check total timeout
-                if time.time() - start_total_time > TOTAL_TIMEOUT:
-                    print(f"⏰ Total photo processing timeout ({TOTAL_TIMEOUT}s) reached, stopping...")
-                    break
-                    
-                if processed_links >= MAX_PHOTO_LINKS:
-                    print(f"Reached max photo links limit ({MAX_PHOTO_LINKS}), skipping remaining photos")
-                    break
-                    
-                if '/photo?' in link or 'fbid=' in link:
-                    print(f"Processing Facebook photo link {processed_links + 1}/{min(len(links), MAX_PHOTO_LINKS)}: {link[:80]}...")
-                    processed_links += 1
-                    
-                    start_link_time = time.time()
-                    
-                    try:
-                        # Navigate to the photo page with timeout
-                        self.driver.execute_script(f"window.open('{link}', '_blank');")
-                        self.driver.switch_to.window(self.driver.window_handles[-1])
-                        
-                        # Wait for page to load with shorter timeout
-                        time.sleep(1)  # Reduced from 2 to 1 second
-                        
-                        # Check timeout
-                        if time.time() - start_link_time > TIMEOUT_PER_LINK:
-                            print(f"Timeout reached for photo link, skipping...")
-                            self.driver.close()
-                            self.driver.switch_to.window(self.driver.window_handles[0])
-                            continue
-                        
-                        # Get page source and parse with BeautifulSoup
-                        photo_page_html = self.driver.page_source
-                        soup = BeautifulSoup(photo_page_html, 'html.parser')
-                        
-                        # Look for the main photo image with multiple selectors
-                        photo_selectors = [
-                            'img[data-pagelet="MediaViewerPhoto"]',
-                            'img[class*="spotlight"]',
-                            'img[style*="max-height"]',
-                            'img[src*="fbcdn.net"][src*="scontent"]',
-                            '.spotlight img',
-                            '[data-testid="photo-viewer"] img',
-                            '.photoContainer img',
-                            'img[class*="scaledImageFit"]'
-                        ]
-                        
-                        found_image = False
-                        for selector in photo_selectors:
-                            if time.time() - start_link_time > TIMEOUT_PER_LINK:
-                                print(f"Timeout during selector processing, breaking...")
-                                break
-                                
-                            try:
-                                img_elements = soup.select(selector)
-                                for img in img_elements:
-                                    src = img.get('src', '')
-                                    if src and self.is_valid_image_url(src):
-                                        # Check if it's a high-quality image (not thumbnail)
-                                        if 'scontent' in src and len(src) > 50:
-                                            image_urls.append(src)
-                                            print(f"✅ Extracted image: {src[:60]}...")
-                                            found_image = True
-                                            break
-                                if found_image:
-                                    break
-                            except Exception as sel_e:
-                                continue
-                                
-                        # Close the photo page tab
-                        try:
-                            self.driver.close()
-                            self.driver.switch_to.window(self.driver.window_handles[0])
-                        except Exception as close_e:
-                            print(f"Warning: Error closing tab: {close_e}")
-                        
-                        if not found_image:
-                            print(f"❌ Could not extract image from photo page")
-                            
-                    except Exception as e:
-                        print(f"⚠️ Error processing photo link: {e}")
-                        # Make sure we're back on main window
-                        try:
-                            if len(self.driver.window_handles) > 1:
-                                self.driver.close()
-                                self.driver.switch_to.window(self.driver.window_handles[0])
-                        except:
-                            pass
-                        
-        except Exception as e:
-            print(f"Error extracting images from photo links: {e}")
-            
-        total_time = time.time() - start_total_time
-        print(f"Photo processing completed in {total_time:.2f}s, found {len(image_urls)} images")
-        return image_urls
+        missing = []
+        seen = set()
+        for link in links:
+            fbid = photo_fbid(link)
+            if not fbid or fbid in seen:
+                continue
+            if len(seen) >= self.max_photo_links:
+                print(f"Reached max photo links limit ({self.max_photo_links}), skipping remaining photos")
+                break
+            seen.add(fbid)
+            cached = self.photo_cache.get(fbid)
+            if cached is not None:
+                image_urls.extend(url for url in cached if url not in image_urls)
+            elif os.getenv('GITHUB_ACTIONS') == 'true':
+                # Don't open photo pages on CI runners; cached photos are still used
+                continue
+            else:
+                missing.append((fbid, link))
+        return image_urls, missing
+
+    def resolve_pending_photos(self, posts, wait=False):
+        """Start loading uncached photo pages of accepted posts, then add images from loads that are done"""
+        accepted = {id(post) for post in posts}
+        pending = [entry for entry in self.pending_photos if id(entry[0]) in accepted]
+        self.pending_photos = []
+
+        loading = {fbid for _, fetch, _ in self.photo_fetches for fbid in fetch}
+        to_fetch = {}
+        for _, fbid, link in pending:
+            # Another post may already have resolved (or be loading) the same photo
+            if fbid not in to_fetch and fbid not in loading and self.photo_cache.get(fbid) is None:
+                to_fetch[fbid] = link
+
+        if to_fetch:
+            self.photo_fetches.append((self.fetch_photo_pages(list(to_fetch.values())), to_fetch, time.time()))
+        self.photo_posts.extend(pending)
+        self.finish_photo_fetches(wait)
+
+    def finish_photo_fetches(self, wait=False):
+        """Cache images from finished photo page loads (all of them if wait) and add them to their posts"""
+        still_loading = []
+        for future, to_fetch, start_time in self.photo_fetches:
+            if not wait and not future.done():
+                still_loading.append((future, to_fetch, start_time))
+                continue
+            try:
+                pages = future.result()
+            except Exception as e:
+                print(f"⚠️ Error loading photo pages: {e}")
+                pages = {}
+            found = 0
+            for fbid, link in to_fetch.items():
+                photo_page_html = pages.get(link)
+                if self.session_recorder:
+                    self.session_recorder.add_response("photo", link, photo_page_html)
+                if photo_page_html is None:
+                    continue  # Failed loads are not cached and are retried next time
+                images = self.image_from_photo_page(photo_page_html)
+                if not images:
+                    print(f"❌ Could not extract image from photo page")
+                found += len(images)
+                self.photo_cache.put(fbid, images)
+            try:
+                self.photo_cache.save()
+            except OSError as e:
+                print(f"⚠️  Could not save photo cache: {e}")
+            print(f"Photo processing completed in {time.time() - start_time:.2f}s: "
+                  f"{len(to_fetch)} photo pages, found {found} images")
+        self.photo_fetches = still_loading
+
+        loading = {fbid for _, fetch, _ in still_loading for fbid in fetch}
+        waiting = []
+        for post, fbid, link in self.photo_posts:
+            if fbid in loading:
+                waiting.append((post, fbid, link))
+                continue
+            images = post["attachment"]["images"]
+            for url in self.photo_cache.get(fbid) or []:
+                if url not in images:
+                    images.append(url)
+        self.photo_posts = waiting
+
+    def image_from_photo_page(self, photo_page_html):
+        """Full-size image URL on a photo page, as a list with zero or one entries"""
+        soup = parse_document(photo_page_html, self.html_parser)
+
+        # Look for the main photo image with multiple selectors
+        photo_selectors = [
+            'img[data-pagelet="MediaViewerPhoto"]',
+            'img[class*="spotlight"]',
+            'img[style*="max-height"]',
+            'img[src*="fbcdn.net"][src*="scontent"]',
+            '.spotlight img',
+            '[data-testid="photo-viewer"] img',
+            '.photoContainer img',
+            'img[class*="scaledImageFit"]'
+        ]
+
+        for selector in photo_selectors:
+            try:
+                for img in soup.select(selector):
+                    src = img.get('src', '')
+                    # Check if it's a high-quality image (not thumbnail)
+                    if src and self.is_valid_image_url(src) and 'scontent' in src and len(src) > 50:
+                        print(f"✅ Extracted image: {src[:60]}...")
+                        return [src]
+            except Exception:
+                continue
+        return []
+
+    def fetch_photo_pages(self, links):
+        """Start loading photo pages in a bounded pool of tabs; returns a Future of {link: html or None}"""
+        print(f"Opening {len(links)} photo pages in up to {self.photo_tabs} background tabs")
+        return self.driver.open_tabs(links, self.photo_tabs, timeout=PHOTO_PAGE_TIMEOUT)
 
     def fetch_full_article_content(self, links):
         """Fetch full article content from Kuensel links"""
@@ -982,82 +1487,95 @@ class FacebookScraper:
             article_url = kuensel_links[0]
             print(f"Fetching full article from: {article_url}")
             
-            # Set headers to mimic a browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-            
-            # Fetch the article
-            response = requests.get(article_url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                # Parse the HTML content
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract title from various possible selectors
-                title_selectors = [
-                    'h1.entry-title',
-                    'h1.post-title', 
-                    'h1.article-title',
-                    '.title h1',
-                    'h1',
-                    'title'
-                ]
-                
-                for selector in title_selectors:
-                    title_elem = soup.select_one(selector)
-                    if title_elem and title_elem.get_text(strip=True):
-                        full_title = title_elem.get_text(strip=True)
-                        break
-                
-                # Extract content from various possible selectors
-                content_selectors = [
-                    '.entry-content',
-                    '.post-content',
-                    '.article-content',
-                    '.content',
-                    'article',
-                    '.main-content p',
-                    '.post-body',
-                    '.entry-body'
-                ]
-                
-                for selector in content_selectors:
-                    content_elem = soup.select_one(selector)
-                    if content_elem:
-                        # Get all paragraphs within the content
-                        paragraphs = content_elem.find_all('p')
-                        if paragraphs:
-                            content_text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                            if len(content_text) > len(full_content):
-                                full_content = content_text
-                        else:
-                            # If no paragraphs, get all text
-                            text = content_elem.get_text(strip=True)
-                            if len(text) > len(full_content):
-                                full_content = text
-                
-                # Clean up the content
-                if full_content:
-                    # Remove extra whitespace and newlines
-                    full_content = re.sub(r'\n+', '\n\n', full_content)
-                    full_content = re.sub(r'\s+', ' ', full_content)
-                    full_content = full_content.strip()
-                    
+            page_content = self.fetch_article_page(article_url)
+            if page_content is not None:
+                full_content, full_title = self.parse_article_page(page_content)
                 print(f"Successfully fetched article content: {len(full_content)} characters")
                 
-            else:
-                print(f"Failed to fetch article: HTTP {response.status_code}")
-                
         except Exception as e:
             print(f"Error fetching article content: {e}")
             
         return full_content, full_title
 
+    def fetch_article_page(self, article_url):
+        """Download an article page, returning its HTML bytes or None"""
+        # Set headers to mimic a browser
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        }
+        
+        response = requests.get(article_url, headers=headers, timeout=10)
+        page_content = response.content if response.status_code == 200 else None
+        if page_content is None:
+            print(f"Failed to fetch article: HTTP {response.status_code}")
+        
+        if self.session_recorder:
+            self.session_recorder.add_response("article", article_url, page_content)
+        return page_content
+
+    def parse_article_page(self, page_content):
+        """Extract (content, title) from a Kuensel article page"""
+        full_content = ""
+        full_title = ""
+        soup = parse_document(page_content, self.html_parser)
+        
+        # Extract title from various possible selectors
+        title_selectors = [
+            'h1.entry-title',
+            'h1.post-title', 
+            'h1.article-title',
+            '.title h1',
+            'h1',
+            'title'
+        ]
+        
+        for selector in title_selectors:
+            title_elem = soup.select_one(selector)
+            if title_elem and title_elem.get_text(strip=True):
+                full_title = title_elem.get_text(strip=True)
+                break
+        
+        # Extract content from various possible selectors
+        content_selectors = [
+            '.entry-content',
+            '.post-content',
+            '.article-content',
+            '.content',
+            'article',
+            '.main-content p',
+            '.post-body',
+            '.entry-body'
+        ]
+        
+        for selector in content_selectors:
+            content_elem = soup.select_one(selector)
+            if content_elem:
+                # Get all paragraphs within the content
+                paragraphs = content_elem.find_all('p')
+                if paragraphs:
+                    content_text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+                    if len(content_text) > len(full_content):
+                        full_content = content_text
+                else:
+                    # If no paragraphs, get all text
+                    text = content_elem.get_text(strip=True)
+                    if len(text) > len(full_content):
+                        full_content = text
+        
+        # Clean up the content
+        if full_content:
+            # Remove extra whitespace and newlines
+            full_content = re.sub(r'\n+', '\n\n', full_content)
+            full_content = re.sub(r'\s+', ' ', full_content)
+            full_content = full_content.strip()
+        
+        return full_content, full_title
+
     def is_valid_image_url(self, url):
         """Check if URL is a valid image URL"""
         if not url:
@@ -1113,77 +1631,20 @@ class FacebookScraper:
 
     def clean_text(self, text):
         """Clean and preprocess text"""
-        if not text:
-            return ""
-
-        # Decode HTML entities
-        text = html.unescape(text)
-
-        # Remove Facebook-specific metadata and timestamps
-        # Remove timestamps like "4h ·", "3h ·", "2h", "1 min", etc.
-        text = re.sub(r'\b\d+[hm]\s*·?\s*', '', text)  # Matches "4h ·", "3h", "2m ·", etc.
-        text = re.sub(r'\b\d+\s*(hour|hours|min|mins|minute|minutes)\s*ago\s*·?\s*', '', text)  # "2 hours ago ·"
-        text = re.sub(r'\bVerified\s+account\s*', '', text)  # Remove "Verified account"
-        text = re.sub(r'\bShared\s+with\s+Public\s*', '', text)  # Remove "Shared with Public"
-        text = re.sub(r'^[^·]*·\s*', '', text)  # Remove everything before and including first "·"
-        
-        # Remove Facebook interaction text at the end
-        text = re.sub(r'\s*All\s+reactions?:.*$', '', text, flags=re.IGNORECASE | re.DOTALL)  # Remove "All reactions: 199 38 6"
-        text = re.sub(r'\s*(Like|Comment|Share|View\s+more\s+comments?).*$', '', text, flags=re.IGNORECASE | re.DOTALL)  # Remove interaction buttons
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-
-        # Only remove very specific problematic characters, keep most text intact
-        # Remove only null bytes, control characters, and excessive Unicode symbols
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', text)  # Remove control characters
-        text = re.sub(r'[^\x20-\x7E\u00A0-\uFFFF]', '', text)  # Keep printable ASCII and Unicode
-
-        # Remove excessive repeated punctuation (3 or more in a row)
-        text = re.sub(r'([.!?]){3,}', r'\1\1\1', text)
-
-        return text.strip()
+        return text_rules.normalize(text)
 
     def filter_comments_from_content(self, text):
         """Filter out comments and user interactions from content"""
         if not text:
             return ""
-        
-        # Split into lines to analyze each part
-        lines = text.split('\n')
+
+        # Skip lines that look like comments or user interactions
         filtered_lines = []
-        
-        for line in lines:
+        for line in text.split('\n'):
             line = line.strip()
-            if not line:
-                continue
-                
-            # Skip lines that look like comments or user interactions
-            comment_patterns = [
-                r'^[A-Za-z\s]+ commented:',  
-                r'^\d+\s*(like|comment|share|react)', 
-                r'^(Like|Comment|Share|Reply)$',  
-                r'^[A-Za-z\s]+ replied:',  
-                r'^[A-Za-z\s]+ reacted',  
-                r'^\d+\s*(min|hr|day|week|month|year)s?\s+ago',  
-                r'^(Most relevant|Top comments|All comments|View \d+ replies?)',  
-                r'^Write a comment',  
-                r'^[A-Za-z\s]+ and \d+ others? (like|comment|react)', 
-                r'^How about',  
-                r'^What about',  
-                r'^Why not',    
-                r'^\w+\?$',     
-            ]
-            
-            is_comment = False
-            for pattern in comment_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    is_comment = True
-                    break
-            
-            if not is_comment:
+            if line and not text_rules.is_comment(line):
                 filtered_lines.append(line)
-        
+
         return '\n'.join(filtered_lines).strip()
 
     def parse_count(self, count_str):
@@ -1207,91 +1668,20 @@ class FacebookScraper:
         """Check if post has meaningful content"""
         content = post_data.get('content', '')
         title = post_data.get('title', '')
-        description = post_data.get('description', '')
         content_clean = content.strip()
-        title_clean = title.strip().lower()
 
         print(f"[DEBUG] Validating post: title='{title}', content_length={len(content_clean)}")
         print(f"[DEBUG] Content preview: '{content_clean[:100]}...'")
 
-        # Temporary: Be more lenient to see what we're getting
-        # Allow 'Untitled Post' or 'Intro' if content has any meaningful text
-        if title_clean in ['untitled post', 'intro']:
-            if content_clean and len(content_clean) > 5 and any(char.isalnum() for char in content_clean):
-                print(f"[DEBUG] Accepting '{title}' with {len(content_clean)} chars of content")
-                return True
-            else:
-                print(f"[DEBUG] Rejecting '{title}': content too short or empty")
-                return False
+        # Substantial content OR media attachments is required for short posts
+        attachment = post_data.get('attachment', {})
+        has_media = bool(attachment.get('images') or
+                         attachment.get('videos') or
+                         attachment.get('links'))
 
-        # Filter out posts with no meaningful content
-        if not content or len(content_clean) < 5:  # Lowered from 10 to 5
-            print(f"[DEBUG] Rejecting: content too short ({len(content_clean)} chars)")
-            return False
-
-        # Filter out posts with only dots or minimal content
-        if content_clean in ['', '.', '..', '...', '....', '.....']:
-            print(f"[DEBUG] Rejecting: content is just dots")
-            return False
-
-        # Filter out posts that are just the title repeated
-        if content_clean == title.strip():
-            print(f"[DEBUG] Rejecting: content matches title")
-            return False
-
-        # Filter out very short posts that are likely incomplete - be more lenient
-        if len(content_clean) < 8 and not any(char.isalnum() for char in content_clean):  # Lowered from 15 to 8
-            print(f"[DEBUG] Rejecting: content too short and not alphanumeric")
-            return False
-
-        # Filter out posts with suspiciously generic content
-        generic_patterns = [
-            'loading...',
-            'error',
-            'failed to load'
-        ]
-        content_lower = content_clean.lower()
-        if any(pattern in content_lower for pattern in generic_patterns):
-            print(f"[DEBUG] Rejecting: generic pattern found")
-            return False
-
-        # Filter out comment-like posts and Facebook comments
-        comment_patterns = [
-            r'if\s+he\s+full\s+fills\s+his\s+dream',
-            r'druptop\s+vajra\s+guru',
-            r'^how about.{1,40}\?*$',
-            r'^what about.{1,40}\?*$',
-            r'^why not.{1,40}\?*$',
-            r'^what\s+do\s+you\s+think.{0,50}\?*$',
-            r'^[a-zA-Z\s]{1,20}\?+$',
-            r'^(ok|okay|yes|no|true|false|really|wow|nice|good|bad|great|awesome|cool|sure|right)[\.\!\?]*$',
-            r'^\w{1,15}[\.\!\?]+$',
-            r'^(lol|lmao|haha)[\.\!\?]*$',
-            r'^(that\'s|thats)\s+(good|bad|nice|cool|great|awesome|amazing)',
-            r'^i\s+(think|believe|hope|wish|agree|disagree)',
-            r'^you\s+(should|could|might|can|will)',
-            r'^\w+\s*\?+$',
-        ]
-        for pattern in comment_patterns:
-            if re.search(pattern, content_lower.strip()):
-                print(f"[DEBUG] Rejecting: comment-like pattern found")
-                return False
-
-        # Require substantial content OR media attachments - be more lenient
-        has_media = bool(post_data.get('attachment', {}).get('images') or 
-                        post_data.get('attachment', {}).get('videos') or
-                        post_data.get('attachment', {}).get('links'))
-        if len(content_clean) < 15 and not has_media:  # Lowered from 25 to 15
-            print(f"[DEBUG] Rejecting: short post without media ({len(content_clean)} chars)")
-            return False
-
-        # Require at least some meaningful text (letters or numbers)
-        if not any(char.isalnum() for char in content_clean):
-            print(f"[DEBUG] Rejecting: no alphanumeric content")
-            return False
-
-        print(f"[DEBUG] Accepting post: '{title}' with {len(content_clean)} chars")
-        return True
+        valid, reason = text_rules.is_valid(content, title, has_media)
+        print(f"[DEBUG] {reason}")
+        return valid
 
     def cleanup_comment_posts(self, data):
         """Remove comment-like posts from the final data"""
@@ -1302,23 +1692,10 @@ class FacebookScraper:
         for post in original_posts:
             content = post.get('content', '').strip()
             
-            # Enhanced comment detection patterns
-            comment_patterns = [
-                r'^how about.{1,30}\?*$',        
-                r'^what about.{1,30}\?*$',       
-                r'^why not.{1,30}\?*$',          
-                r'^[a-zA-Z\s]{1,20}\?+$',        
-                r'^(ok|okay|yes|no|true|false|really|wow|nice|good|bad)[\.\!\?]*$',  
-                r'^\w{1,10}[\.\!\?]+$',          
-            ]
-            
-            is_comment = False
-            for pattern in comment_patterns:
-                if re.search(pattern, content.lower()):
-                    is_comment = True
-                    print(f"🗑️  Removing comment-like post: '{content[:50]}'")
-                    removed_count += 1
-                    break
+            is_comment = text_rules.is_comment(content.lower(), text_rules.SAVED_COMMENT_RULES)
+            if is_comment:
+                print(f"🗑️  Removing comment-like post: '{content[:50]}'")
+                removed_count += 1
             
             # Also check for very short posts without media
             if not is_comment:
@@ -1346,28 +1723,15 @@ class FacebookScraper:
         return data
     
     def create_post_hash(self, post_data):
-        """Create hash to identify duplicate posts - using more content for better uniqueness"""
-        content = post_data.get('content', '')
-        title = post_data.get('title', '')
-        
-        # Use more content for hash to avoid minor variations causing duplicates
-        content_key = content[:200].strip() if content else ""  # Increased from 100 to 200
-        title_key = title[:100].strip() if title else ""        # Increased from 50 to 100
-        
-        # Normalize content for better duplicate detection
-        def normalize_text(text):
-            # Remove extra whitespace and convert to lowercase
-            text = re.sub(r'\s+', ' ', text.lower().strip())
-            return text
-        
-        normalized_content = normalize_text(content_key)
-        normalized_title = normalize_text(title_key)
-        
-        combined = f"{normalized_content}_{normalized_title}"
-        return hashlib.md5(combined.encode()).hexdigest()
+        """Canonical fingerprint of a post, computed once and cached on the post record"""
+        fingerprint = post_data.get("fingerprint")
+        if fingerprint is None:
+            fingerprint = content_fingerprint(post_data.get('content', ''))
+            post_data["fingerprint"] = fingerprint
+        return fingerprint
 
     def remove_duplicates(self):
-        """Remove duplicate posts from the list"""
+        """Remove duplicate posts from the list (full pass; add_scraped_posts already keeps it unique)"""
         unique_posts = []
         seen_hashes = set()
 
@@ -1389,12 +1753,8 @@ class FacebookScraper:
         seen_content_hashes = set()
         
         for post in posts:
-            content = post.get('content', '').strip()
             title = post.get('title', '').strip()
-            
-            # Create content hash for this post
-            content_key = content[:200].strip() if content else ""
-            content_hash = hashlib.md5(content_key.encode()).hexdigest()
+            content_hash = self.create_post_hash(post)
             
             # Skip if we've seen this content hash in this batch
             if content_hash not in seen_content_hashes:
@@ -1405,7 +1765,7 @@ class FacebookScraper:
                 
         return unique_posts
 
-    def scrape_posts(self, page_url="https://www.facebook.com/Kuensel", target_count=None, max_scrolls=None, runtime_checker=None): # Fixed URL
+    def scrape_posts(self, page_url=DEFAULT_PAGE_URL, target_count=None, max_scrolls=None, runtime_checker=None): # Fixed URL
         """Main scraping function - implements your 7-step process"""
         if target_count is None:
             target_count = self.config["scraping"]["target_count"]
@@ -1413,10 +1773,11 @@ class FacebookScraper:
             max_scrolls = self.config["scraping"]["max_scrolls"]
 
         print(f"Starting to scrape up to {target_count} posts from {page_url}...")
+        self.page_url = page_url
         
-        # Clear session hashes to start fresh
-        self.seen_post_hashes.clear()
-        print(f"Cleared session hashes. Starting with {len(self.existing_post_ids)} known existing posts.")
+        # Clear session hashes and parse cache to start fresh
+        self.reset_session_state()
+        print(f"Cleared session hashes. Starting with {self.post_index.count()} known existing posts.")
         
         # Add overall timeout protection - max 15 minutes for entire scraping
         OVERALL_TIMEOUT = 900  # 15 minutes in seconds
@@ -1426,6 +1787,8 @@ class FacebookScraper:
         if not self.navigate_to_page(page_url): # This method is now defined
             return []
 
+        self.start_session_recording(page_url)
+
         scrolls = 0
         consecutive_empty_scrapes = 0
         consecutive_old_posts = 0  # Track how many already-scraped posts we encounter
@@ -1433,6 +1796,13 @@ class FacebookScraper:
         max_consecutive_old = 8  # Increased from 5 to 8 - scroll more before stopping
         min_scrolls_before_old_check = 3  # Don't check for old posts until we've scrolled at least 3 times
 
+        # Only parse feed units appended since the previous scroll
+        incremental = self.config["scraping"].get("incremental_extraction", True)
+
+        # "beautifulsoup" parses page_source, "javascript" collects post fields in the browser
+        extraction_engine = self.config["scraping"].get("extraction_engine", "beautifulsoup")
+        print(f"Using {extraction_engine} extraction engine")
+
         # Cycle until required number of posts
         while len(self.posts_data) < target_count and scrolls < max_scrolls:
             # Check overall timeout
@@ -1449,96 +1819,35 @@ class FacebookScraper:
             # 1: Use Selenium to scroll down a little and load new posts
             print(f"Scroll #{scrolls + 1}... (Found {len(self.posts_data)} new posts so far, {elapsed_time/60:.1f}min elapsed)")
             self.scroll_page()
+            self.resource_policy.collect(self.driver)  # Keep Chrome's performance log short
+
+            # 1.5: Expand "See more" links to get full content (waits until the text has rendered)
+            self.expand_see_more_links()
 
-            # 1.5: Expand "See more" links to get full content
-            if scrolls % 2 == 0:  # Expand every 2nd scroll to avoid too many clicks
-                print("Expanding 'See more' links...")
-                expanded = self.expand_see_more_links()
-                if expanded > 0:
-                    time.sleep(2)  # Wait for content to fully load after expansion
+            # 2-3: Collect post fields in the browser when the JavaScript engine is selected
+            new_posts = None
+            if extraction_engine == "javascript":
+                new_posts = self.extract_posts_with_javascript(incremental)
 
-            # 2: Extract the HTML of the current page
-            html_content = self.get_page_html()
+            if new_posts is None:
+                # 2: Extract the HTML of the current page (only new feed units in incremental mode)
+                html_content = self.get_new_feed_html() if incremental else None
+                if html_content is None:
+                    html_content = self.get_page_html()
 
-            # 3: Use BeautifulSoup to parse the HTML and extract the required post data
-            new_posts = self.extract_posts_with_beautifulsoup(html_content)
+                if self.session_recorder:
+                    self.session_recorder.add_snapshot(html_content)
+
+                # 3: Use BeautifulSoup to parse the HTML and extract the required post data
+                new_posts = self.extract_posts_with_beautifulsoup(html_content)
             print(f"Extracted {len(new_posts)} raw posts")
             
-            # Pre-filter the new posts to remove obvious duplicates within this batch
-            unique_new_posts = self.filter_duplicate_posts_in_batch(new_posts)
-            print(f"After batch deduplication: {len(unique_new_posts)} unique posts to process")
-
-            # 4: Store the extracted data in a list (after validation)
             old_count = len(self.posts_data)
-            valid_posts_count = 0
-            already_scraped_count = 0  # Track how many posts were already scraped
-
-            for post in unique_new_posts:
-                # Check timeout during post processing
-                if time.time() - scraping_start_time > OVERALL_TIMEOUT:
-                    print(f"⏰ Timeout reached during post processing, breaking...")
-                    break
-                    
-                post_id = post.get("id", "")
-                post_content = post.get('content', '').strip()
-                post_title = post.get('title', '').strip()
-                
-                # Skip if post already exists in master file
-                if post_id and self.is_post_already_scraped(post_id):
-                    print(f"Skipping already scraped post: {post.get('title', '')[:50]}...")
-                    already_scraped_count += 1
-                    continue
-                
-                # Enhanced duplicate checking - create multiple hashes for better detection
-                # 1. Content-based hash (first 200 chars for better uniqueness)
-                content_for_hash = post_content[:200].strip() if post_content else ""
-                content_hash = hashlib.md5(content_for_hash.encode()).hexdigest()
-                
-                # 2. Title-based hash
-                title_hash = hashlib.md5(post_title.encode()).hexdigest() if post_title else ""
-                
-                # 3. Combined hash for session deduplication
-                combined_key = f"{content_for_hash}_{post_title[:50].strip()}"
-                session_hash = hashlib.md5(combined_key.encode()).hexdigest()
-                
-                # Check if we've already seen this content in this session
-                is_duplicate = False
-                
-                # Check against seen hashes from this session
-                if session_hash in self.seen_post_hashes:
-                    print(f"Skipping duplicate post (session hash): {post_title[:50]}...")
-                    is_duplicate = True
-                elif content_hash in self.seen_post_hashes:
-                    print(f"Skipping duplicate post (content hash): {post_title[:50]}...")
-                    is_duplicate = True
-                elif title_hash and title_hash in self.seen_post_hashes:
-                    print(f"Skipping duplicate post (title hash): {post_title[:50]}...")
-                    is_duplicate = True
-                    
-                # Additional content similarity check for similar posts
-                if not is_duplicate and post_content:
-                    for existing_post in self.posts_data:
-                        existing_content = existing_post.get('content', '').strip()
-                        if existing_content and self.is_content_similar(post_content, existing_content):
-                            print(f"Skipping similar post: {post_title[:50]}...")
-                            is_duplicate = True
-                            break
-                
-                if not is_duplicate:
-                    if self.is_valid_post(post):  
-                        # Add all hashes to seen set
-                        self.seen_post_hashes.add(session_hash)
-                        self.seen_post_hashes.add(content_hash)
-                        if title_hash:
-                            self.seen_post_hashes.add(title_hash)
-                        
-                        self.posts_data.append(post)
-                        valid_posts_count += 1
-                        print(f"✓ Added new post: {post_title[:50]}...")
-                    else:
-                        print(f"Post rejected as invalid: {post_title[:30] if post_title else 'No title'}")
-                else:
-                    already_scraped_count += 1
+            valid_posts_count, already_scraped_count = self.add_scraped_posts(
+                new_posts, deadline=scraping_start_time + OVERALL_TIMEOUT)
+            if self.pending_photos or self.photo_fetches:
+                # Photo tabs keep loading during the next scroll where the backend allows it
+                self.resolve_pending_photos(self.posts_data)
 
             new_count = len(self.posts_data)
             print(f"Found {valid_posts_count} valid posts in this scroll. Total unique posts: {new_count}")
@@ -1565,23 +1874,141 @@ class FacebookScraper:
             else:
                 consecutive_empty_scrapes = 0
 
-            # 6: Remove any duplicate entries from the list
-            unique_count = self.remove_duplicates()
-            print(f"After deduplication: {unique_count} unique posts")
+            # 6: Duplicates were already rejected as posts were added
+            print(f"After deduplication: {len(self.posts_data)} unique posts")
 
             scrolls += 1
 
-            # Small delay between scrolls
-            time.sleep(1)
+            # Small delay between scrolls (scroll_page already waited for the page)
+            if not self.page_waiter:
+                time.sleep(1)
+
+        self.finish_photo_fetches(wait=True)
+        self.stop_session_recording()
 
         elapsed_total = time.time() - scraping_start_time
         print(f"Scraping complete in {elapsed_total/60:.1f} minutes. Found {len(self.posts_data)} unique posts.")
+        print(f"Parse cache: {self.parse_cache_hits} hits, {self.parse_cache_misses} misses")
+        if self.page_waiter and self.page_waiter.durations:
+            print(f"Scroll waits: median {self.page_waiter.median_wait():.2f}s over {len(self.page_waiter.durations)} scrolls")
         if len(self.posts_data) > 0:
             print(f"New posts found this session:")
             for i, post in enumerate(self.posts_data[:3], 1):  # Show first 3 posts
                 print(f"  {i}. {post.get('title', 'No title')[:60]}...")
         return self.posts_data
 
+    def reset_session_state(self):
+        """Forget the posts, hashes and parse results of the previous session"""
+        self.posts_data = []
+        self.seen_post_hashes.clear()
+        self.session_post_ids.clear()
+        self.session_index = new_session_index()
+        self.exclusion_cache = (None, False)
+        self.parse_cache.clear()
+        self.parse_cache_hits = 0
+        self.parse_cache_misses = 0
+        self.pending_photos = []
+        self.photo_fetches = []
+        self.photo_posts = []
+        if self.page_waiter:
+            self.page_waiter.durations.clear()
+
+    def add_scraped_posts(self, new_posts, deadline=None):
+        """Deduplicate and validate extracted posts, adding new ones to posts_data.
+
+        Returns (valid_posts_count, already_scraped_count).
+        """
+        # Pre-filter the new posts to remove obvious duplicates within this batch
+        unique_new_posts = self.filter_duplicate_posts_in_batch(new_posts)
+        print(f"After batch deduplication: {len(unique_new_posts)} unique posts to process")
+
+        # 4: Store the extracted data in a list (after validation)
+        valid_posts_count = 0
+        already_scraped_count = 0  # Track how many posts were already scraped
+
+        for post in unique_new_posts:
+            # Check timeout during post processing
+            if deadline is not None and time.time() > deadline:
+                print(f"⏰ Timeout reached during post processing, breaking...")
+                break
+                
+            post_id = post.get("id", "")
+            post_content = post.get('content', '').strip()
+            post_title = post.get('title', '').strip()
+            
+            # Skip if post already exists in master file
+            if post_id and self.is_post_already_scraped(post_id):
+                print(f"Skipping already scraped post: {post.get('title', '')[:50]}...")
+                already_scraped_count += 1
+                # Later posts are still checked against it, as on the run that saved it,
+                # so scraping the same feed again adds nothing
+                if post_id not in self.session_post_ids:
+                    self.session_post_ids.add(post_id)
+                    self.seen_post_hashes.add(self.create_post_hash(post))
+                    if post_title:
+                        self.seen_post_hashes.add(hashlib.md5(post_title.encode()).hexdigest())
+                    if post_content:
+                        self.session_index.add(post_id, ContentSketch(post_content))
+                continue
+            
+            # Same story seen earlier in this session (exact match on the stable key)
+            if post_id in self.session_post_ids:
+                print(f"Skipping duplicate post (story ID {post_id}): {post_title[:50]}...")
+                continue
+            
+            # Enhanced duplicate checking - create multiple hashes for better detection
+            # 1. Canonical content fingerprint (cached on the post by the batch filter)
+            content_hash = self.create_post_hash(post)
+            
+            # 2. Title-based hash
+            title_hash = hashlib.md5(post_title.encode()).hexdigest() if post_title else ""
+            
+            # Check if we've already seen this content in this session
+            is_duplicate = False
+            
+            # Check against seen hashes from this session
+            if content_hash in self.seen_post_hashes:
+                print(f"Skipping duplicate post (content hash): {post_title[:50]}...")
+                is_duplicate = True
+            elif title_hash and title_hash in self.seen_post_hashes:
+                print(f"Skipping duplicate post (title hash): {post_title[:50]}...")
+                is_duplicate = True
+            elif post_content and self.post_index.has_fingerprint(content_hash):
+                print(f"Skipping duplicate post (archived content hash): {post_title[:50]}...")
+                is_duplicate = True
+                
+            # Near-duplicate check against the archive and this session's posts
+            # (content is normalized and hashed once for both checks)
+            sketch = ContentSketch(post_content) if post_content and not is_duplicate else None
+            if sketch:
+                archived_id = self.find_archived_near_duplicate(sketch)
+                if archived_id:
+                    print(f"Skipping near-duplicate of archived post {archived_id}: {post_title[:50]}...")
+                    is_duplicate = True
+                elif self.session_index.find_similar(sketch):
+                    print(f"Skipping similar post: {post_title[:50]}...")
+                    is_duplicate = True
+            
+            if not is_duplicate:
+                if self.is_valid_post(post):  
+                    # Add all hashes to seen set
+                    self.seen_post_hashes.add(content_hash)
+                    if title_hash:
+                        self.seen_post_hashes.add(title_hash)
+                    
+                    self.posts_data.append(post)
+                    if post_id and not post_id.startswith("post_"):
+                        self.session_post_ids.add(post_id)
+                    self.session_index.add(post_id or content_hash, sketch)
+                    valid_posts_count += 1
+                    print(f"✓ Added new post: {post_title[:50]}...")
+                else:
+                    print(f"Post rejected as invalid: {post_title[:30] if post_title else 'No title'}")
+            else:
+                already_scraped_count += 1
+
+        return valid_posts_count, already_scraped_count
+
     def format_for_output(self):
         """Format posts data to match required fields exactly"""
         formatted_posts = []
@@ -1593,8 +2020,8 @@ class FacebookScraper:
                 "description": post.get("description", ""),
                 "content": post.get("content", ""),
                 "categoryID": post.get("categoryID", "general"),
-                "authorId": post.get("authorId", "kuensel"),
-                "AuthorName": post.get("authorName", "Kuensel"),
+                "authorId": post.get("authorId", self.author_id),
+                "AuthorName": post.get("authorName", self.author_name),
                 "attachment": post.get("attachment", {"images": [], "videos": [], "links": []}),
                 "createdAt": post.get("createdAt", datetime.now().isoformat()),
                 "publishAt": post.get("publishAt", datetime.now().isoformat())
@@ -1612,7 +2039,13 @@ class FacebookScraper:
 
     def save_posts_consolidated(self, new_posts):
         """Save posts to a single consolidated file, adding only new ones"""
-        consolidated_file = "data/kuensel_posts_master.json"
+        consolidated_file = self.master_file
+        
+        # Skip reading the master file when the post index already has every post
+        if (os.path.exists(consolidated_file) and self.post_index.is_current(consolidated_file)
+                and all(post.get("id") in self.post_index for post in new_posts)):
+            print("No new posts to add to master file")
+            return consolidated_file
         
         # Load existing posts if file exists
         existing_posts = []
@@ -1638,6 +2071,7 @@ class FacebookScraper:
             print("No new posts to add to master file")
             # Save empty structure if file does not exist
             if not os.path.exists(consolidated_file):
+                os.makedirs(os.path.dirname(consolidated_file) or '.', exist_ok=True)
                 final_data = {
                     "scraping_session": {
                         "timestamp": datetime.now().isoformat(),
@@ -1651,25 +2085,28 @@ class FacebookScraper:
                 with open(consolidated_file, 'w', encoding='utf-8') as f:
                     json.dump(final_data, f, indent=2, ensure_ascii=False)
                 print(f"Created empty master file: {consolidated_file}")
+                self.update_post_index([], final_data["scraping_session"])
             return consolidated_file
         
         # Combine all posts
         all_posts = truly_new_posts + existing_posts
         
-        # Sort posts by publishAt timestamp (newest first)
+        # Sort posts by publishAt timestamp (newest first). Facebook timestamps carry
+        # an offset and fallbacks are local time, so compare everything in UTC.
         def get_publish_time(post):
             try:
                 publish_at = post.get("publishAt", "")
                 if publish_at:
                     # Handle both ISO format and other date formats
                     if 'T' in publish_at:
-                        return datetime.fromisoformat(publish_at.replace('Z', '+00:00'))
+                        # Naive timestamps are local time; astimezone() converts them as such
+                        return datetime.fromisoformat(publish_at.replace('Z', '+00:00')).astimezone(timezone.utc)
                     else:
                         # Fallback for other formats
-                        return datetime.now()
-                return datetime.now()
+                        return datetime.now(timezone.utc)
+                return datetime.now(timezone.utc)
             except:
-                return datetime.now()
+                return datetime.now(timezone.utc)
         
         all_posts.sort(key=get_publish_time, reverse=True)
         print(f"Posts sorted by publish time (newest first)")
@@ -1731,6 +2168,8 @@ class FacebookScraper:
         print(f"Consolidated data saved to {consolidated_file}")
         print(f"Added {len(truly_new_posts)} new posts to master file")
         print(f"Total posts in master file: {len(final_data['posts'])}")
+        self.update_post_index(final_data["posts"], final_data["scraping_session"])
+        self.update_near_duplicate_index(final_data["posts"])
         
         return consolidated_file
         
@@ -1910,24 +2349,67 @@ class FacebookScraper:
         
         return downloaded_count
 
+    def start_session_recording(self, page_url):
+        """Start recording this session if scraping.record_session names an archive path"""
+        record_path = self.config.get("scraping", {}).get("record_session")
+        if not record_path:
+            return
+        record_path = record_path.format(timestamp=datetime.now().strftime('%Y%m%d_%H%M%S'))
+        try:
+            self.session_recorder = SessionRecorder(record_path, metadata={
+                "page_url": page_url,
+                "scraping": self.config.get("scraping", {}),
+            })
+            print(f"📼 Recording session to {record_path}")
+        except Exception as e:
+            print(f"⚠️  Could not start session recording: {e}")
+            self.session_recorder = None
+
+    def stop_session_recording(self):
+        """Finish the session archive, if one is being recorded"""
+        if self.session_recorder:
+            try:
+                self.session_recorder.close()
+            except Exception as e:
+                print(f"⚠️  Could not finish session recording: {e}")
+            self.session_recorder = None
+
+    def attach_browser(self, other):
+        """Drive the browser that another scraper started (used by multi-page workers)"""
+        self.driver = other.driver
+        self.page_waiter = other.page_waiter
+        self.resource_policy = other.resource_policy
+
     def close(self):
-        """Close the WebDriver"""
+        """Close the WebDriver, the parse worker pool and the post index"""
+        self.stop_session_recording()
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+        self.post_index.close()
         if self.driver:
             self.driver.quit()
             print("WebDriver closed")
 
     def load_existing_posts(self):
-        """Load existing post IDs from master file to avoid re-scraping"""
-        consolidated_file = "data/kuensel_posts_master.json"
-        self.existing_post_ids = set()
+        """Open the post index of the master file, rebuilding it if the master changed"""
+        consolidated_file = self.master_file
         
         if os.path.exists(consolidated_file):
+            # Fast path: the post index was written after the last save. The
+            # near-duplicate sidecar is only read when the first lookup needs it
+            # (a long-lived scraper already holds it in memory)
+            if self.post_index.is_current(consolidated_file) and (len(self.near_duplicate_index)
+                                                                   or os.path.exists(self.near_duplicate_index.path)):
+                print(f"Loaded {self.post_index.count()} existing post IDs from {self.post_index.path}")
+                return
             try:
                 with open(consolidated_file, 'r', encoding='utf-8') as f:
                     existing_data = json.load(f)
                     existing_posts = existing_data.get("posts", [])
-                    self.existing_post_ids = {post.get("id") for post in existing_posts if post.get("id")}
-                print(f"Loaded {len(self.existing_post_ids)} existing post IDs to avoid re-scraping")
+                self.update_post_index(existing_posts, existing_data.get("scraping_session"))
+                print(f"Loaded {self.post_index.count()} existing post IDs to avoid re-scraping")
+                self.update_near_duplicate_index(existing_posts)
             except json.JSONDecodeError as e:
                 print(f"JSON parsing error in {consolidated_file}: {e}")
                 print("Attempting to create backup and recover...")
@@ -1942,52 +2424,58 @@ class FacebookScraper:
                     print(f"Could not backup corrupted file: {backup_error}")
                 
                 # Initialize with empty structure
-                self.existing_post_ids = set()
+                self.post_index.clear()
                 print("Initialized with empty post set - will scrape all posts")
                 
             except FileNotFoundError as e:
                 print(f"Could not load existing posts: {e}")
-                self.existing_post_ids = set()
+                self.post_index.clear()
         else:
             print("No existing master file found, will scrape all posts")
-            self.existing_post_ids = set()
+            self.post_index.clear()
+
+    def update_post_index(self, posts, session_info=None):
+        """Rebuild the post ID index from the posts just read from or written to the master file"""
+        try:
+            self.post_index.rebuild(posts, self.master_file, session_info)
+        except Exception as e:
+            print(f"⚠️  Could not update post index: {e}")
+            self.post_index.clear()
+
+    def find_archived_near_duplicate(self, sketch):
+        """ID of an archived near-duplicate of sketch, loading the archive index on first use"""
+        if not self.near_duplicates_ready:
+            self.near_duplicates_ready = True
+            index = self.near_duplicate_index
+            # An index without a sidecar path is in-memory only, with nothing to load
+            if index.path and not len(index) and not index.load() and os.path.exists(self.master_file):
+                with open(self.master_file, 'r', encoding='utf-8') as f:
+                    self.update_near_duplicate_index(json.load(f).get("posts", []))
+        return self.near_duplicate_index.find_similar(sketch)
+
+    def update_near_duplicate_index(self, posts):
+        """Bring the archive near-duplicate index in line with the master file posts"""
+        try:
+            # Start from the saved index unless it was already read (or found unusable)
+            if not self.near_duplicates_ready and not len(self.near_duplicate_index):
+                self.near_duplicate_index.load()
+            self.near_duplicates_ready = True
+            added = self.near_duplicate_index.sync(posts)
+            if added:
+                print(f"Indexed {added} posts for near-duplicate detection")
+            self.near_duplicate_index.save()
+        except Exception as e:
+            print(f"⚠️  Could not update near-duplicate index: {e}")
 
     def is_post_already_scraped(self, post_id):
         """Check if a post has already been scraped"""
-        return post_id in self.existing_post_ids
+        return post_id in self.post_index
     
     def is_content_similar(self, content1, content2, similarity_threshold=0.8):
-        """Check if two content strings are similar"""
+        """Check if two content strings are similar (Jaccard similarity of word shingles)"""
         if not content1 or not content2:
             return False
-            
-        # Normalize content for comparison
-        def normalize_content(text):
-            # Remove extra whitespace and convert to lowercase
-            text = re.sub(r'\s+', ' ', text.lower().strip())
-            # Remove punctuation for better comparison
-            text = re.sub(r'[^\w\s]', '', text)
-            return text
-        
-        norm_content1 = normalize_content(content1)
-        norm_content2 = normalize_content(content2)
-        
-        # If either content is too short, use exact match
-        if len(norm_content1) < 50 or len(norm_content2) < 50:
-            return norm_content1 == norm_content2
-        
-        # Use simple similarity: check if one is contained in the other
-        # or if they share significant common substrings
-        shorter = norm_content1 if len(norm_content1) < len(norm_content2) else norm_content2
-        longer = norm_content2 if shorter == norm_content1 else norm_content1
-        
-        # Check if the shorter content is mostly contained in the longer one
-        if len(shorter) > 0:
-            common_chars = sum(1 for c in shorter if c in longer)
-            similarity = common_chars / len(shorter)
-            return similarity >= similarity_threshold
-            
-        return False
+        return is_near_duplicate(content1, content2, similarity_threshold)
 
     def create_image_folder_structure(self, base_folder="images"):
         """Create organized folder structure for downloaded images"""
@@ -2029,7 +2517,200 @@ class FacebookScraper:
         return filename
         
 
-def main():
+def publish_static_api():
+    """Regenerate the static API files and start the GitHub Pages deployment"""
+    # Generate static API files
+    print("🏗️  Generating static API files...")
+    from generate_static_api import generate_static_api
+    generate_static_api()
+
+    # Auto-deploy to GitHub Pages
+    import subprocess
+    try:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        deploy_script = os.path.join(script_dir, 'auto_deploy.sh')
+        if os.path.exists(deploy_script):
+            print("Auto-deploying to GitHub Pages...")
+            result = subprocess.run([deploy_script], capture_output=True, text=True, cwd=script_dir)
+            if result.returncode == 0:
+                print("GitHub Pages deployment initiated")
+            else:
+                print(f"Deployment script output: {result.stdout}")
+                if result.stderr:
+                    print(f"Deployment error: {result.stderr}")
+    except Exception as e:
+        print(f"Auto-deployment failed: {e}")
+
+
+def run_scrape_job(scraper, notifier, start_time=None, runtime_checker=None, login=True, publish=True):
+    """One scraping run on an initialized scraper: login, scrape, save, publish and notify.
+
+    Scrapes scraper.page_url. With publish=False the static API is left for
+    the caller, which runs several pages and publishes once. Returns a
+    summary dict. Exceptions are left to the caller.
+    """
+    start_time = start_time or datetime.now()
+    last_run_file = "data/last_run.txt"
+
+    # Get initial post count for comparison (kept current by load_existing_posts)
+    initial_post_count = scraper.post_index.count()
+
+    # Count blocked requests from this job only (a daemon browser has earlier traffic logged)
+    scraper.resource_policy.collect(scraper.driver)
+    scraper.resource_policy.reset()
+
+    print(f"Starting {scraper.author_name} Facebook scraper...")
+    
+    # Login to Facebook (a warm daemon browser is already logged in)
+    if login:
+        print("Logging in to Facebook...")
+    if login and not scraper.login():
+        print("❌ Failed to login.")
+        print("🔧 Creating empty master file since login failed...")
+        
+        # Still create the master file even if login failed
+        empty_data = []  # Empty list for no posts
+        formatted_data = scraper.format_for_output()
+        master_filename = scraper.save_posts_consolidated(formatted_data)
+        
+        print(f"📄 Empty master file created at: {master_filename}")
+        notifier.notify_scraper_completed(success=False, errors="Login failed")
+        return {"success": False, "error": "Login failed"}
+        
+    # Update last run time
+    os.makedirs('data', exist_ok=True)
+    with open(last_run_file, 'w') as f:
+        f.write(start_time.isoformat())
+
+    # Scrape posts from the configured page
+    print(f"📄 Starting to scrape {scraper.author_name} Facebook page...")
+    posts = scraper.scrape_posts(scraper.page_url, runtime_checker=runtime_checker)
+
+    # Always format data, even if empty
+    print("📋 Formatting data with required fields...")
+    formatted_data = scraper.format_for_output()
+
+    if not posts:
+        print("⚠️  No posts were scraped.")
+        # Still save the empty data structure to create the master file
+        print("� Creating empty master file...")
+    else:
+        print(f"✅ Successfully scraped {len(posts)} posts.")
+
+    # Download images (False for now)
+    scraper.download_images(formatted_data)
+
+    # Save to consolidated master file (single growing file)
+    master_filename = scraper.save_posts_consolidated(formatted_data)
+
+    if publish:
+        publish_static_api()
+
+    # Calculate new posts found
+    final_post_count = len(formatted_data)
+    new_posts = final_post_count - initial_post_count
+    
+    # Send notifications based on results
+    if new_posts > 0:
+        print(f"🆕 Found {new_posts} new posts!")
+        notifier.notify_new_posts_detected(new_posts)
+        # Send success notification
+        notifier.notify_scraper_completed(
+            success=True, 
+            posts_found=final_post_count
+        )
+    else:
+        print("ℹ️  No new posts found this run")
+        # Still consider it a successful run, just no new content
+        notifier.notify_scraper_completed(
+            success=True, 
+            posts_found=final_post_count
+        )
+    
+    # Print summary
+    print(f"\n=== Scraping Summary ===")
+    print(f"Posts processed this session: {final_post_count}")
+    if new_posts > 0:
+        print(f"New posts found: {new_posts}")
+    else:
+        print("No new posts found this run (may have found existing posts)")
+    print(f"Parse cache: {scraper.parse_cache_hits} hits, {scraper.parse_cache_misses} misses")
+    if scraper.resource_policy.report:
+        scraper.resource_policy.collect(scraper.driver)
+        print(scraper.resource_policy.report_line())
+        scraper.resource_policy.save_baseline()
+    print(f"Master data file: {master_filename}")
+    print(f"Master file created/updated: {'✅' if os.path.exists(master_filename) else '❌'}")
+    
+    # Total posts from the post index, updated by save_posts_consolidated
+    try:
+        total_in_master = scraper.post_index.count()
+        print(f"Total posts in master file: {total_in_master}")
+    except Exception as e:
+        print(f"Could not read post index for total count: {e}")
+
+    # Print sample data
+    if len(formatted_data) > 0:
+        print(f"\n=== Sample Post ===")
+        sample = formatted_data[0]
+        print(f"ID: {sample['id']}")
+        print(f"Title: {sample['title']}")
+        print(f"Author: {sample['AuthorName']}")
+        if sample['description']:
+            print(f"Description: {sample['description']}")
+        if sample['content']:
+            print(f"Content: {sample['content'][:100]}...")
+
+        # Show attachment info
+        attachment = sample['attachment']
+        if attachment['images']:
+            print(f"Images found: {len(attachment['images'])}")
+        if attachment['videos']:
+            print(f"Videos found: {len(attachment['videos'])}")
+        if attachment['links']:
+            print(f"Links found: {len(attachment['links'])}")
+    else:
+        print("No valid posts found after formatting.")
+    
+    # Final verification that master file exists
+    master_file_path = scraper.master_file
+    if os.path.exists(master_file_path):
+        print(f"✅ Master file confirmed at: {master_file_path}")
+        file_size = os.path.getsize(master_file_path)
+        print(f"📊 File size: {file_size} bytes")
+    else:
+        print(f"❌ Master file not found at: {master_file_path}")
+        print("🔧 Attempting to create empty master file...")
+        try:
+            os.makedirs(os.path.dirname(master_file_path) or '.', exist_ok=True)
+            empty_data = {
+                "scraping_session": {
+                    "timestamp": datetime.now().isoformat(),
+                    "total_posts": 0,
+                    "new_posts_this_session": 0,
+                    "existing_posts": 0,
+                    "status": "emergency_creation"
+                },
+                "posts": []
+            }
+            with open(master_file_path, 'w', encoding='utf-8') as f:
+                json.dump(empty_data, f, indent=2, ensure_ascii=False)
+            print(f"✅ Emergency master file created at: {master_file_path}")
+        except Exception as create_error:
+            print(f"❌ Failed to create emergency master file: {create_error}")
+
+    result = {
+        "success": True,
+        "posts": final_post_count,
+        "new_posts": max(0, new_posts),
+        "master_file": master_filename,
+    }
+    if scraper.resource_policy.report:
+        result["resources"] = scraper.resource_policy.summary()
+    return result
+
+
+def main(config_file="config/config.json"):
     # Initialize notification system
     notifier = NotificationSystem()
     start_time = datetime.now()
@@ -2066,175 +2747,23 @@ def main():
     except FileNotFoundError:
         pass  # First run, continue
 
-    # Initialize scraper
-    scraper = FacebookScraper()
-    initial_post_count = 0
+    # Pages listed under "targets" are scraped together by the multi-page run
+    if read_config(config_file).get("targets"):
+        try:
+            from multi_scraper import MultiPageRun
+        except ImportError:
+            from src.multi_scraper import MultiPageRun
+        print("🗂️  Targets configured, running the multi-page scraper")
+        summary = MultiPageRun(config_file).run()
+        if summary["new_posts"]:
+            publish_static_api()
+        return
 
-    # Get initial post count for comparison
-    try:
-        with open('data/kuensel_posts_master.json', 'r') as f:
-            data = json.load(f)
-            initial_post_count = len(data.get('posts', []))
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Could not load initial post count: {e}")
-        initial_post_count = 0
+    # Initialize scraper
+    scraper = FacebookScraper(config_file)
 
     try:
-        print("Starting Kuensel Facebook scraper...")
-        
-        # Login to Facebook
-        print("Logging in to Facebook...")
-        if not scraper.login():
-            print("❌ Failed to login.")
-            print("🔧 Creating empty master file since login failed...")
-            
-            # Still create the master file even if login failed
-            empty_data = []  # Empty list for no posts
-            formatted_data = scraper.format_for_output()
-            master_filename = scraper.save_posts_consolidated(formatted_data)
-            
-            print(f"📄 Empty master file created at: {master_filename}")
-            notifier.notify_scraper_completed(success=False, errors="Login failed")
-            return
-            
-        # Update last run time
-        os.makedirs('data', exist_ok=True)
-        with open(last_run_file, 'w') as f:
-            f.write(current_time.isoformat())
-
-        # Scrape posts from Kuensel page
-        print("📄 Starting to scrape Kuensel Facebook page...")
-        # Fixed URL (removed extra spaces) with runtime checker
-        posts = scraper.scrape_posts("https://www.facebook.com/Kuensel", runtime_checker=check_runtime)
-
-        # Always format data, even if empty
-        print("📋 Formatting data with required fields...")
-        formatted_data = scraper.format_for_output()
-
-        if not posts:
-            print("⚠️  No posts were scraped.")
-            # Still save the empty data structure to create the master file
-            print("� Creating empty master file...")
-        else:
-            print(f"✅ Successfully scraped {len(posts)} posts.")
-
-        # Download images (False for now)
-        scraper.download_images(formatted_data)
-
-        # Save to consolidated master file (single growing file)
-        master_filename = scraper.save_posts_consolidated(formatted_data)
-
-        # Generate static API files
-        print("🏗️  Generating static API files...")
-        from generate_static_api import generate_static_api
-        generate_static_api()
-
-        # Auto-deploy to GitHub Pages
-        import subprocess
-        try:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            deploy_script = os.path.join(script_dir, 'auto_deploy.sh')
-            if os.path.exists(deploy_script):
-                print("Auto-deploying to GitHub Pages...")
-                result = subprocess.run([deploy_script], capture_output=True, text=True, cwd=script_dir)
-                if result.returncode == 0:
-                    print("GitHub Pages deployment initiated")
-                else:
-                    print(f"Deployment script output: {result.stdout}")
-                    if result.stderr:
-                        print(f"Deployment error: {result.stderr}")
-        except Exception as e:
-            print(f"Auto-deployment failed: {e}")
-
-        # Calculate new posts found
-        final_post_count = len(formatted_data)
-        new_posts = final_post_count - initial_post_count
-        
-        # Send notifications based on results
-        if new_posts > 0:
-            print(f"🆕 Found {new_posts} new posts!")
-            notifier.notify_new_posts_detected(new_posts)
-            # Send success notification
-            notifier.notify_scraper_completed(
-                success=True, 
-                posts_found=final_post_count
-            )
-        else:
-            print("ℹ️  No new posts found this run")
-            # Still consider it a successful run, just no new content
-            notifier.notify_scraper_completed(
-                success=True, 
-                posts_found=final_post_count
-            )
-        
-        # Print summary
-        print(f"\n=== Scraping Summary ===")
-        print(f"Posts processed this session: {final_post_count}")
-        if new_posts > 0:
-            print(f"New posts found: {new_posts}")
-        else:
-            print("No new posts found this run (may have found existing posts)")
-        print(f"Master data file: {master_filename}")
-        print(f"Master file created/updated: {'✅' if os.path.exists(master_filename) else '❌'}")
-        
-        # Try to get total posts from master file
-        try:
-            with open(master_filename, 'r', encoding='utf-8') as f:
-                master_data = json.load(f)
-                total_in_master = len(master_data.get('posts', []))
-                print(f"Total posts in master file: {total_in_master}")
-        except Exception as e:
-            print(f"Could not read master file for total count: {e}")
-
-        # Print sample data
-        if len(formatted_data) > 0:
-            print(f"\n=== Sample Post ===")
-            sample = formatted_data[0]
-            print(f"ID: {sample['id']}")
-            print(f"Title: {sample['title']}")
-            print(f"Author: {sample['AuthorName']}")
-            if sample['description']:
-                print(f"Description: {sample['description']}")
-            if sample['content']:
-                print(f"Content: {sample['content'][:100]}...")
-
-            # Show attachment info
-            attachment = sample['attachment']
-            if attachment['images']:
-                print(f"Images found: {len(attachment['images'])}")
-            if attachment['videos']:
-                print(f"Videos found: {len(attachment['videos'])}")
-            if attachment['links']:
-                print(f"Links found: {len(attachment['links'])}")
-        else:
-            print("No valid posts found after formatting.")
-        
-        # Final verification that master file exists
-        master_file_path = "data/kuensel_posts_master.json"
-        if os.path.exists(master_file_path):
-            print(f"✅ Master file confirmed at: {master_file_path}")
-            file_size = os.path.getsize(master_file_path)
-            print(f"📊 File size: {file_size} bytes")
-        else:
-            print(f"❌ Master file not found at: {master_file_path}")
-            print("🔧 Attempting to create empty master file...")
-            try:
-                os.makedirs('data', exist_ok=True)
-                empty_data = {
-                    "scraping_session": {
-                        "timestamp": datetime.now().isoformat(),
-                        "total_posts": 0,
-                        "new_posts_this_session": 0,
-                        "existing_posts": 0,
-                        "status": "emergency_creation"
-                    },
-                    "posts": []
-                }
-                with open(master_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(empty_data, f, indent=2, ensure_ascii=False)
-                print(f"✅ Emergency master file created at: {master_file_path}")
-            except Exception as create_error:
-                print(f"❌ Failed to create emergency master file: {create_error}")
+        run_scrape_job(scraper, notifier, start_time=start_time, runtime_checker=check_runtime)
 
     except Exception as e:
         error_msg = str(e)
@@ -2342,4 +2871,4 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Run the main scraper
-    main()
\ No newline at end of file
+    main(args.config)
\ No newline at end of file
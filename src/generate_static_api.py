@@ -7,14 +7,16 @@ import json
 import os
 from datetime import datetime
 
-def generate_posts_api():
-    """Generate clean posts.json API with all posts from the scraper"""
-    
-    # Load master data
-    master_file = 'data/kuensel_posts_master.json'
+try:
+    from page_targets import DEFAULT_CONFIG_FILE, load_targets, read_config
+except ImportError:
+    from src.page_targets import DEFAULT_CONFIG_FILE, load_targets, read_config
+
+def load_master_posts(master_file):
+    """(posts, scraping session) from a master file, or None if it doesn't exist"""
     if not os.path.exists(master_file):
         print(f"Master file not found: {master_file}")
-        return
+        return None
     
     with open(master_file, 'r') as f:
         master_data = json.load(f)
@@ -42,6 +44,27 @@ def generate_posts_api():
         # Fallback
         all_posts = master_data.get('posts', master_data.get('data', []))
         scraping_session = master_data.get('scraping_session', {})
+    return all_posts, scraping_session
+
+def generate_posts_api(targets):
+    """Generate clean posts.json API with all posts from every target's master file"""
+    
+    all_posts = []
+    post_authors = []  # Author of each post's page, for posts saved without one
+    scraping_session = None
+    for target in targets:
+        loaded = load_master_posts(target["master_file"])
+        if loaded is None:
+            continue
+        posts, session = loaded
+        print(f"{target['name']}: {len(posts)} posts in {target['master_file']}")
+        all_posts.extend(posts)
+        post_authors.extend([target["author_name"]] * len(posts))
+        # Report the most recent scrape across pages
+        if scraping_session is None or str(session.get('timestamp', '')) > str(scraping_session.get('timestamp', '')):
+            scraping_session = session
+    if scraping_session is None:
+        return
     
     # Include all posts (not just those with images)
     all_valid_posts = []
@@ -72,7 +95,7 @@ def generate_posts_api():
     }
     
     # Process all posts with clean structure
-    for post in all_valid_posts:
+    for post, author in zip(all_valid_posts, post_authors):
         attachment = post.get('attachment', {})
         has_images = len(attachment.get('images', [])) > 0
         clean_post = {
@@ -80,7 +103,7 @@ def generate_posts_api():
             "title": post.get('title', '').strip(),
             "content": post.get('content', post.get('description', '')).strip(),
             "category": post.get('categoryID', 'general'),
-            "author": post.get('AuthorName', 'Kuensel'),
+            "author": post.get('AuthorName', author),
             "created_at": post.get('createdAt'),
             "published_at": post.get('publishAt'),
             "has_images": has_images,
@@ -160,10 +183,8 @@ def clean_old_api_files():
     else:
         print("No redundant files to remove")
 
-def restore_master_file_format():
+def restore_master_file_format(master_file='data/kuensel_posts_master.json'):
     """Restore the proper scraper format to the master file if it got corrupted"""
-    master_file = 'data/kuensel_posts_master.json'
-    
     if not os.path.exists(master_file):
         print("Master file not found, nothing to restore")
         return
@@ -204,14 +225,16 @@ def restore_master_file_format():
     
     return False
 
-def generate_static_api():
+def generate_static_api(config_file=DEFAULT_CONFIG_FILE):
     """Main function called by the scraper to generate static API files"""
     print("Generating simplified static API (images only)...")
+    targets = load_targets(read_config(config_file))
     
     # First, try to restore master file format if needed
-    restore_master_file_format()
+    for target in targets:
+        restore_master_file_format(target["master_file"])
     
-    generate_posts_api()
+    generate_posts_api(targets)
     clean_old_api_files()
     print("API generation completed!")
 
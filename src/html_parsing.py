@@ -0,0 +1,92 @@
+"""
+HTML Parser Backends
+Selects the HTML parser used by the scraper and falls back to Python's built-in html.parser
+"""
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+DEFAULT_PARSER = "html.parser"
+PARSER_BACKENDS = ["html.parser", "lxml", "selectolax"]
+
+
+def resolve_parser_backend(name):
+    """Return the requested backend if it can be used, otherwise the best fallback"""
+    if not name or name == DEFAULT_PARSER:
+        return DEFAULT_PARSER
+
+    if name not in PARSER_BACKENDS:
+        print(f"⚠️  Unknown HTML parser '{name}', using {DEFAULT_PARSER}")
+        return DEFAULT_PARSER
+
+    if name == "selectolax" and not SELECTOLAX_AVAILABLE:
+        print("⚠️  selectolax is not installed, falling back to lxml/html.parser")
+        name = "lxml"
+
+    if name == "lxml" and not LXML_AVAILABLE:
+        print(f"⚠️  lxml is not installed, using {DEFAULT_PARSER}")
+        return DEFAULT_PARSER
+
+    return name
+
+
+def make_soup(markup, backend=DEFAULT_PARSER):
+    """Parse markup into a BeautifulSoup tree.
+
+    Post parsing relies on BeautifulSoup tree navigation, so the selectolax
+    backend uses the lxml tree builder here when it is available.
+    """
+    if backend in ("lxml", "selectolax") and LXML_AVAILABLE:
+        return BeautifulSoup(markup, 'lxml')
+    return BeautifulSoup(markup, 'html.parser')
+
+
+def parse_document(markup, backend=DEFAULT_PARSER):
+    """Parse markup for CSS-selector lookups (photo pages, article pages).
+
+    Returns an object with select()/select_one(); nodes expose get(),
+    get_text() and find_all() like BeautifulSoup tags do.
+    """
+    if backend == "selectolax" and SELECTOLAX_AVAILABLE:
+        return LexborNode(LexborHTMLParser(markup).root)
+    return make_soup(markup, backend)
+
+
+class LexborNode:
+    """Minimal BeautifulSoup-style wrapper around a selectolax lexbor node"""
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def name(self):
+        return self.node.tag
+
+    def select(self, selector):
+        # BeautifulSoup only matches descendants, lexbor includes the node itself
+        return [LexborNode(match) for match in self.node.css(selector) if match != self.node]
+
+    def select_one(self, selector):
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    def find_all(self, name):
+        return self.select(name)
+
+    def get(self, key, default=None):
+        value = self.node.attributes.get(key, default)
+        return default if value is None else value
+
+    def get_text(self, separator='', strip=False):
+        return self.node.text(deep=True, separator=separator, strip=strip)
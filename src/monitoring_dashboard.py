@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from post_monitor import PostMonitor
 from notification_system import NotificationSystem
 from historical_recovery import HistoricalPostRecovery
+from post_index import load_master_summary
 import subprocess
 
 class MonitoringDashboard:
@@ -70,23 +71,19 @@ class MonitoringDashboard:
     def get_posts_status(self):
         """Get posts database status"""
         try:
-            with open('data/kuensel_posts_master.json', 'r') as f:
-                data = json.load(f)
-            
-            posts = data.get('posts', [])
-            if not posts:
+            total, newest = load_master_summary('data/kuensel_posts_master.json')
+            if not total:
                 return {"total": 0, "error": "No posts found"}
             
-            # Get latest post date
+            # Get latest post date (the post index keeps the newest publishAt)
             latest_date = None
-            for post in posts:
-                if post.get('date'):
-                    try:
-                        post_date = datetime.strptime(post['date'], '%Y-%m-%d')
-                        if not latest_date or post_date > latest_date:
-                            latest_date = post_date
-                    except Exception:
-                        continue
+            if newest:
+                try:
+                    latest_date = datetime.fromisoformat(newest)
+                    if latest_date.tzinfo:
+                        latest_date = latest_date.astimezone().replace(tzinfo=None)
+                except ValueError:
+                    pass
             
             # Calculate freshness
             hours_since_latest = None
@@ -94,7 +91,7 @@ class MonitoringDashboard:
                 hours_since_latest = (datetime.now() - latest_date).total_seconds() / 3600
             
             return {
-                "total": len(posts),
+                "total": total,
                 "latest_date": latest_date.isoformat() if latest_date else None,
                 "hours_since_latest": round(hours_since_latest, 1) if hours_since_latest else None,
                 "freshness": "fresh" if hours_since_latest and hours_since_latest < 24 else "stale"
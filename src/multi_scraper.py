@@ -0,0 +1,254 @@
+"""
+Multi-Page Scraper
+Scrapes every Facebook page listed under "targets" in the config with a small pool of
+browsers. Each page keeps its own master file and indexes; one writer thread saves them
+
+Usage:
+    python src/multi_scraper.py [--config config/config.json] [--workers 2]
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+try:
+    from facebook_scrapper import FacebookScraper, publish_static_api
+    from notification_system import NotificationSystem
+    from page_targets import load_targets, read_config
+    from photo_cache import DEFAULT_CACHE_FILE as DEFAULT_PHOTO_CACHE_FILE, DEFAULT_TTL_DAYS, PhotoCache
+except ImportError:
+    from src.facebook_scrapper import FacebookScraper, publish_static_api
+    from src.notification_system import NotificationSystem
+    from src.page_targets import load_targets, read_config
+    from src.photo_cache import DEFAULT_CACHE_FILE as DEFAULT_PHOTO_CACHE_FILE, DEFAULT_TTL_DAYS, PhotoCache
+
+DEFAULT_WORKERS = 2
+MAX_RUNTIME = 720  # Whole run, all pages (same limit as a single-page run)
+
+
+class TargetScraper(FacebookScraper):
+    """FacebookScraper for one configured page, with its own master file and limits.
+
+    Chrome locks a profile directory, so worker N > 1 gets its own copy of
+    scraping.user_data_dir next to the configured one (worker 1 keeps it).
+    Session archives get the page name, so two recordings never share a file.
+    """
+
+    def __init__(self, target, config_file="config/config.json", worker_id=1):
+        self.target = target
+        self.worker_id = worker_id
+        super().__init__(config_file, start_driver=False)
+        self.page_url = target["url"]
+        self.author_id = target["name"]
+        self.author_name = target["author_name"]
+
+    def load_config(self, config_file):
+        config = super().load_config(config_file)
+        config.setdefault("output", {})["master_file"] = self.target["master_file"]
+        scraping = config.setdefault("scraping", {})
+        for key in ("target_count", "max_scrolls"):
+            if key in self.target:
+                scraping[key] = self.target[key]
+        if scraping.get("record_session"):
+            # Workers start recording in the same second, so each page gets its own archive
+            root, ext = os.path.splitext(scraping["record_session"])
+            scraping["record_session"] = f"{root}_{self.target['name']}{ext}"
+        if scraping.get("user_data_dir") and self.worker_id > 1:
+            scraping["user_data_dir"] = f"{os.path.normpath(scraping['user_data_dir'])}-worker-{self.worker_id}"
+        return config
+
+
+class MultiPageRun:
+    """One scheduled run over all targets.
+
+    Up to `workers` threads each own one browser and take pages from a
+    shared queue, so a slow page doesn't hold up the others. Workers only
+    scrape; finished pages go to a single writer thread that saves every
+    master file, so two saves never overlap. Browser launches and logins
+    are serialized because they write the shared driver and session files.
+    """
+
+    def __init__(self, config_file="config/config.json", workers=None):
+        self.config_file = config_file
+        self.notifier = NotificationSystem()
+        config = read_config(config_file)
+        self.targets = load_targets(config)
+        multi_cfg = config.get("multi_target", {})
+        self.workers = max(1, min(workers or multi_cfg.get("workers", DEFAULT_WORKERS), len(self.targets) or 1))
+        photo_cfg = config.get("photo_cache", {})
+        self.photo_cache = PhotoCache(photo_cfg.get("file", DEFAULT_PHOTO_CACHE_FILE),
+                                      photo_cfg.get("ttl_days", DEFAULT_TTL_DAYS))
+        self.pending = queue.Queue()
+        self.finished = queue.Queue()
+        self.browser_lock = threading.Lock()
+        self.reports = []
+        self.reports_lock = threading.Lock()
+        self.start_time = None
+
+    def runtime_exceeded(self):
+        if (datetime.now() - self.start_time).total_seconds() > MAX_RUNTIME:
+            print(f"⏰ Maximum runtime ({MAX_RUNTIME}s) exceeded. Stopping gracefully...")
+            return True
+        return False
+
+    def add_report(self, report):
+        with self.reports_lock:
+            self.reports.append(report)
+
+    def worker(self, worker_id):
+        browser = None  # This worker's driver, page waiter and resource policy
+        logged_in = False
+        try:
+            while not self.runtime_exceeded():
+                try:
+                    target = self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                report = {"worker": worker_id, "target": target["name"], "launch": 0.0, "login": 0.0,
+                          "scrape": 0.0, "save": 0.0, "posts": 0, "new_posts": 0, "error": None}
+                scraper = None
+                try:
+                    scraper = TargetScraper(target, self.config_file, worker_id)
+                    scraper.photo_cache = self.photo_cache
+                    if browser is None:
+                        started = time.time()
+                        with self.browser_lock:
+                            scraper.setup_driver()
+                        browser = SimpleNamespace(driver=scraper.driver, page_waiter=scraper.page_waiter,
+                                                  resource_policy=scraper.resource_policy)
+                        logged_in = False
+                        report["launch"] = time.time() - started
+                    else:
+                        scraper.attach_browser(browser)
+
+                    if not logged_in:
+                        started = time.time()
+                        with self.browser_lock:
+                            logged_in = scraper.login()
+                        report["login"] = time.time() - started
+                        if not logged_in:
+                            raise RuntimeError("Login failed")
+
+                    started = time.time()
+                    posts = scraper.scrape_posts(scraper.page_url, runtime_checker=self.runtime_exceeded)
+                    report["scrape"] = time.time() - started
+                    report["posts"] = len(posts)
+                    self.finished.put((scraper, scraper.format_for_output(), report))
+                    scraper = None  # The writer saves and closes it
+                except Exception as e:
+                    print(f"❌ Worker {worker_id} failed on {target['name']}: {e}")
+                    report["error"] = str(e)
+                    self.add_report(report)
+                    if browser is not None and not self.browser_alive(browser):
+                        self.quit_browser(browser)
+                        browser, logged_in = None, False
+                finally:
+                    if scraper is not None:
+                        scraper.driver = None  # The browser belongs to the worker
+                        scraper.close()
+        finally:
+            if browser is not None:
+                self.quit_browser(browser)
+
+    @staticmethod
+    def browser_alive(browser):
+        try:
+            browser.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def quit_browser(browser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            print(f"⚠️  Error closing browser: {e}")
+
+    def writer(self):
+        """Save finished pages one at a time, in the order they finish"""
+        while True:
+            item = self.finished.get()
+            if item is None:
+                return
+            scraper, formatted_data, report = item
+            started = time.time()
+            try:
+                before = scraper.post_index.count()
+                scraper.download_images(formatted_data)
+                scraper.save_posts_consolidated(formatted_data)
+                report["new_posts"] = max(0, scraper.post_index.count() - before)
+            except Exception as e:
+                print(f"❌ Could not save {report['target']}: {e}")
+                report["error"] = str(e)
+            finally:
+                report["save"] = time.time() - started
+                self.add_report(report)
+                # The browser belongs to the worker, which may be on its next page
+                scraper.driver = None
+                scraper.close()
+
+    def run(self):
+        self.start_time = datetime.now()
+        print(f"Scraping {len(self.targets)} pages with {self.workers} browser workers")
+        for target in self.targets:
+            self.pending.put(target)
+
+        writer = threading.Thread(target=self.writer, name="writer")
+        writer.start()
+        workers = [threading.Thread(target=self.worker, args=(i + 1,), name=f"worker-{i + 1}")
+                   for i in range(self.workers)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        self.finished.put(None)
+        writer.join()
+
+        skipped = []
+        while not self.pending.empty():
+            skipped.append(self.pending.get_nowait()["name"])
+        return self.summarize(skipped)
+
+    def summarize(self, skipped):
+        reports = sorted(self.reports, key=lambda r: (r["worker"], r["target"]))
+        total_new = sum(r["new_posts"] for r in reports)
+        total_posts = sum(r["posts"] for r in reports)
+        errors = [f"{r['target']}: {r['error']}" for r in reports if r["error"]]
+        elapsed = (datetime.now() - self.start_time).total_seconds()
+
+        print(f"\n=== Multi-page Summary ({elapsed:.1f}s) ===")
+        for r in reports:
+            status = f"❌ {r['error']}" if r["error"] else f"{r['posts']} posts ({r['new_posts']} new)"
+            print(f"worker {r['worker']}  {r['target']:<16} launch {r['launch']:5.1f}s  login {r['login']:5.1f}s  "
+                  f"scrape {r['scrape']:6.1f}s  save {r['save']:4.1f}s  {status}")
+        for name in skipped:
+            print(f"⏭️  {name} skipped (runtime limit)")
+
+        if total_new:
+            self.notifier.notify_new_posts_detected(total_new)
+        self.notifier.notify_scraper_completed(success=not errors, posts_found=total_posts,
+                                               errors="; ".join(errors) if errors else None)
+        return {"success": not errors, "posts": total_posts, "new_posts": total_new,
+                "elapsed": round(elapsed, 1), "pages": reports, "skipped": skipped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape every configured Facebook page concurrently')
+    parser.add_argument('--config',
+                        default='config/config.json',
+                        help='Path to config file (default: config/config.json)')
+    parser.add_argument('--workers', type=int, help=f'Browser workers (default: multi_target.workers or {DEFAULT_WORKERS})')
+    args = parser.parse_args()
+
+    summary = MultiPageRun(args.config, args.workers).run()
+    if summary["new_posts"]:
+        publish_static_api()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Near-Duplicate Index
+MinHash signatures with LSH banding for finding near-duplicate posts by word-shingle
+Jaccard similarity
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+from array import array
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SHINGLE_SIZE = 3          # Words per shingle
+NUM_PERM = 64             # MinHash permutations
+BANDS = 16                # LSH bands of NUM_PERM // BANDS rows each
+SIMILARITY_THRESHOLD = 0.8
+MIN_SHINGLE_TEXT = 50     # Shorter normalized texts only match exactly
+CANDIDATE_MARGIN = 0.15   # Signature agreement below threshold still verified exactly
+INDEX_VERSION = 2         # 2: shingle hashes are stored for exact verification
+
+_MAX_HASH = (1 << 32) - 1
+_DENSIFY_OFFSET = 0x9E3779B1
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+
+
+def normalize_content(text):
+    """Lowercase, collapse whitespace and drop punctuation"""
+    text = _WHITESPACE.sub(' ', text.lower().strip())
+    return _PUNCTUATION.sub('', text)
+
+
+def word_shingles(normalized, size=SHINGLE_SIZE):
+    """Set of consecutive word n-grams of normalized text"""
+    words = normalized.split()
+    if len(words) <= size:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard(shingles1, shingles2):
+    """Jaccard similarity of a shingle set and a set or sequence of distinct shingles"""
+    if not shingles1 or not shingles2:
+        return 0.0
+    common = len(shingles1.intersection(shingles2))
+    return common / (len(shingles1) + len(shingles2) - common)
+
+
+def is_near_duplicate(content1, content2, threshold=SIMILARITY_THRESHOLD):
+    """Exact Jaccard check over word shingles; short texts must match exactly"""
+    norm1 = normalize_content(content1)
+    norm2 = normalize_content(content2)
+    if len(norm1) < MIN_SHINGLE_TEXT or len(norm2) < MIN_SHINGLE_TEXT:
+        return norm1 == norm2
+    return jaccard(word_shingles(norm1), word_shingles(norm2)) >= threshold
+
+
+class MinHasher:
+    """One-permutation MinHash with rotation densification.
+
+    Each shingle is hashed once and only keeps the minimum within its bin,
+    so a signature costs one hash per shingle instead of one per shingle
+    per permutation. Empty bins borrow from the next non-empty bin.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        if num_perm & (num_perm - 1):
+            raise ValueError("num_perm must be a power of two")
+        self.num_perm = num_perm
+        self.bin_bits = num_perm.bit_length() - 1
+        self.salt = str(seed).encode()
+
+    def hash_shingles(self, shingles):
+        """Set of 64-bit shingle hashes; sketches keep these instead of the shingle strings"""
+        salt = self.salt
+        return {
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8, key=salt).digest(), 'big')
+            for shingle in shingles
+        }
+
+    def signature(self, shingle_hashes):
+        num_perm = self.num_perm
+        bin_mask = num_perm - 1
+        bin_bits = self.bin_bits
+        bins = [None] * num_perm
+        for h in shingle_hashes:
+            index = h & bin_mask
+            value = (h >> bin_bits) & _MAX_HASH
+            current = bins[index]
+            if current is None or value < current:
+                bins[index] = value
+
+        signature = array('I', bytes(4 * num_perm))
+        for index in range(num_perm):
+            distance = 0
+            source = index
+            while bins[source] is None:
+                distance += 1
+                source = (index + distance) & bin_mask
+            signature[index] = (bins[source] + distance * _DENSIFY_OFFSET) & _MAX_HASH
+        return signature
+
+
+DEFAULT_HASHER = MinHasher()
+
+
+class ContentSketch:
+    """Normalized form of one post's content, computed once and shared by the indexes"""
+
+    __slots__ = ("hasher", "digest", "shingles", "signature")
+
+    def __init__(self, content, hasher=DEFAULT_HASHER):
+        normalized = normalize_content(content)
+        self.hasher = hasher
+        if len(normalized) < MIN_SHINGLE_TEXT:
+            self.digest = hashlib.md5(normalized.encode()).hexdigest()
+            self.shingles = None
+            self.signature = None
+        else:
+            self.digest = None
+            self.shingles = hasher.hash_shingles(word_shingles(normalized))
+            self.signature = hasher.signature(self.shingles)
+
+
+class NearDuplicateIndex:
+    """MinHash + LSH index from post ID to content signature.
+
+    Candidates come from LSH band buckets, so a lookup only compares
+    against posts sharing at least one band instead of every post, and
+    each candidate is verified with exact Jaccard over the shingle hashes
+    stored with it. Texts too short to shingle are indexed by their exact
+    normalized form.
+    """
+
+    def __init__(self, path=None, threshold=SIMILARITY_THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+        self.path = path
+        self.threshold = threshold
+        self.hasher = DEFAULT_HASHER if num_perm == NUM_PERM else MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures = {}      # post ID -> MinHash signature
+        self.short_texts = {}     # post ID -> digest of short normalized text
+        self.short_lookup = {}    # digest -> post IDs
+        self.buckets = [{} for _ in range(bands)]
+        self.shingles = {}        # post ID -> shingle hashes (a sorted array once loaded from disk)
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.signatures) + len(self.short_texts)
+
+    def __contains__(self, post_id):
+        return post_id in self.signatures or post_id in self.short_texts
+
+    def band_keys(self, signature):
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def sketch(self, content):
+        """Sketch content for this index, reusing a sketch made with the same hasher"""
+        if isinstance(content, ContentSketch) and content.hasher is self.hasher:
+            return content
+        return ContentSketch(content, self.hasher)
+
+    def add(self, post_id, content):
+        """Index content (text or ContentSketch) under post_id, replacing any previous entry"""
+        if not post_id or not content:
+            return
+        self.remove(post_id)
+        sketch = self.sketch(content)
+        if sketch.digest is not None:
+            self._add_short(post_id, sketch.digest)
+        else:
+            self.shingles[post_id] = sketch.shingles
+            self._add_signature(post_id, sketch.signature)
+        self.dirty = True
+
+    def _add_short(self, post_id, digest):
+        self.short_texts[post_id] = digest
+        self.short_lookup.setdefault(digest, set()).add(post_id)
+
+    def _add_signature(self, post_id, signature):
+        self.signatures[post_id] = signature
+        for bucket, key in zip(self.buckets, self.band_keys(signature)):
+            bucket.setdefault(key, set()).add(post_id)
+
+    def remove(self, post_id):
+        signature = self.signatures.pop(post_id, None)
+        if signature is not None:
+            for bucket, key in zip(self.buckets, self.band_keys(signature)):
+                members = bucket.get(key)
+                if members:
+                    members.discard(post_id)
+                    if not members:
+                        del bucket[key]
+            self.dirty = True
+        digest = self.short_texts.pop(post_id, None)
+        if digest is not None:
+            self.short_lookup[digest].discard(post_id)
+            if not self.short_lookup[digest]:
+                del self.short_lookup[digest]
+            self.dirty = True
+        self.shingles.pop(post_id, None)
+
+    def find_similar(self, content):
+        """Return the ID of an indexed near-duplicate of content, or None"""
+        if not content:
+            return None
+        sketch = self.sketch(content)
+        if sketch.digest is not None:
+            matches = self.short_lookup.get(sketch.digest)
+            return min(matches) if matches else None
+
+        shingles = sketch.shingles
+        signature = sketch.signature
+        candidates = set()
+        for bucket, key in zip(self.buckets, self.band_keys(signature)):
+            members = bucket.get(key)
+            if members:
+                candidates |= members
+
+        best_id, best_similarity = None, self.threshold
+        for candidate in sorted(candidates):
+            similarity = jaccard(shingles, self.shingles[candidate])
+            if similarity >= best_similarity:
+                best_id, best_similarity = candidate, similarity
+        return best_id
+
+    def sync(self, posts):
+        """Make the index cover exactly these posts, hashing only the ones it is missing"""
+        wanted = {post.get("id"): post for post in posts if post.get("id") and post.get("content")}
+        for post_id in [post_id for post_id in list(self.signatures) + list(self.short_texts) if post_id not in wanted]:
+            self.remove(post_id)
+        added = 0
+        for post_id, post in wanted.items():
+            if post_id not in self:
+                self.add(post_id, post["content"])
+                added += 1
+        return added
+
+    def load(self):
+        """Load signatures saved by save(); returns False if there is no usable index file"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            signatures = data.get("signatures", {})
+            shingles = data.get("shingles", {})
+            if (data.get("version") != INDEX_VERSION or data.get("num_perm") != self.hasher.num_perm
+                    or data.get("bands") != self.bands or signatures.keys() - shingles.keys()):
+                print(f"⚠️  Near-duplicate index {self.path} has a different layout, rebuilding")
+                return False
+            for post_id, encoded in signatures.items():
+                self._add_signature(post_id, array('I', base64.b64decode(encoded)))
+                self.shingles[post_id] = array('Q', base64.b64decode(shingles[post_id]))
+            for post_id, digest in data.get("short_texts", {}).items():
+                self._add_short(post_id, digest)
+            self.dirty = False
+            return True
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load near-duplicate index {self.path}: {e}")
+            return False
+
+    def save(self):
+        """Write the index next to the master file if it changed"""
+        if not self.path or not self.dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "num_perm": self.hasher.num_perm,
+            "bands": self.bands,
+            "signatures": {
+                post_id: base64.b64encode(signature.tobytes()).decode('ascii')
+                for post_id, signature in self.signatures.items()
+            },
+            "shingles": {
+                post_id: base64.b64encode(array('Q', sorted(shingles)).tobytes()).decode('ascii')
+                for post_id, shingles in self.shingles.items()
+            },
+            "short_texts": self.short_texts,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = self.path + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_file, self.path)
+        self.dirty = False
+
+
+def index_path_for(master_file):
+    """Sidecar path of the near-duplicate index for a master file"""
+    return f"{os.path.splitext(master_file)[0]}.minhash.json"
+
+
+class SessionDuplicateIndex:
+    """Near-duplicate check over the posts accepted in one scraping session.
+
+    Signatures are rows of a NumPy matrix, so a candidate is compared with
+    every accepted post in one vectorized operation; rows that agree on
+    enough hashes are verified with exact Jaccard.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, hasher=DEFAULT_HASHER, capacity=256):
+        self.threshold = threshold
+        self.hasher = hasher
+        self.min_agreement = max(1, int((threshold - CANDIDATE_MARGIN) * hasher.num_perm))
+        self.matrix = np.empty((capacity, hasher.num_perm), dtype=np.uint32)
+        self.row_ids = []
+        self.row_shingles = []
+        self.short_lookup = {}    # digest -> first post ID
+
+    def __len__(self):
+        return len(self.row_ids) + len(self.short_lookup)
+
+    def sketch(self, content):
+        if isinstance(content, ContentSketch) and content.hasher is self.hasher:
+            return content
+        return ContentSketch(content, self.hasher)
+
+    def add(self, post_id, content):
+        if not post_id or not content:
+            return
+        sketch = self.sketch(content)
+        if sketch.digest is not None:
+            self.short_lookup.setdefault(sketch.digest, post_id)
+            return
+        row = len(self.row_ids)
+        if row == len(self.matrix):
+            grown = np.empty((2 * len(self.matrix), self.hasher.num_perm), dtype=np.uint32)
+            grown[:row] = self.matrix
+            self.matrix = grown
+        self.matrix[row] = np.frombuffer(sketch.signature, dtype=np.uint32)
+        self.row_ids.append(post_id)
+        self.row_shingles.append(sketch.shingles)
+
+    def find_similar(self, content):
+        """Return the ID of an accepted near-duplicate of content, or None"""
+        if not content:
+            return None
+        sketch = self.sketch(content)
+        if sketch.digest is not None:
+            return self.short_lookup.get(sketch.digest)
+        if not self.row_ids:
+            return None
+
+        signature = np.frombuffer(sketch.signature, dtype=np.uint32)
+        agreement = np.count_nonzero(self.matrix[:len(self.row_ids)] == signature, axis=1)
+        best_id, best_similarity = None, self.threshold
+        for row in np.flatnonzero(agreement >= self.min_agreement):
+            similarity = jaccard(sketch.shingles, self.row_shingles[row])
+            if similarity > best_similarity or (similarity == best_similarity and best_id is None):
+                best_id, best_similarity = self.row_ids[row], similarity
+        return best_id
+
+
+def new_session_index(threshold=SIMILARITY_THRESHOLD):
+    """In-session duplicate index: vectorized with NumPy, LSH buckets without it"""
+    if NUMPY_AVAILABLE:
+        return SessionDuplicateIndex(threshold)
+    return NearDuplicateIndex(threshold=threshold)
@@ -0,0 +1,48 @@
+"""
+Page Targets
+The Facebook pages listed under "targets" in the config, with their master files and
+author names. Kept free of Selenium so the scheduler and the static API can read it
+"""
+
+import json
+import os
+from urllib.parse import urlparse
+
+DEFAULT_CONFIG_FILE = "config/config.json"
+DEFAULT_TARGETS = [{"name": "kuensel", "url": "https://www.facebook.com/Kuensel"}]
+
+
+def master_file_for(name):
+    return f"data/{name}_posts_master.json"
+
+
+def author_name_for(target):
+    """Author shown on the page's posts: "author_name", else the page name from its URL"""
+    if target.get("author_name"):
+        return target["author_name"]
+    path = urlparse(target.get("url", "")).path.strip("/")
+    if path and "/" not in path and not path.endswith(".php"):
+        return path
+    return target["name"]
+
+
+def read_config(config_file=DEFAULT_CONFIG_FILE):
+    """Run-level settings; each scraper loads the full config itself"""
+    if not os.path.exists(config_file):
+        return {}
+    with open(config_file, 'r') as f:
+        return json.load(f)
+
+
+def load_targets(config):
+    """Targets from the config with defaults filled in; pages without a name or URL are skipped"""
+    targets = []
+    for target in config.get("targets") or DEFAULT_TARGETS:
+        if not target.get("name") or not target.get("url"):
+            print(f"⚠️  Skipping target without name or url: {target}")
+            continue
+        target = dict(target)
+        target.setdefault("master_file", master_file_for(target["name"]))
+        target.setdefault("author_name", author_name_for(target))
+        targets.append(target)
+    return targets
@@ -0,0 +1,144 @@
+"""
+Page Waits
+Waits on what the page is actually doing instead of sleeping: a MutationObserver counts
+feed units as they are added and fetch/XHR calls are counted while in flight
+"""
+
+import statistics
+import time
+
+FEED_UNIT_SELECTOR = "[role='article'], [data-pagelet*='FeedUnit']"
+
+# Idempotent: the observer lives on window and is installed again after each navigation
+INSTALL_OBSERVER_SCRIPT = """
+var unitSelector = arguments[0];
+if (window.__scraperWaits) {
+    return window.__scraperWaits.units;
+}
+var state = {units: 0, lastMutation: Date.now(), inflight: 0, lastNetwork: Date.now()};
+function isTopLevelUnit(el) {
+    return el.matches && el.matches(unitSelector) &&
+        (!el.parentElement || !el.parentElement.closest(unitSelector));
+}
+function countUnits(node) {
+    if (node.nodeType !== 1) {
+        return 0;
+    }
+    if (isTopLevelUnit(node)) {
+        return 1;
+    }
+    return Array.prototype.filter.call(node.querySelectorAll(unitSelector), isTopLevelUnit).length;
+}
+state.units = countUnits(document.body);
+new MutationObserver(function (mutations) {
+    state.lastMutation = Date.now();
+    mutations.forEach(function (mutation) {
+        Array.prototype.forEach.call(mutation.addedNodes, function (node) {
+            state.units += countUnits(node);
+        });
+    });
+}).observe(document.body, {childList: true, subtree: true, characterData: true});
+
+function started() { state.inflight += 1; state.lastNetwork = Date.now(); }
+function finished() { state.inflight = Math.max(0, state.inflight - 1); state.lastNetwork = Date.now(); }
+if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function () {
+        started();
+        return originalFetch.apply(this, arguments).finally(finished);
+    };
+}
+var originalSend = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.send = function () {
+    started();
+    this.addEventListener('loadend', finished);
+    return originalSend.apply(this, arguments);
+};
+window.__scraperWaits = state;
+return state.units;
+"""
+
+# Resolves when new units have appeared and the DOM has been quiet for quietMs, when the
+# DOM and network have both been idle for idleMs (nothing more is coming), or at the deadline.
+WAIT_SCRIPT = """
+var baseline = arguments[0], timeoutMs = arguments[1], quietMs = arguments[2], idleMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var state = window.__scraperWaits;
+var start = Date.now();
+if (!state) {
+    done({reason: 'no-observer', units: 0, waited: 0});
+    return;
+}
+(function poll() {
+    var now = Date.now();
+    var quietFor = now - Math.max(state.lastMutation, start);
+    var networkIdleFor = state.inflight === 0 ? now - Math.max(state.lastNetwork, start) : 0;
+    var reason = null;
+    if (baseline !== null && state.units > baseline && quietFor >= quietMs) {
+        reason = 'content';
+    } else if (quietFor >= idleMs && networkIdleFor >= idleMs) {
+        reason = 'idle';
+    } else if (now - start >= timeoutMs) {
+        reason = 'timeout';
+    }
+    if (reason) {
+        done({reason: reason, units: state.units, waited: now - start});
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+
+class PageWaiter:
+    """Event-driven replacement for fixed sleeps.
+
+    Every wait has a deadline (the old sleep length), so a page that
+    keeps changing is never waited on for longer than before. If the
+    observer cannot be installed, the waits fall back to sleeping.
+    """
+
+    def __init__(self, driver, quiet=0.3, idle=0.8):
+        self.driver = driver
+        self.quiet = quiet
+        self.idle = idle
+        self.durations = []  # Seconds spent in each wait_for_new_units call
+
+    def install(self):
+        """Start observing the current document; returns the feed unit count or None"""
+        try:
+            return self.driver.execute_script(INSTALL_OBSERVER_SCRIPT, FEED_UNIT_SELECTOR)
+        except Exception as e:
+            print(f"[DEBUG] Could not install page observer: {e}")
+            return None
+
+    def wait(self, baseline, timeout):
+        started = time.time()
+        # Keep within Selenium's async script timeout (30s by default)
+        timeout = min(timeout, 25)
+        try:
+            result = self.driver.execute_async_script(
+                WAIT_SCRIPT, baseline, int(timeout * 1000), int(self.quiet * 1000), int(self.idle * 1000))
+        except Exception as e:
+            print(f"[DEBUG] Page wait failed, sleeping instead: {e}")
+            result = None
+        if not result or result.get("reason") == "no-observer":
+            # Page navigated away or scripts are blocked: wait the old way
+            time.sleep(max(0, timeout - (time.time() - started)))
+            return {"reason": "sleep", "units": None, "waited": timeout}
+        result["waited"] = result.get("waited", 0) / 1000
+        return result
+
+    def wait_for_feed(self, timeout):
+        """After a navigation: wait until the feed has rendered and settled"""
+        self.install()
+        return self.wait(0, timeout)
+
+    def wait_for_new_units(self, baseline, timeout):
+        """After a scroll: return as soon as units beyond baseline have rendered"""
+        result = self.wait(baseline, timeout)
+        self.durations.append(result["waited"])
+        return result
+
+    def median_wait(self):
+        return statistics.median(self.durations) if self.durations else 0.0
@@ -0,0 +1,142 @@
+"""
+Photo Cache
+Full-size image URLs resolved from Facebook photo links, kept on disk by fbid so each
+photo page is opened once, plus a small pool of background tabs for the ones that aren't
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_CACHE_FILE = "data/photo_cache.json"
+DEFAULT_TTL_DAYS = 30
+EMPTY_TTL_DAYS = 1   # Photo pages that yielded no image are retried sooner
+DEFAULT_MAX_TABS = 3
+
+# The photo viewer renders client-side, so an interactive document isn't enough
+PHOTO_READY_CONDITION = "document.readyState === 'complete' || !!document.querySelector('img[src*=\"scontent\"]')"
+PHOTO_READY_SCRIPT = f"return {PHOTO_READY_CONDITION};"
+
+
+def photo_fbid(link):
+    """Normalized fbid of a /photo?fbid= style link, or None for other links"""
+    parsed = urlparse(link)
+    if parsed.netloc and not (parsed.netloc == "facebook.com" or parsed.netloc.endswith(".facebook.com")):
+        return None
+    values = parse_qs(parsed.query).get("fbid")
+    if not values:
+        return None
+    fbid = values[0].strip()
+    return fbid if fbid.isalnum() else None
+
+
+class PhotoCache:
+    """fbid -> resolved image URLs, with the time they were resolved.
+
+    Entries older than ttl_days are treated as missing (Facebook CDN URLs
+    are signed and eventually stop working); entries with no images expire
+    after EMPTY_TTL_DAYS. Expired entries are dropped on save.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, ttl_days=DEFAULT_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.entries = self.load()
+        self.dirty = False
+        self.lock = threading.Lock()  # One cache can be shared by several scrapers
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not read photo cache {self.path}: {e}")
+            return {}
+
+    def expired(self, entry, now=None):
+        ttl = self.ttl if entry.get("images") else EMPTY_TTL_DAYS * 86400
+        return (now or time.time()) - entry.get("resolved_at", 0) > ttl
+
+    def get(self, fbid):
+        """Cached image URLs for fbid, or None if it has to be resolved"""
+        entry = self.entries.get(fbid)
+        if entry is None or self.expired(entry):
+            return None
+        return entry.get("images", [])
+
+    def put(self, fbid, images):
+        with self.lock:
+            self.entries[fbid] = {"images": list(images), "resolved_at": time.time()}
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty or not self.path:
+                return
+            now = time.time()
+            self.entries = {fbid: entry for fbid, entry in self.entries.items() if not self.expired(entry, now)}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_file = self.path + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(temp_file, self.path)
+            self.dirty = False
+
+
+def load_in_tabs(driver, links, max_tabs=DEFAULT_MAX_TABS, timeout=5):
+    """Page source of each link, loaded max_tabs at a time in background tabs.
+
+    Tabs in a batch load in parallel; each one is read once it has loaded
+    or shows a CDN image, or when the batch deadline passes. Returns
+    {link: html or None} and leaves the driver on the tab it started on.
+    """
+    pages = {}
+    main_window = driver.current_window_handle
+    for start in range(0, len(links), max_tabs):
+        opened = []
+        for link in links[start:start + max_tabs]:
+            before = set(driver.window_handles)
+            try:
+                driver.execute_script("window.open(arguments[0], '_blank');", link)
+                new_handles = set(driver.window_handles) - before
+            except Exception as e:
+                print(f"⚠️ Could not open photo tab: {e}")
+                new_handles = set()
+            if new_handles:
+                opened.append((link, new_handles.pop()))
+            else:
+                pages[link] = None
+
+        deadline = time.time() + timeout
+        for link, handle in opened:
+            try:
+                driver.switch_to.window(handle)
+            except Exception as e:
+                print(f"⚠️ Could not switch to photo tab: {e}")
+                pages[link] = None
+                continue
+            try:
+                try:
+                    WebDriverWait(driver, max(0.1, deadline - time.time()), poll_frequency=0.1).until(
+                        lambda d: d.execute_script(PHOTO_READY_SCRIPT))
+                except Exception:
+                    print(f"Timeout reached for photo link, reading what has loaded: {link[:80]}")
+                pages[link] = driver.page_source
+            except Exception as e:
+                print(f"⚠️ Error processing photo link: {e}")
+                pages[link] = None
+            finally:
+                try:
+                    driver.close()
+                except Exception as close_e:
+                    print(f"Warning: Error closing tab: {close_e}")
+        driver.switch_to.window(main_window)
+    return pages
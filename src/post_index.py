@@ -0,0 +1,179 @@
+"""
+Post Index
+SQLite sidecar next to the master file with post IDs, content fingerprints and session
+metadata, so startup and dedup don't have to parse the whole master JSON
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+
+INDEX_VERSION = 2
+WHITESPACE = re.compile(r'\s+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    publish_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS posts_fingerprint ON posts (fingerprint);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def content_fingerprint(content):
+    """Canonical post fingerprint: first 200 characters of content, case and whitespace folded"""
+    key = WHITESPACE.sub(' ', (content or '').strip()[:200].lower()).strip()
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def file_digest(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def post_index_path_for(master_file):
+    """Sidecar path of the post index for a master file"""
+    return f"{os.path.splitext(master_file)[0]}.index.sqlite"
+
+
+class PostIndex:
+    """Post IDs, fingerprints and newest publish time of a master file.
+
+    The index records the size, mtime and SHA-1 of the master file it was
+    built from. If the master is changed by anything else (a cleanup script,
+    a git checkout), is_current() notices and the caller rebuilds it. The
+    database file is only created on the first rebuild.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = None
+
+    def connect(self, create=False):
+        if self.connection is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Shared with the daemon's job threads, which take turns
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def clear(self):
+        """Drop the index (its master file is gone)"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get_meta(self, key, default=None):
+        connection = self.connect()
+        if connection is None:
+            return default
+        row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def is_current(self, master_file):
+        """True if the index was built from the master file as it is on disk now"""
+        try:
+            if self.get_meta("version") != INDEX_VERSION or not os.path.exists(master_file):
+                return False
+            stat = os.stat(master_file)
+            if self.get_meta("master_stat") == [stat.st_size, stat.st_mtime_ns]:
+                return True
+            # Touched but maybe not changed (e.g. a fresh checkout): compare contents
+            if self.get_meta("master_sha1") != file_digest(master_file):
+                return False
+            with self.connection:
+                self.connection.execute("REPLACE INTO meta VALUES ('master_stat', ?)",
+                                        (json.dumps([stat.st_size, stat.st_mtime_ns]),))
+            return True
+        except (sqlite3.Error, OSError, ValueError) as e:
+            print(f"⚠️  Could not read post index {self.path}: {e}")
+            return False
+
+    def rebuild(self, posts, master_file, session_info=None):
+        """Replace the index contents with these posts in one transaction"""
+        connection = self.connect(create=True)
+        stat = os.stat(master_file)
+        newest = max((post.get("publishAt") or "" for post in posts), default="")
+        meta = {
+            "version": INDEX_VERSION,
+            "master_stat": [stat.st_size, stat.st_mtime_ns],
+            "master_sha1": file_digest(master_file),
+            "total_posts": len(posts),
+            "newest_publish_at": newest,
+            "scraping_session": session_info or {},
+        }
+        with connection:
+            connection.execute("DELETE FROM posts")
+            connection.executemany(
+                "INSERT OR REPLACE INTO posts VALUES (?, ?, ?)",
+                ((post["id"], content_fingerprint(post.get("content") or ""), post.get("publishAt") or "")
+                 for post in posts if post.get("id"))
+            )
+            connection.executemany("REPLACE INTO meta VALUES (?, ?)",
+                                   ((key, json.dumps(value)) for key, value in meta.items()))
+
+    def __contains__(self, post_id):
+        connection = self.connect()
+        if connection is None:
+            return False
+        return connection.execute("SELECT 1 FROM posts WHERE id = ?", (post_id,)).fetchone() is not None
+
+    def has_fingerprint(self, fingerprint):
+        connection = self.connect()
+        if connection is None:
+            return False
+        return connection.execute("SELECT 1 FROM posts WHERE fingerprint = ? LIMIT 1",
+                                  (fingerprint,)).fetchone() is not None
+
+    def count(self):
+        return self.get_meta("total_posts", 0)
+
+    def newest_publish_at(self):
+        return self.get_meta("newest_publish_at", "")
+
+    def session_info(self):
+        return self.get_meta("scraping_session", {})
+
+
+def load_session_info(master_file):
+    """scraping_session block of the master file, read from the index when it is current"""
+    index = PostIndex(post_index_path_for(master_file))
+    try:
+        if index.is_current(master_file):
+            return index.session_info()
+    finally:
+        index.close()
+    with open(master_file, 'r', encoding='utf-8') as f:
+        return json.load(f).get("scraping_session", {})
+
+
+def load_master_summary(master_file):
+    """(total posts, newest publishAt) of the master file, read from the index when it is current"""
+    index = PostIndex(post_index_path_for(master_file))
+    try:
+        if index.is_current(master_file):
+            return index.count(), index.newest_publish_at()
+    finally:
+        index.close()
+    with open(master_file, 'r', encoding='utf-8') as f:
+        posts = json.load(f).get("posts", [])
+    return len(posts), max((post.get("publishAt") or "" for post in posts), default="")
@@ -0,0 +1,187 @@
+"""
+Single-Pass Post Visitor
+Walks a post element once and collects every raw field the scraper needs
+"""
+
+from html import escape
+
+import soupsieve
+from bs4 import BeautifulSoup, CData, NavigableString
+try:
+    from html_parsing import make_soup
+except ImportError:
+    from src.html_parsing import make_soup
+
+
+class PostFieldVisitor:
+    """Collects content candidates, links, media and engagement text in one walk.
+
+    Selectors are compiled once. Each node of the post subtree is visited a
+    single time and matched against them, instead of running a separate
+    select()/find_all() pass per selector. The returned record has the same
+    shape as the ones built by EXTRACT_POST_FIELDS_SCRIPT.
+    """
+
+    def __init__(self, content_selectors, author_selectors, image_data_attrs, fb_image_selectors):
+        self.content_matchers = [soupsieve.compile(selector) for selector in content_selectors]
+        self.author_matchers = [soupsieve.compile(selector) for selector in author_selectors]
+        self.image_data_attrs = list(image_data_attrs)
+        self.fb_image_matchers = [soupsieve.compile(selector) for selector in fb_image_selectors]
+
+    @staticmethod
+    def in_nested_article(node, root):
+        """True if node sits in a [role=article] below root (a shared or embedded story)"""
+        for parent in node.parents:
+            if parent is root:
+                return False
+            if parent.get('role') == 'article':
+                return True
+        return False
+
+    def visit(self, post_element, collect_content=True):
+        """Walk post_element once and return its raw field record"""
+        string_types = getattr(post_element, "interesting_string_types", None) or (NavigableString, CData)
+
+        content_matches = [[] for _ in self.content_matchers]
+        author_elements = [None] * len(self.author_matchers)
+        time_elem = None
+        all_strings = []
+        stripped_strings = []
+        hrefs = []
+        imgs = []
+        data_attr_values = {attr: [] for attr in self.image_data_attrs}
+        styles = []
+        srcsets = []
+        fb_matches = [[] for _ in self.fb_image_matchers]
+        videos = []
+        video_urls = []
+        data_ft = [post_element['data-ft']] if post_element.has_attr('data-ft') else []
+
+        for node in post_element.descendants:
+            if isinstance(node, NavigableString):
+                # Same string filtering as Tag.get_text()
+                if isinstance(string_types, type):
+                    if type(node) is not string_types:
+                        continue
+                elif type(node) not in string_types:
+                    continue
+                all_strings.append(node)
+                stripped = node.strip()
+                if stripped:
+                    stripped_strings.append(stripped)
+                continue
+
+            name = node.name
+            attrs = node.attrs
+
+            if collect_content:
+                for i, matcher in enumerate(self.content_matchers):
+                    if matcher.match(node):
+                        content_matches[i].append(node)
+
+            for i, matcher in enumerate(self.author_matchers):
+                if author_elements[i] is None and matcher.match(node):
+                    author_elements[i] = node
+
+            if name == 'time' and time_elem is None:
+                time_elem = node
+            elif name == 'a' and 'href' in attrs:
+                hrefs.append(node.get('href', ''))
+            elif name == 'img':
+                imgs.append([node.get('src', ''), node.get('alt', '')])
+            elif name == 'video':
+                videos.append(node.get('src', ''))
+
+            for attr in self.image_data_attrs:
+                if attr in attrs:
+                    data_attr_values[attr].append([attr, node.get(attr, '')])
+            if 'style' in attrs:
+                styles.append(node.get('style', ''))
+            if 'srcset' in attrs:
+                srcsets.append(node.get('srcset', ''))
+            if 'data-video-url' in attrs:
+                video_urls.append(node.get('data-video-url', ''))
+            if name == 'a' and 'data-ft' in attrs and not self.in_nested_article(node, post_element):
+                data_ft.append(node.get('data-ft', ''))
+
+            for i, matcher in enumerate(self.fb_image_matchers):
+                if matcher.match(node):
+                    if name == 'img':
+                        fb_matches[i].append(['img', node.get('src', '')])
+                    elif name == 'div':
+                        fb_matches[i].append(['div', node.get('style', '')])
+                    elif name == 'a':
+                        img_in_link = node.find('img')
+                        fb_matches[i].append(['a', node.get('href', ''), img_in_link.get('src', '') if img_in_link else None])
+
+        timestamp = ""
+        if time_elem:
+            timestamp = time_elem.get('datetime', '') or time_elem.get_text(strip=True)
+
+        return {
+            # Selector-major order, matching one select() call per selector
+            "content_candidates": [
+                elem.get_text(strip=True, separator=' ')
+                for matches in content_matches
+                for elem in matches
+            ],
+            "raw_text": ' '.join(stripped_strings),
+            "timestamp": timestamp,
+            "author_texts": [elem.get_text(strip=True) if elem else None for elem in author_elements],
+            "all_text": ''.join(all_strings),
+            "hrefs": hrefs,
+            "data_ft": data_ft,
+            "media": {
+                "img": imgs,
+                "data_attrs": [value for attr in self.image_data_attrs for value in data_attr_values[attr]],
+                "styles": styles,
+                "srcsets": srcsets,
+                "fb_matches": [match for matches in fb_matches for match in matches],
+                "videos": videos,
+                "video_urls": video_urls
+            }
+        }
+
+
+def serialize_with_ancestors(element, markup=None):
+    """Serialize element wrapped in empty copies of its ancestors.
+
+    Content and author selectors use descendant combinators, so a worker
+    needs the ancestor chain to match them the same way the full document
+    does. Returns (markup, path) where path lists the tag names from the
+    outermost wrapper down to the element itself.
+    """
+    if markup is None:
+        markup = str(element)
+    ancestors = [parent for parent in element.parents if not isinstance(parent, BeautifulSoup)]
+    ancestors.reverse()
+    opening = []
+    closing = []
+    for parent in ancestors:
+        attrs = "".join(
+            f' {key}="{escape(" ".join(value) if isinstance(value, list) else str(value))}"'
+            for key, value in parent.attrs.items()
+        )
+        opening.append(f"<{parent.name}{attrs}>")
+        closing.append(f"</{parent.name}>")
+    path = [parent.name for parent in ancestors] + [element.name]
+    return "".join(opening) + markup + "".join(reversed(closing)), path
+
+
+_worker_visitor = None
+
+
+def init_parse_worker(content_selectors, author_selectors, image_data_attrs, fb_image_selectors):
+    """Process pool initializer: compile the selectors once per worker"""
+    global _worker_visitor
+    _worker_visitor = PostFieldVisitor(content_selectors, author_selectors, image_data_attrs, fb_image_selectors)
+
+
+def visit_fragment(markup, path, collect_content, parser_backend):
+    """Parse a serialized post in a worker process and return its raw field record"""
+    node = make_soup(markup, parser_backend)
+    # Wrappers are empty, so the first match of each name is the next link in
+    # the chain (this also skips html/body added by the lxml tree builder)
+    for name in path:
+        node = node.find(name)
+    return _worker_visitor.visit(node, collect_content=collect_content)
@@ -0,0 +1,208 @@
+"""
+Resource Policy
+Stops the scraping browser from downloading images, video, fonts and tracking beacons.
+The elements and their src URLs stay in the DOM, which is all the scraper reads
+"""
+
+import json
+import os
+from fnmatch import fnmatchcase
+
+# Chrome's Network.setBlockedURLs patterns ('*' wildcards), checked in this order
+CATEGORY_PATTERNS = {
+    "tracking": [
+        "*facebook.com/tr?*", "*facebook.com/tr/*", "*/ajax/bz*", "*/ajax/bnzai*",
+        "*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+    ],
+    "media": ["*.mp4*", "*.webm*", "*.m4a*", "*.m3u8*", "*video*.fbcdn.net/*"],
+    "font": ["*.woff2*", "*.woff*", "*.ttf*", "*.otf*"],
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.ico*"],
+}
+DEFAULT_BLOCK = ["image", "media", "font", "tracking"]
+
+# Chrome's resource types for requests the URL patterns don't explain
+RESOURCE_TYPES = {"Image": "image", "Media": "media", "Font": "font", "Ping": "tracking"}
+
+# Blocked requests are never downloaded, so their size comes from a baseline run with
+# nothing blocked (see ResourcePolicy.save_baseline). Until one has been measured, typical
+# feed traffic is assumed: a feed photo, a few seconds of preview video, a web font, a beacon
+ESTIMATED_BYTES = {"image": 80_000, "media": 600_000, "font": 40_000, "tracking": 500, "other": 10_000}
+DEFAULT_BASELINE_FILE = "data/resource_baseline.json"
+
+# loadingFailed.blockedReason for requests dropped by the blocklist
+BLOCKED_BY_POLICY = "inspector"
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+
+class ResourcePolicy:
+    """Blocks resource categories through the browser backend and counts what was blocked.
+
+    With report enabled, the backend's network events (Chrome's performance
+    log under Selenium) are read to count blocked requests per category and
+    the bytes that were actually transferred. Bytes saved is the blocked count
+    times each category's bytes per request, as measured by a baseline run
+    ("baseline": true blocks nothing and records encodedDataLength per
+    category), else ESTIMATED_BYTES.
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.block = [c for c in config.get("block", DEFAULT_BLOCK) if c in CATEGORY_PATTERNS]
+        self.extra_patterns = list(config.get("extra_patterns", []))
+        self.baseline = config.get("baseline", False)
+        if self.baseline:
+            self.block, self.extra_patterns = [], []
+        self.baseline_file = config.get("baseline_file", DEFAULT_BASELINE_FILE)
+        self.report = config.get("report", True) and (bool(self.patterns) or self.baseline)
+        self.requests = {}  # requestId -> (url, resource type) until it finishes
+        self.reset()
+
+    @property
+    def patterns(self):
+        patterns = [p for category in self.block for p in CATEGORY_PATTERNS[category]]
+        return patterns + self.extra_patterns
+
+    def reset(self):
+        self.blocked = {}
+        self.loaded = {}  # category -> [requests, encoded bytes]
+        self.transferred_bytes = 0
+        self.finished_requests = 0
+
+    def configure_options(self, chrome_options):
+        """Turn on Chrome's performance log (needed for the report) before launch"""
+        if self.report:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def apply(self, driver):
+        """Install the blocklist on the browser backend"""
+        if self.baseline and self.report:
+            print(f"Resource baseline run: nothing blocked, request sizes go to {self.baseline_file}")
+        if not self.patterns:
+            return False
+        try:
+            applied = driver.block_urls(self.patterns)
+        except Exception as e:
+            print(f"⚠️  Could not apply resource policy: {e}")
+            applied = False
+        if not applied:
+            self.report = False
+            return False
+        print(f"Blocking {', '.join(self.block) or 'custom'} requests ({len(self.patterns)} URL patterns)")
+        return True
+
+    def categorize(self, url, resource_type=None):
+        for category in (CATEGORY_PATTERNS if self.baseline else self.block):
+            if any(fnmatchcase(url, pattern) for pattern in CATEGORY_PATTERNS[category]):
+                return category
+        return RESOURCE_TYPES.get(resource_type, "other")
+
+    def collect(self, driver):
+        """Count the network events the backend has seen since the last call"""
+        if not self.report:
+            return
+        try:
+            events = driver.network_events()
+        except Exception as e:
+            print(f"[DEBUG] Network events unavailable, disabling resource report: {e}")
+            self.report = False
+            return
+        if len(self.requests) > 10000:
+            self.requests.clear()  # Requests that never reported back (cache hits, redirects)
+        for message in events:
+            method = message.get("method")
+            params = message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                self.requests[request_id] = (params.get("request", {}).get("url", ""), params.get("type"))
+            elif method == "Network.loadingFinished":
+                url, resource_type = self.requests.pop(request_id, ("", None))
+                size = params.get("encodedDataLength", 0)
+                self.transferred_bytes += size
+                self.finished_requests += 1
+                loaded = self.loaded.setdefault(self.categorize(url, resource_type), [0, 0])
+                loaded[0] += 1
+                loaded[1] += size
+            elif method == "Network.loadingFailed":
+                url, resource_type = self.requests.pop(request_id, ("", params.get("type")))
+                if params.get("blockedReason") == BLOCKED_BY_POLICY:
+                    category = self.categorize(url, resource_type)
+                    self.blocked[category] = self.blocked.get(category, 0) + 1
+
+    def load_baseline(self):
+        """Measured bytes per request by category from the baseline file; {} if none"""
+        if not self.baseline_file or not os.path.exists(self.baseline_file):
+            return {}
+        try:
+            with open(self.baseline_file, 'r', encoding='utf-8') as f:
+                measured = json.load(f)
+            return {category: entry["bytes"] / entry["requests"]
+                    for category, entry in measured.items() if entry.get("requests")}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️  Could not read resource baseline {self.baseline_file}: {e}")
+            return {}
+
+    def save_baseline(self):
+        """Record this run's requests and encoded bytes per category; categories it
+        didn't load keep their earlier measurement"""
+        if not self.baseline or not self.baseline_file or not self.loaded:
+            return
+        measured = {}
+        if os.path.exists(self.baseline_file):
+            try:
+                with open(self.baseline_file, 'r', encoding='utf-8') as f:
+                    measured = json.load(f)
+            except (OSError, ValueError):
+                measured = {}
+        for category, (requests, size) in self.loaded.items():
+            measured[category] = {"requests": requests, "bytes": size}
+        directory = os.path.dirname(self.baseline_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = self.baseline_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(measured, f, indent=2, sort_keys=True)
+        os.replace(temp_file, self.baseline_file)
+        print(f"Resource baseline saved to {self.baseline_file}")
+
+    def summary(self):
+        measured = self.load_baseline() if self.blocked else {}
+        saved = sum(measured.get(category, ESTIMATED_BYTES.get(category, ESTIMATED_BYTES["other"])) * count
+                    for category, count in self.blocked.items())
+        return {
+            "blocked_requests": dict(self.blocked),
+            "estimated_bytes_saved": round(saved),
+            # Categories whose bytes per request were measured by a baseline run; the rest are assumed
+            "measured_categories": sorted(category for category in self.blocked if category in measured),
+            "loaded_requests": {category: {"requests": requests, "bytes": size}
+                                for category, (requests, size) in self.loaded.items()},
+            "transferred_bytes": self.transferred_bytes,
+            "finished_requests": self.finished_requests,
+        }
+
+    def report_line(self):
+        summary = self.summary()
+        transferred = (f"transferred {format_bytes(summary['transferred_bytes'])} "
+                       f"in {summary['finished_requests']} requests")
+        if self.baseline:
+            loaded = ", ".join(f"{entry['requests']} {category} ({format_bytes(entry['bytes'])})"
+                               for category, entry in sorted(summary["loaded_requests"].items()))
+            return f"Resource baseline (nothing blocked): loaded {loaded or 'nothing'}; {transferred}"
+        blocked = ", ".join(f"{count} {category}" for category, count in sorted(summary["blocked_requests"].items()))
+        if not blocked:
+            return f"Resource policy: blocked nothing; {transferred}"
+        assumed = sorted(set(summary["blocked_requests"]) - set(summary["measured_categories"]))
+        if not assumed:
+            basis = "estimated at measured baseline sizes"
+        elif summary["measured_categories"]:
+            basis = f"estimated at measured baseline sizes, typical sizes assumed for {', '.join(assumed)}"
+        else:
+            basis = "estimated at typical sizes, no baseline measured"
+        return (f"Resource policy: blocked {blocked} "
+                f"(~{format_bytes(summary['estimated_bytes_saved'])} saved, {basis}); {transferred}")
@@ -0,0 +1,370 @@
+"""
+Scraper Daemon
+Keeps a FacebookScraper for each configured page and their one logged-in browser warm
+between scheduled runs and takes scrape jobs over a local socket
+
+Usage:
+    python src/scraper_daemon.py [--config config/config.json]
+    python src/scraper_daemon.py --health | --scrape | --shutdown
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from multiprocessing.connection import Client, Listener
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+DEFAULT_ADDRESS = "data/scraper_daemon.sock"
+DEFAULT_MAX_JOBS = 20          # Relaunch the browser after this many jobs
+DEFAULT_MAX_MEMORY_MB = 1500   # ... or once daemon + browser RSS passes this
+JOB_MAX_RUNTIME = 720          # Same limit as a one-shot run of facebook_scrapper.py
+
+
+def process_rss_mb(pid):
+    """Resident memory of a process in MB, or None if it can't be read"""
+    if PSUTIL_AVAILABLE:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def child_pids(pid):
+    """All descendants of a process (Chrome runs as a tree under chromedriver)"""
+    if PSUTIL_AVAILABLE:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    parents = {}
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                # Field 4 is the parent PID; the command name in field 2 may contain spaces
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(parent, []).append(int(entry))
+    descendants, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            descendants.append(child)
+            stack.append(child)
+    return descendants
+
+
+def send_request(message, address=DEFAULT_ADDRESS, timeout=10):
+    """Send one request to a running daemon and return its reply, or None if it is not reachable"""
+    if not os.path.exists(address):
+        return None
+    try:
+        with Client(address) as conn:
+            conn.send(message)
+            if not conn.poll(timeout):
+                return {"status": "timeout"}
+            return conn.recv()
+    except (OSError, EOFError) as e:
+        print(f"⚠️  Scraper daemon not reachable at {address}: {e}")
+        return None
+
+
+class ScraperDaemon:
+    """Serves health, scrape and shutdown requests with long-lived scrapers.
+
+    Jobs run one at a time. A job scrapes every page listed under "targets"
+    in turn on the same browser (or the Kuensel page when none are listed)
+    and publishes the static API once at the end. Between jobs the browser is parked on
+    about:blank instead of being relaunched, and it is recycled after
+    max_jobs jobs, when memory passes max_memory_mb, or when it stops
+    responding.
+    """
+
+    def __init__(self, config_file="config/config.json"):
+        # Imported here so that clients (the scheduler) don't load Selenium
+        try:
+            from facebook_scrapper import FacebookScraper, publish_static_api, run_scrape_job
+            from multi_scraper import TargetScraper
+            from notification_system import NotificationSystem
+            from page_targets import load_targets, read_config
+        except ImportError:
+            from src.facebook_scrapper import FacebookScraper, publish_static_api, run_scrape_job
+            from src.multi_scraper import TargetScraper
+            from src.notification_system import NotificationSystem
+            from src.page_targets import load_targets, read_config
+
+        self.run_scrape_job = run_scrape_job
+        self.publish_static_api = publish_static_api
+        config = read_config(config_file)
+        targets = load_targets(config) if config.get("targets") else []
+        if targets:
+            self.scrapers = [TargetScraper(target, config_file) for target in targets]
+            self.scrapers[0].setup_driver()
+        else:
+            self.scrapers = [FacebookScraper(config_file)]
+        self.scraper = self.scrapers[0]  # Owns the browser the other pages share
+        self.attach_pages()
+        self.notifier = NotificationSystem()
+        daemon_cfg = self.scraper.config.get("daemon", {})
+        self.address = daemon_cfg.get("address", DEFAULT_ADDRESS)
+        self.max_jobs = daemon_cfg.get("max_jobs_per_browser", DEFAULT_MAX_JOBS)
+        self.max_memory_mb = daemon_cfg.get("max_memory_mb", DEFAULT_MAX_MEMORY_MB)
+
+        self.started_at = time.time()
+        self.logged_in = False
+        self.jobs_total = 0
+        self.jobs_since_launch = 0
+        self.browser_launches = 1
+        self.last_job = None
+        self.job_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.listener = None
+
+    def memory_mb(self):
+        """RSS of the daemon plus the browser backend's processes and everything under them"""
+        total = process_rss_mb(os.getpid()) or 0.0
+        for root in self.scraper.driver.browser_pids() if self.scraper.driver else []:
+            for pid in [root] + child_pids(root):
+                total += process_rss_mb(pid) or 0.0
+        return total
+
+    def browser_alive(self):
+        try:
+            self.scraper.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def recycle_browser(self, reason):
+        print(f"♻️  Recycling browser: {reason}")
+        try:
+            if self.scraper.driver:
+                self.scraper.driver.quit()
+        except Exception as e:
+            print(f"⚠️  Error closing browser: {e}")
+        self.scraper.driver = None
+        self.scraper.setup_driver()
+        self.attach_pages()
+        self.logged_in = False
+        self.jobs_since_launch = 0
+        self.browser_launches += 1
+
+    def health(self):
+        status = {
+            "status": "ok",
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at),
+            "jobs_total": self.jobs_total,
+            "jobs_since_launch": self.jobs_since_launch,
+            "browser_launches": self.browser_launches,
+            "logged_in": self.logged_in,
+            "last_job": self.last_job,
+        }
+        # The WebDriver isn't thread-safe, so only probe it between jobs
+        if self.job_lock.acquire(blocking=False):
+            try:
+                status["browser_alive"] = self.browser_alive()
+                status["memory_mb"] = round(self.memory_mb())
+            finally:
+                self.job_lock.release()
+            if not status["browser_alive"]:
+                status["status"] = "degraded"
+        else:
+            status["status"] = "busy"
+        return status
+
+    def run_job(self):
+        with self.job_lock:
+            if not self.browser_alive():
+                self.recycle_browser("browser not responding")
+
+            start_time = datetime.now()
+
+            def check_runtime():
+                elapsed = (datetime.now() - start_time).total_seconds()
+                if elapsed > JOB_MAX_RUNTIME:
+                    print(f"⏰ Maximum runtime ({JOB_MAX_RUNTIME}s) exceeded. Stopping gracefully...")
+                    return True
+                return False
+
+            results = []
+            for scraper in self.scrapers:
+                if results and check_runtime():
+                    results.append({"success": False, "error": f"{scraper.page_url} skipped (runtime limit)"})
+                    continue
+                try:
+                    # Pick up edits made to the master file since the last job
+                    scraper.load_existing_posts()
+                    page_result = self.run_scrape_job(scraper, self.notifier, start_time=start_time,
+                                                      runtime_checker=check_runtime, login=not self.logged_in,
+                                                      publish=False)
+                    if page_result.get("success"):
+                        self.logged_in = True
+                except Exception as e:
+                    print(f"An error occurred on {scraper.page_url}: {e}")
+                    self.notifier.notify_scraper_completed(success=False, errors=str(e))
+                    page_result = {"success": False, "error": str(e)}
+                results.append(page_result)
+
+            if any(page_result.get("success") for page_result in results):
+                try:
+                    self.publish_static_api()
+                except Exception as e:
+                    print(f"⚠️  Could not publish static API: {e}")
+            result = results[0] if len(results) == 1 else self.combine_results(results)
+
+            self.jobs_total += 1
+            self.jobs_since_launch += 1
+            result["duration"] = round((datetime.now() - start_time).total_seconds(), 1)
+            self.last_job = {"finished_at": datetime.now().isoformat(), **result}
+            try:
+                self.park_browser()
+            except Exception as e:
+                # The next job finds the browser dead and relaunches it
+                print(f"⚠️  Could not reset browser after job: {e}")
+            return result
+
+    def attach_pages(self):
+        """Point every page's scraper at the browser the first one owns"""
+        for scraper in self.scrapers[1:]:
+            scraper.attach_browser(self.scraper)
+
+    def combine_results(self, results):
+        """One job result for several pages, keeping each page's own result by URL"""
+        errors = [f"{scraper.page_url}: {r['error']}" for scraper, r in zip(self.scrapers, results) if r.get("error")]
+        combined = {
+            "success": all(r.get("success") for r in results),
+            "posts": sum(r.get("posts", 0) for r in results),
+            "new_posts": sum(r.get("new_posts", 0) for r in results),
+            "pages": {scraper.page_url: r for scraper, r in zip(self.scrapers, results)},
+        }
+        if errors:
+            combined["error"] = "; ".join(errors)
+        return combined
+
+    def park_browser(self):
+        """Drop the scrolled feed between jobs, relaunching the browser when it is due"""
+        memory = self.memory_mb()
+        if self.jobs_since_launch >= self.max_jobs:
+            self.recycle_browser(f"{self.jobs_since_launch} jobs since launch")
+        elif memory > self.max_memory_mb:
+            self.recycle_browser(f"memory at {memory:.0f} MB (limit {self.max_memory_mb} MB)")
+        else:
+            try:
+                self.scraper.driver.get("about:blank")
+            except Exception as e:
+                self.recycle_browser(f"could not reset page: {e}")
+
+    def handle(self, conn):
+        try:
+            request = conn.recv()
+            command = request.get("command") if isinstance(request, dict) else None
+            if command == "health":
+                conn.send(self.health())
+            elif command == "scrape":
+                conn.send(self.run_job())
+            elif command == "shutdown":
+                conn.send({"status": "stopping"})
+                self.stop()
+            else:
+                conn.send({"status": "error", "error": f"Unknown command: {command}"})
+        except (EOFError, OSError) as e:
+            print(f"⚠️  Daemon connection error: {e}")
+        finally:
+            conn.close()
+
+    def serve(self):
+        """Accept requests until a shutdown request arrives"""
+        directory = os.path.dirname(self.address)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.address):
+            if send_request({"command": "health"}, self.address, timeout=2):
+                raise RuntimeError(f"A scraper daemon is already listening on {self.address}")
+            os.remove(self.address)  # Stale socket from a crashed daemon
+
+        self.listener = Listener(self.address)
+        os.chmod(self.address, 0o600)
+        print(f"🟢 Scraper daemon listening on {self.address} (pid {os.getpid()})")
+        try:
+            while True:
+                conn = self.listener.accept()
+                if self.stopping.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        finally:
+            self.listener.close()
+            with self.job_lock:
+                for scraper in self.scrapers[1:]:
+                    scraper.driver = None  # The browser belongs to the first scraper
+                    scraper.close()
+                self.scraper.close()
+            if os.path.exists(self.address):
+                os.remove(self.address)
+            print("🔴 Scraper daemon stopped")
+
+    def stop(self):
+        """Stop accepting requests; the running job, if any, finishes first"""
+        self.stopping.set()
+        try:
+            Client(self.address).close()  # Wake up accept()
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Long-lived Kuensel scraper with a warm browser')
+    parser.add_argument('--config',
+                        default='config/config.json',
+                        help='Path to config file (default: config/config.json)')
+    parser.add_argument('--address', help=f'Daemon socket (default: daemon.address or {DEFAULT_ADDRESS})')
+    command = parser.add_mutually_exclusive_group()
+    command.add_argument('--health', action='store_true', help='Query a running daemon')
+    command.add_argument('--scrape', action='store_true', help='Ask a running daemon to run one scrape job')
+    command.add_argument('--shutdown', action='store_true', help='Stop a running daemon')
+    args = parser.parse_args()
+
+    if args.health or args.scrape or args.shutdown:
+        address = args.address or DEFAULT_ADDRESS
+        if args.health:
+            reply = send_request({"command": "health"}, address)
+        elif args.scrape:
+            reply = send_request({"command": "scrape"}, address, timeout=JOB_MAX_RUNTIME + 300)
+        else:
+            reply = send_request({"command": "shutdown"}, address)
+        if reply is None:
+            print(f"❌ No scraper daemon at {address}")
+            sys.exit(1)
+        print(json.dumps(reply, indent=2))
+        return
+
+    daemon = ScraperDaemon(args.config)
+    if args.address:
+        daemon.address = args.address
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        print("\nScraper daemon stopped by user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Session Archive
+Records the page snapshots and fetched pages of a scraping session into a compressed
+archive, and reads them back for replay
+"""
+
+import json
+import os
+import zipfile
+from datetime import datetime
+
+MANIFEST = "manifest.json"
+ARCHIVE_VERSION = 1
+
+
+class SessionRecorder:
+    """Writes a session archive (zip) as the scraper runs.
+
+    Snapshots are the per-scroll inputs to extraction: feed HTML, or the
+    JSON records from the JavaScript engine. Responses are article and
+    photo pages keyed by URL; a failed fetch is recorded as None.
+    """
+
+    def __init__(self, path, metadata=None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.archive = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+        self.manifest = {
+            "version": ARCHIVE_VERSION,
+            "recorded_at": datetime.now().isoformat(),
+            "metadata": metadata or {},
+            "snapshots": [],
+            "responses": {},
+        }
+
+    def add_snapshot(self, content, kind="html"):
+        """Store one scroll's extraction input"""
+        name = f"snapshots/{len(self.manifest['snapshots']):04d}.{'json' if kind == 'records' else 'html'}"
+        self.archive.writestr(name, content)
+        self.manifest["snapshots"].append({"file": name, "kind": kind})
+
+    def add_response(self, kind, url, content):
+        """Store a fetched page (str or bytes), or None for a failed fetch"""
+        responses = self.manifest["responses"].setdefault(kind, {})
+        if url in responses:
+            return
+        name = None
+        if content is not None:
+            name = f"{kind}/{len(responses):04d}.html"
+            self.archive.writestr(name, content)
+        responses[url] = name
+
+    def close(self):
+        """Write the manifest and finish the archive"""
+        if self.archive is None:
+            return
+        self.archive.writestr(MANIFEST, json.dumps(self.manifest, indent=2))
+        self.archive.close()
+        self.archive = None
+        print(f"📼 Session recorded: {self.path} ({len(self.manifest['snapshots'])} snapshots)")
+
+
+class SessionArchive:
+    """Reads a session archive written by SessionRecorder"""
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(path, 'r')
+        self.manifest = json.loads(self.archive.read(MANIFEST))
+        if self.manifest.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported session archive version: {self.manifest.get('version')}")
+
+    @property
+    def metadata(self):
+        return self.manifest.get("metadata", {})
+
+    def snapshots(self):
+        """Yield (kind, content) for each recorded scroll, in order"""
+        for snapshot in self.manifest["snapshots"]:
+            yield snapshot["kind"], self.archive.read(snapshot["file"]).decode("utf-8")
+
+    def response(self, kind, url):
+        """Return (recorded, content) for a fetched page; content is None for failed fetches"""
+        responses = self.manifest["responses"].get(kind, {})
+        if url not in responses:
+            return False, None
+        name = responses[url]
+        return True, self.archive.read(name) if name else None
+
+    def close(self):
+        self.archive.close()
@@ -0,0 +1,152 @@
+"""
+Session Replay
+Feeds a recorded scraping session back through extraction, dedup, validation and saving
+without a browser
+
+Usage:
+    python src/session_replay.py data/sessions/session_20250908_170501.zip [--master-file PATH] [--fresh]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    from browser_backends import completed_future
+    from facebook_scrapper import FacebookScraper
+    from html_parsing import resolve_parser_backend
+    from near_duplicates import index_path_for
+    from post_index import post_index_path_for
+    from session_archive import SessionArchive
+except ImportError:
+    from src.browser_backends import completed_future
+    from src.facebook_scrapper import FacebookScraper
+    from src.html_parsing import resolve_parser_backend
+    from src.near_duplicates import index_path_for
+    from src.post_index import post_index_path_for
+    from src.session_archive import SessionArchive
+
+LIVE_MASTER_FILE = "data/kuensel_posts_master.json"
+DEFAULT_REPLAY_MASTER_FILE = "data/replay/kuensel_posts_master.json"
+
+
+def photo_cache_path_for(master_file):
+    return f"{os.path.splitext(master_file)[0]}.photos.json"
+
+
+class ReplayScraper(FacebookScraper):
+    """FacebookScraper that reads snapshots and fetched pages from a session archive"""
+
+    def __init__(self, archive_path, config_file="config/config.json", master_file=DEFAULT_REPLAY_MASTER_FILE):
+        self.archive = SessionArchive(archive_path)
+        self.replay_master_file = master_file
+        super().__init__(config_file, start_driver=False)
+
+    def load_config(self, config_file):
+        config = super().load_config(config_file)
+        # Never save replayed posts into the live master file by accident
+        config.setdefault("output", {})["master_file"] = self.replay_master_file
+        # Photo pages come from the archive, not from the live photo cache
+        config.setdefault("photo_cache", {})["file"] = photo_cache_path_for(self.replay_master_file)
+        return config
+
+    def fetch_article_page(self, article_url):
+        recorded, page_content = self.archive.response("article", article_url)
+        if not recorded:
+            print(f"Article not in session archive: {article_url}")
+        elif page_content is None:
+            print("Failed to fetch article (recorded failure)")
+        return page_content
+
+    def fetch_photo_pages(self, links):
+        pages = {}
+        for link in links:
+            recorded, photo_page_html = self.archive.response("photo", link)
+            if not recorded:
+                print(f"Photo page not in session archive: {link[:80]}")
+            pages[link] = photo_page_html.decode("utf-8") if photo_page_html is not None else None
+        return completed_future(pages)
+
+    def replay(self):
+        """Run every recorded scroll through the scraping pipeline"""
+        self.reset_session_state()
+        self.page_url = self.archive.metadata.get("page_url", self.page_url)
+
+        for scroll, (kind, content) in enumerate(self.archive.snapshots()):
+            print(f"Replaying scroll {scroll + 1} ({kind})...")
+            if kind == "records":
+                new_posts = self.extract_posts_from_records(json.loads(content))
+            else:
+                new_posts = self.extract_posts_with_beautifulsoup(content)
+            print(f"Extracted {len(new_posts)} raw posts")
+
+            valid_posts_count, _ = self.add_scraped_posts(new_posts)
+            if self.pending_photos:
+                self.resolve_pending_photos(self.posts_data, wait=True)
+            print(f"Found {valid_posts_count} valid posts in this scroll. Total unique posts: {len(self.posts_data)}")
+
+        print(f"Parse cache: {self.parse_cache_hits} hits, {self.parse_cache_misses} misses")
+        return self.posts_data
+
+    def close(self):
+        super().close()
+        self.archive.close()
+
+
+def replay_session(archive_path, config_file="config/config.json", master_file=DEFAULT_REPLAY_MASTER_FILE,
+                   html_parser=None):
+    """Replay a session archive and save the result to master_file"""
+    start_time = time.time()
+    scraper = ReplayScraper(archive_path, config_file=config_file, master_file=master_file)
+    try:
+        if html_parser:
+            scraper.html_parser = resolve_parser_backend(html_parser)
+
+        posts = scraper.replay()
+        formatted_data = scraper.format_for_output()
+        saved_file = scraper.save_posts_consolidated(formatted_data)
+    finally:
+        scraper.close()
+
+    duration = time.time() - start_time
+    print(f"\n=== Replay Summary ===")
+    print(f"Session archive: {archive_path}")
+    print(f"Posts processed this session: {len(posts)}")
+    print(f"Master data file: {saved_file}")
+    print(f"Replay completed in {duration:.2f} seconds")
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded Kuensel scraping session')
+    parser.add_argument('archive', help='Session archive recorded with scraping.record_session')
+    parser.add_argument('--config',
+                        default='config/config.json',
+                        help='Path to config file (default: config/config.json)')
+    parser.add_argument('--master-file',
+                        default=DEFAULT_REPLAY_MASTER_FILE,
+                        help=f'Where replayed posts are saved (default: {DEFAULT_REPLAY_MASTER_FILE})')
+    parser.add_argument('--fresh',
+                        action='store_true',
+                        help='Start from an empty master file instead of deduplicating against it')
+    parser.add_argument('--parser', help='HTML parser backend (html.parser, lxml, selectolax)')
+    args = parser.parse_args()
+
+    if args.fresh and os.path.exists(args.master_file):
+        if os.path.abspath(args.master_file) == os.path.abspath(LIVE_MASTER_FILE):
+            print(f"❌ Refusing to clear the live master file: {args.master_file}")
+            sys.exit(1)
+        os.remove(args.master_file)
+        for sidecar in (index_path_for(args.master_file), post_index_path_for(args.master_file),
+                        photo_cache_path_for(args.master_file)):
+            if os.path.exists(sidecar):
+                os.remove(sidecar)
+        print(f"🧹 Removed previous replay output: {args.master_file}")
+
+    replay_session(args.archive, config_file=args.config, master_file=args.master_file, html_parser=args.parser)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 from notification_system import NotificationSystem
 from post_monitor import PostMonitor
 from monitoring_dashboard import MonitoringDashboard
+from page_targets import read_config
+from scraper_daemon import DEFAULT_ADDRESS, send_request
 
 class SmartScheduler:
     def __init__(self):
@@ -47,6 +49,11 @@ class SmartScheduler:
                 "on_recovery": True,
                 "daily_summary": True,
                 "summary_hour": 19          
+            },
+            "daemon": {
+                "enabled": False,           # Send jobs to a warm scraper_daemon.py instead of a new process
+                "address": DEFAULT_ADDRESS,
+                "start_timeout": 120        # Seconds to wait for a freshly started daemon
             }
         }
         
@@ -151,13 +158,65 @@ class SmartScheduler:
                 return True
         return False
     
+    def ensure_daemon(self):
+        """Return True once a scraper daemon answers health checks, starting one if needed"""
+        daemon_config = self.config["daemon"]
+        address = daemon_config.get("address", DEFAULT_ADDRESS)
+        health = send_request({"command": "health"}, address)
+        if health and health.get("status") in ("ok", "busy"):
+            return True
+        if health and health.get("status") == "degraded":
+            print("Scraper daemon reports a dead browser; it will relaunch it on the next job")
+            return True
+
+        print("Starting scraper daemon...")
+        os.makedirs("data", exist_ok=True)
+        with open("data/scraper_daemon.log", "a") as log:
+            subprocess.Popen(["python3", "scraper_daemon.py", "--address", address],
+                             stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+        deadline = time.time() + daemon_config.get("start_timeout", 120)
+        while time.time() < deadline:
+            time.sleep(2)
+            if send_request({"command": "health"}, address):
+                return True
+        print("Scraper daemon did not come up in time")
+        return False
+
+    def run_scraper_in_daemon(self):
+        """Run one job in the scraper daemon; None if the daemon can't be used"""
+        if not self.ensure_daemon():
+            return None
+        address = self.config["daemon"].get("address", DEFAULT_ADDRESS)
+        result = send_request({"command": "scrape"}, address, timeout=1800)  # 30 minute timeout
+        if result is None:
+            return None
+        if result.get("status") == "timeout":
+            error_msg = "Scraper daemon job timed out after 30 minutes"
+            if self.config["notifications"]["on_errors"]:
+                self.notifier.notify_scraper_completed(success=False, errors=error_msg)
+            return {"success": False, "error": error_msg}
+        return result
+
     def run_scraper(self, reason="Scheduled run"):
         """Run the scraper"""
         print(f"🚀 Running scraper - {reason}")
         
+        if self.config["daemon"].get("enabled"):
+            result = self.run_scraper_in_daemon()
+            if result is not None:
+                if result.get("success"):
+                    print(f"Scraper completed successfully in daemon ({result.get('duration', '?')}s)")
+                    return True
+                # The daemon has already sent the failure notification
+                print(f"Scraper failed: {result.get('error', 'Unknown daemon error')}")
+                return False
+            print("Scraper daemon unavailable, falling back to a one-shot run")
+        
+        # Pages listed under "targets" are scraped together by the multi-page scraper
+        script = "multi_scraper.py" if read_config().get("targets") else "facebook_scrapper.py"
         try:
             result = subprocess.run(
-                ["python3", "facebook_scrapper.py"], 
+                ["python3", script], 
                 capture_output=True, 
                 text=True,
                 timeout=1800  # 30 minute timeout
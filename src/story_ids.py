@@ -0,0 +1,93 @@
+"""
+Story IDs
+Finds Facebook's own identifier for a feed story in its links and data-ft attributes,
+so the same story keeps one post ID across runs
+"""
+
+import json
+import re
+from urllib.parse import parse_qs, urlparse
+
+PFBID = re.compile(r'pfbid[0-9A-Za-z]+')
+
+# Path segments followed by the story ID: /Kuensel/posts/<id>, /groups/<g>/permalink/<id>
+STORY_PATH = re.compile(r'/(?:posts|permalink)/(pfbid[0-9A-Za-z]+|\d+)')
+STORY_QUERY_KEYS = ("story_fbid",)
+ID_QUERY_PATHS = ("/permalink.php", "/story.php", "/profile.php")
+
+
+def ids_from_data_ft(value):
+    """top_level_post_id (or mf_story_key) from a data-ft JSON attribute"""
+    try:
+        data = json.loads(value)
+    except (TypeError, ValueError):
+        match = re.search(r'"?top_level_post_id"?\s*:\s*"?(\d+)', value or "")
+        return match.group(1) if match else None
+    if not isinstance(data, dict):
+        return None
+    story_id = data.get("top_level_post_id") or data.get("mf_story_key")
+    return str(story_id) if story_id else None
+
+
+def ids_from_href(href):
+    """Story IDs in a link, in the order they appear"""
+    if not href:
+        return []
+    parsed = urlparse(href)
+    if parsed.netloc and not (parsed.netloc == "facebook.com" or parsed.netloc.endswith(".facebook.com")):
+        return []
+    found = []
+    if parsed.path.endswith(("/permalink.php", "/story.php")):
+        query = parse_qs(parsed.query)
+        for key in STORY_QUERY_KEYS:
+            found.extend(query.get(key, []))
+    found.extend(STORY_PATH.findall(parsed.path))
+    found.extend(PFBID.findall(href))
+    return [story_id for story_id in found if story_id.isdigit() or PFBID.fullmatch(story_id)]
+
+
+def page_key(url):
+    """Lowercased page a link belongs to: the path before /posts/ or /permalink/
+    (the whole path for a page URL), or the id of a permalink.php/profile.php link
+    """
+    parsed = urlparse(url or "")
+    if parsed.path.endswith(ID_QUERY_PATHS):
+        ids = parse_qs(parsed.query).get("id")
+        return ids[0].lower() if ids else None
+    return STORY_PATH.split(parsed.path)[0].strip("/").lower() or None
+
+
+def preferred_story_id(story_ids):
+    """First numeric ID, else the first pfbid (a story can have several pfbid encodings)"""
+    return next((story_id for story_id in story_ids if story_id.isdigit()), story_ids[0] if story_ids else None)
+
+
+def extract_story_id(hrefs, data_ft_values=(), page_url=None):
+    """Stable story key for a feed unit, or None if Facebook didn't expose one.
+
+    data-ft top_level_post_id wins. Otherwise only links to the unit's own
+    page count: the page being scraped, or without page_url the page of the
+    first story link (the timestamp permalink). A shared post links to
+    another page's story, and that ID must never stand in for the unit's own.
+    permalink.php links carry a numeric page id that can't be compared with
+    a vanity name, so they are used only when no own-page link has an ID.
+    """
+    for value in data_ft_values:
+        story_id = ids_from_data_ft(value)
+        if story_id:
+            return story_id
+
+    page = page_key(page_url) if page_url else None
+    own, unverified = [], []
+    for href in hrefs:
+        story_ids = ids_from_href(href)
+        if not story_ids:
+            continue
+        owner = page_key(href)
+        if page is None and owner:
+            page = owner
+        if owner == page:
+            own.extend(story_ids)
+        elif owner is None or owner.isdigit() != (page or "").isdigit():
+            unverified.extend(story_ids)
+    return preferred_story_id(own) or preferred_story_id(unverified)
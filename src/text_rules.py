@@ -0,0 +1,148 @@
+"""
+Text Rules
+Compiled text cleanup and comment detection rules shared by the scraper
+"""
+
+import html
+import re
+
+# Rules run in this order; each one sees the output of the previous one
+TIMESTAMP_SHORT = re.compile(r'\b\d+[hm]\s*·?\s*')  # "4h ·", "3h", "2m ·"
+TIMESTAMP_AGO = re.compile(r'\b\d+\s*(hour|hours|min|mins|minute|minutes)\s*ago\s*·?\s*')  # "2 hours ago ·"
+VERIFIED_ACCOUNT = re.compile(r'\bVerified\s+account\s*')
+SHARED_WITH_PUBLIC = re.compile(r'\bShared\s+with\s+Public\s*')
+LEADING_METADATA = re.compile(r'^[^·]*·\s*')  # Everything before and including the first "·"
+# "All reactions: 199 38 6" and the interaction buttons both cut the text to the end,
+# so one alternation cutting at the earliest of them gives the same result
+INTERACTION_TRAILER = re.compile(
+    r'\s*(?:All\s+reactions?:|Like|Comment|Share|View\s+more\s+comments?).*$',
+    re.IGNORECASE | re.DOTALL
+)
+WHITESPACE = re.compile(r'\s+')
+# Keep printable ASCII and Unicode; this also covers null bytes and control characters
+UNPRINTABLE = re.compile(r'[^\x20-\x7E\u00A0-\uFFFF]')
+REPEATED_PUNCTUATION = re.compile(r'([.!?]){3,}')
+
+# Lines that look like comments or user interactions (matched case-insensitively)
+COMMENT_LINE_RULES = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r'^[A-Za-z\s]+ commented:',
+    r'^\d+\s*(like|comment|share|react)',
+    r'^(Like|Comment|Share|Reply)$',
+    r'^[A-Za-z\s]+ replied:',
+    r'^[A-Za-z\s]+ reacted',
+    r'^\d+\s*(min|hr|day|week|month|year)s?\s+ago',
+    r'^(Most relevant|Top comments|All comments|View \d+ replies?)',
+    r'^Write a comment',
+    r'^[A-Za-z\s]+ and \d+ others? (like|comment|react)',
+    r'^How about',
+    r'^What about',
+    r'^Why not',
+    r'^\w+\?$',
+]), re.IGNORECASE)
+
+# Comment-like post content, matched against lowercased text
+COMMENT_POST_RULES = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r'if\s+he\s+full\s+fills\s+his\s+dream',
+    r'druptop\s+vajra\s+guru',
+    r'^how about.{1,40}\?*$',
+    r'^what about.{1,40}\?*$',
+    r'^why not.{1,40}\?*$',
+    r'^what\s+do\s+you\s+think.{0,50}\?*$',
+    r'^[a-zA-Z\s]{1,20}\?+$',
+    r'^(ok|okay|yes|no|true|false|really|wow|nice|good|bad|great|awesome|cool|sure|right)[\.\!\?]*$',
+    r'^\w{1,15}[\.\!\?]+$',
+    r'^(lol|lmao|haha)[\.\!\?]*$',
+    r'^(that\'s|thats)\s+(good|bad|nice|cool|great|awesome|amazing)',
+    r'^i\s+(think|believe|hope|wish|agree|disagree)',
+    r'^you\s+(should|could|might|can|will)',
+    r'^\w+\s*\?+$',
+]))
+
+# Short comment replies removed from the final data, matched against lowercased text
+SAVED_COMMENT_RULES = re.compile('|'.join(f'(?:{pattern})' for pattern in [
+    r'^how about.{1,30}\?*$',
+    r'^what about.{1,30}\?*$',
+    r'^why not.{1,30}\?*$',
+    r'^[a-zA-Z\s]{1,20}\?+$',
+    r'^(ok|okay|yes|no|true|false|really|wow|nice|good|bad)[\.\!\?]*$',
+    r'^\w{1,10}[\.\!\?]+$',
+]))
+
+GENERIC_PATTERNS = ('loading...', 'error', 'failed to load')
+DOT_ONLY_CONTENT = ('', '.', '..', '...', '....', '.....')
+PLACEHOLDER_TITLES = ('untitled post', 'intro')
+
+
+def normalize(text):
+    """Clean and preprocess scraped text"""
+    if not text:
+        return ""
+
+    text = html.unescape(text)
+
+    # Facebook metadata and timestamps
+    text = TIMESTAMP_SHORT.sub('', text)
+    text = TIMESTAMP_AGO.sub('', text)
+    text = VERIFIED_ACCOUNT.sub('', text)
+    text = SHARED_WITH_PUBLIC.sub('', text)
+    if '·' in text:
+        text = LEADING_METADATA.sub('', text, count=1)
+
+    # Interaction text at the end
+    text = INTERACTION_TRAILER.sub('', text)
+
+    text = WHITESPACE.sub(' ', text).strip()
+    text = UNPRINTABLE.sub('', text)
+
+    # Excessive repeated punctuation (3 or more in a row)
+    text = REPEATED_PUNCTUATION.sub(r'\1\1\1', text)
+
+    return text.strip()
+
+
+def is_comment(text, rules=COMMENT_LINE_RULES):
+    """Check text against a compiled comment rule set"""
+    return rules.search(text) is not None
+
+
+def is_valid(content, title, has_media):
+    """Check if post content is meaningful.
+
+    Returns (valid, reason) where reason explains the decision for debug output.
+    """
+    content_clean = content.strip()
+    title_clean = title.strip().lower()
+    has_alnum = any(char.isalnum() for char in content_clean)
+
+    # Allow 'Untitled Post' or 'Intro' if content has any meaningful text
+    if title_clean in PLACEHOLDER_TITLES:
+        if content_clean and len(content_clean) > 5 and has_alnum:
+            return True, f"Accepting '{title}' with {len(content_clean)} chars of content"
+        return False, f"Rejecting '{title}': content too short or empty"
+
+    if not content or len(content_clean) < 5:
+        return False, f"Rejecting: content too short ({len(content_clean)} chars)"
+
+    if content_clean in DOT_ONLY_CONTENT:
+        return False, "Rejecting: content is just dots"
+
+    if content_clean == title.strip():
+        return False, "Rejecting: content matches title"
+
+    if len(content_clean) < 8 and not has_alnum:
+        return False, "Rejecting: content too short and not alphanumeric"
+
+    content_lower = content_clean.lower()
+    if any(pattern in content_lower for pattern in GENERIC_PATTERNS):
+        return False, "Rejecting: generic pattern found"
+
+    if is_comment(content_lower.strip(), COMMENT_POST_RULES):
+        return False, "Rejecting: comment-like pattern found"
+
+    if len(content_clean) < 15 and not has_media:
+        return False, f"Rejecting: short post without media ({len(content_clean)} chars)"
+
+    if not has_alnum:
+        return False, "Rejecting: no alphanumeric content"
+
+    return True, f"Accepting post: '{title}' with {len(content_clean)} chars"